@@ -1,8 +1,32 @@
+import argparse
+from typing import List, Optional
+
 import uvicorn
-import rag_agent.app as app
 
-def main() -> None:
-    uvicorn.run(app, host="127.0.0.1", port=8000) #TODO: Use container runtime to run API process instead of calling uvicorn directly (hardcoded host and port)
+from rag_agent.server import ServeOptions, serve
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="csha-agent")
+    subcommands = parser.add_subparsers(dest="command")
+
+    serve_parser = subcommands.add_parser("serve", help="Run the production multi-worker server")
+    defaults = ServeOptions()
+    serve_parser.add_argument("--host", default=defaults.host)
+    serve_parser.add_argument("--port", type=int, default=defaults.port)
+    serve_parser.add_argument("--workers", type=int, default=defaults.workers, help="Default: one per available CPU")
+    serve_parser.add_argument("--keep-alive", dest="keep_alive_s", type=int, default=defaults.keep_alive_s, help="Keep-alive timeout in seconds")
+    serve_parser.add_argument("--backlog", type=int, default=defaults.backlog)
+    serve_parser.add_argument("--graceful-timeout", dest="graceful_timeout_s", type=int, default=defaults.graceful_timeout_s, help="Seconds in-flight requests get to finish on shutdown")
+    serve_parser.add_argument("--no-reuse-port", dest="reuse_port", action="store_false", default=defaults.reuse_port)
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        serve(ServeOptions(**{key: value for key, value in vars(args).items() if key != "command"}))
+        return
+
+    # Local development: one process on localhost
+    uvicorn.run("rag_agent.app:app", host="127.0.0.1", port=8000)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,24 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+router = APIRouter(tags=["Health"])
+
+
+@router.get("/health")
+async def health() -> Dict[str, Any]:
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready(request: Request) -> JSONResponse:
+    """Readiness: 200 once startup warmup has finished, 503 before or if it failed."""
+    warmup = request.app.state.warmup
+    if not warmup.done() or warmup.cancelled():
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    error = warmup.exception()
+    if error is not None:
+        return JSONResponse(status_code=503, content={"status": "warmup_failed", "error": f"{type(error).__name__}: {error}"})
+    return JSONResponse(content={"status": "ready", "warmup": warmup.result()})
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import time
+from json.encoder import encode_basestring_ascii
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+_TOKEN_PREFIX = b'{"event":"token","text":'
+_ID_KEY = b',"id":'
+_FRAME_SUFFIX = b"}\n"
+_END_OF_STREAM = object()
+
+
+def encode_event(event: Dict[str, Any]) -> bytes:
+    """One NDJSON line (compact separators, ASCII-escaped, like json.dumps)."""
+    return (json.dumps(event, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def encode_token(text: str, query_id: Optional[str] = None) -> bytes:
+    """
+    Same bytes as encode_event({"event": "token", "text": text}), without building a dict.
+    Batch streams also tag the frame with the query's id.
+    """
+    frame = _TOKEN_PREFIX + encode_basestring_ascii(text).encode("ascii")
+    if query_id is not None:
+        frame += _ID_KEY + encode_basestring_ascii(query_id).encode("ascii")
+    return frame + _FRAME_SUFFIX
+
+
+class TokenFramer:
+    """
+    Turns a stream of LLM deltas into NDJSON `token` frames.
+
+    Deltas are merged into one frame until `window_s` has passed since the first buffered delta
+    or the buffered text reaches `max_bytes` encoded bytes (as written to the frame: non-ASCII characters
+    are \\u-escaped, so they count 6 bytes or more); a frame's text is just the deltas concatenated, so
+    clients that append `text` see the same answer. The client connection is polled for a
+    disconnect every `poll_s` seconds instead of once per delta. With `window_s` = 0 every delta
+    gets its own frame.
+    """
+
+    def __init__(
+        self,
+        tokens: AsyncIterator[str],
+        is_disconnected: Callable[[], Awaitable[bool]],
+        window_s: float,
+        max_bytes: int,
+        poll_s: float,
+    ):
+        self.tokens = tokens
+        self.is_disconnected = is_disconnected
+        self.window_s = window_s
+        self.max_bytes = max_bytes
+        self.poll_s = poll_s
+        self.output_tokens = 0
+        self.frames = 0
+        self.disconnected = False
+
+    async def _pump(self, queue: "asyncio.Queue[Any]") -> None:
+        try:
+            async for token in self.tokens:
+                await queue.put(token)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(_END_OF_STREAM)
+
+    def _frame(self, buffered: List[str]) -> bytes:
+        self.frames += 1
+        return encode_token("".join(buffered))
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=256)
+        pump = asyncio.create_task(self._pump(queue))
+        buffered: List[str] = []
+        buffered_bytes = 0
+        flush_at = None
+        next_poll = time.monotonic() + self.poll_s
+        try:
+            while True:
+                now = time.monotonic()
+                if now >= next_poll:
+                    if await self.is_disconnected():
+                        self.disconnected = True
+                        return
+                    next_poll = now + self.poll_s
+                deadline = next_poll if flush_at is None else min(next_poll, flush_at)
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=max(0.0, deadline - time.monotonic()))
+                except asyncio.TimeoutError:
+                    if flush_at is not None and time.monotonic() >= flush_at:
+                        yield self._frame(buffered)
+                        buffered, buffered_bytes, flush_at = [], 0, None
+                    continue
+
+                if item is _END_OF_STREAM or isinstance(item, Exception):
+                    if buffered:
+                        yield self._frame(buffered)
+                    if item is _END_OF_STREAM:
+                        return
+                    raise item
+
+                self.output_tokens += 1
+                if self.window_s <= 0:
+                    yield self._frame([item])
+                    continue
+                buffered.append(item)
+                # Escaping is per character, so the escaped lengths of the deltas add up to the frame's
+                buffered_bytes += len(encode_basestring_ascii(item)) - 2
+                if flush_at is None:
+                    flush_at = time.monotonic() + self.window_s
+                if buffered_bytes >= self.max_bytes:
+                    yield self._frame(buffered)
+                    buffered, buffered_bytes, flush_at = [], 0, None
+        finally:
+            pump.cancel()
+            try:
+                await pump
+            except asyncio.CancelledError:
+                pass
@@ -1,14 +1,22 @@
 import time
-import json
 import asyncio
+from contextlib import aclosing
+from dataclasses import asdict
 from typing import Dict, Any, AsyncGenerator
 
-from fastapi import APIRouter, HTTPException, Request, Depends
+from fastapi import APIRouter, HTTPException, Request, Response, Depends
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
+from rag_agent.api.ndjson import TokenFramer, encode_event, encode_token
+from rag_agent.core import metrics
+from rag_agent.core.admission import AdmissionRejected, Lane, get_admission_controller
 from rag_agent.core.config import settings
-from rag_agent.schemas.rag import RAGQueryRequest
-from rag_agent.services.rag import retrieval_augmented_generation
+from rag_agent.core.logging_config import enable_verbose_logging
+from rag_agent.core.tracing import Trace, activate
+from rag_agent.schemas.rag import RAGBatchRequest, RAGQueryRequest, RAGRetrieveRequest, RAGRetrieveResponse, RetrievedChunk
+from rag_agent.services.rag import batch_retrieval_augmented_generation, coalesced_retrieval_augmented_generation
+from rag_agent.services.retriever.base_retriever import BaseRetriever
 from rag_agent.security.auth import authenticate_api_key
 
 router = APIRouter(
@@ -17,50 +25,209 @@ router = APIRouter(
     dependencies=[Depends(authenticate_api_key)]
 )
 
-def _one_line_json(response_line: Dict[str, Any]) -> bytes:
-    return (json.dumps(response_line, separators=(",", ":")) + "\n").encode("utf-8")
+async def get_retriever(request: Request) -> BaseRetriever:
+    """Shared retriever built by the app lifespan (see rag_agent.app)."""
+    return await request.app.state.retriever_registry.get()
+
+@router.get("/metrics")
+async def get_metrics() -> Dict[str, Any]:
+    """In-process counters (cache hits/misses, etc.) for this worker."""
+    return metrics.snapshot()
 
 @router.post("/query")
-async def ndjson_query(body: RAGQueryRequest, request: Request):
+async def ndjson_query(
+    body: RAGQueryRequest,
+    request: Request,
+    retriever: BaseRetriever = Depends(get_retriever),
+):
     request_id = request.headers.get("x-request-id") or f"rq_{int(time.time() * 1000)}" #request id is a unique identifier for the user request call to the API. Will be needed for logging and debugging (when we implement it).
 
+    trace = Trace(request_id)
+
+    # Admission happens before the stream starts so overload can still be answered with 429/503
+    try:
+        with trace.span("admission"):
+            admission_slot = await get_admission_controller().acquire(Lane.INTERACTIVE)
+    except AdmissionRejected as e:
+        trace.finish()
+        raise HTTPException(status_code=e.status_code, detail=e.detail, headers=e.headers)
+
     async def generate_ndjson_response() -> AsyncGenerator[bytes, None]:
         start_time = time.perf_counter()
+        activate(trace)
+        enable_verbose_logging(request.headers)
 
-        yield _one_line_json({"event": "start", "request_id": request_id, "model": settings.QUERY_MODEL})
-        output_tokens = 0
+        yield encode_event({"event": "start", "request_id": request_id, "model": settings.QUERY_MODEL})
         
         try:
-            async for response_token in retrieval_augmented_generation(body.query):
-
-                if await request.is_disconnected():
-                    break
-
-                output_tokens += 1
-                yield _one_line_json({"event": "token", "text": response_token})
-
-            yield _one_line_json({"event": "end", "output_tokens": output_tokens, "latency_ms": int((time.perf_counter() - start_time) * 1000)})
+            # aclosing: a disconnect unsubscribes right away, so a shared upstream stream can stop when nobody is left
+            async with aclosing(coalesced_retrieval_augmented_generation(body.query, retriever)) as response_tokens:
+                token_framer = TokenFramer(
+                    response_tokens,
+                    request.is_disconnected,
+                    window_s=settings.STREAM_FRAME_WINDOW_MS / 1000,
+                    max_bytes=settings.STREAM_FRAME_MAX_BYTES,
+                    poll_s=settings.STREAM_DISCONNECT_POLL_S,
+                )
+                async for token_frame in token_framer:
+                    yield token_frame
+
+            if token_framer.disconnected:
+                return
+            yield encode_event({
+                "event": "end",
+                "output_tokens": token_framer.output_tokens,
+                "latency_ms": int((time.perf_counter() - start_time) * 1000),
+                "timings": trace.summary(),
+            })
 
         except asyncio.CancelledError:
             return
         except ValueError as e: #Do I really need this?
-            yield _one_line_json({"event": "error", "type": "BadRequest", "error": str(e)})
+            yield encode_event({"event": "error", "type": "BadRequest", "error": str(e)})
             return
         except Exception as e: #This is a catch-all, not very informative.
-            yield _one_line_json({"event": "error", "type": "InternalServerError", "error": str(e)})
+            yield encode_event({"event": "error", "type": "InternalServerError", "error": str(e)})
             return
+        finally:
+            admission_slot.release()
+            trace.finish()
 
+    # Headers go out before generation starts, so Server-Timing only covers admission;
+    # the full breakdown is in the `end` event
     headers = {
         "cache-control": "no-cache",
         "X-Accel-Buffering": "no",
+        "Server-Timing": trace.server_timing(),
     }
 
-    return StreamingResponse(generate_ndjson_response(), media_type="application/x-ndjson", headers=headers)
+    # The background task only matters if the stream never started; release() is idempotent
+    return StreamingResponse(
+        generate_ndjson_response(),
+        media_type="application/x-ndjson",
+        headers=headers,
+        background=BackgroundTask(admission_slot.release),
+    )
 
         
 
+@router.post("/retrieve", response_model=RAGRetrieveResponse)
+async def retrieve_chunks(
+    body: RAGRetrieveRequest,
+    request: Request,
+    response: Response,
+    retriever: BaseRetriever = Depends(get_retriever),
+) -> RAGRetrieveResponse:
+    """
+    Ranked chunks for a query, without generation. The top RETRIEVE_MAX_RESULTS chunks are
+    ranked (and cached) once, so paging through them does not re-run retrieval.
+    """
+    start_time = time.perf_counter()
+    trace = Trace(request.headers.get("x-request-id") or f"rq_{int(time.time() * 1000)}")
+    activate(trace)
+    enable_verbose_logging(request.headers)
+
+    try:
+        try:
+            with trace.span("admission"):
+                admission_slot = await get_admission_controller().acquire(Lane.INTERACTIVE)
+        except AdmissionRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail, headers=e.headers)
+
+        try:
+            with trace.span("retrieval"):
+                ranked_chunks = await retriever.aretrieve_scored(body.query, top_k=settings.RETRIEVE_MAX_RESULTS)
+        except NotImplementedError as e:
+            raise HTTPException(status_code=501, detail=str(e))
+        finally:
+            admission_slot.release()
+    finally:
+        trace.finish()
+    response.headers["Server-Timing"] = trace.server_timing()
+
+    page = ranked_chunks[body.offset:body.offset + body.limit]
+    next_offset = body.offset + body.limit
+    return RAGRetrieveResponse(
+        query=body.query,
+        chunks=[RetrievedChunk(rank=body.offset + i + 1, **asdict(chunk)) for i, chunk in enumerate(page)],
+        offset=body.offset,
+        limit=body.limit,
+        total=len(ranked_chunks),
+        next_offset=next_offset if next_offset < len(ranked_chunks) else None,
+        latency_ms=int((time.perf_counter() - start_time) * 1000),
+    )
+
+@router.post("/batch")
+async def ndjson_batch(
+    body: RAGBatchRequest,
+    request: Request,
+    retriever: BaseRetriever = Depends(get_retriever),
+):
+    """
+    Answer many queries in one call. Events of all queries are multiplexed on one NDJSON stream and
+    carry the query's `id`: `start` (once), then per query `token`/`end` or `error`, then `done`.
+    """
+    request_id = request.headers.get("x-request-id") or f"rq_{int(time.time() * 1000)}"
+
+    trace = Trace(request_id)
+
+    # A batch takes one slot in the batch lane, so interactive queries are admitted first
+    try:
+        with trace.span("admission"):
+            admission_slot = await get_admission_controller().acquire(Lane.BATCH)
+    except AdmissionRejected as e:
+        trace.finish()
+        raise HTTPException(status_code=e.status_code, detail=e.detail, headers=e.headers)
+
+    query_pairs = body.query_pairs()
+
+    async def generate_ndjson_response() -> AsyncGenerator[bytes, None]:
+        start_time = time.perf_counter()
+        # Per-query spans go to child traces (see batch_retrieval_augmented_generation)
+        activate(trace)
+        enable_verbose_logging(request.headers)
+        succeeded = failed = 0
 
+        yield encode_event({"event": "start", "request_id": request_id, "model": settings.QUERY_MODEL, "queries": len(query_pairs)})
 
+        try:
+            async with aclosing(batch_retrieval_augmented_generation(query_pairs, retriever)) as events:
+                next_poll = time.monotonic() + settings.STREAM_DISCONNECT_POLL_S
+                async for event in events:
+                    if time.monotonic() >= next_poll:
+                        if await request.is_disconnected():
+                            return
+                        next_poll = time.monotonic() + settings.STREAM_DISCONNECT_POLL_S
+
+                    if event["event"] == "token":
+                        yield encode_token(event["text"], event["id"])
+                        continue
+                    if event["event"] == "end":
+                        succeeded += 1
+                    else:
+                        failed += 1
+                    yield encode_event(event)
+
+            yield encode_event({"event": "done", "succeeded": succeeded, "failed": failed, "latency_ms": int((time.perf_counter() - start_time) * 1000)})
 
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            yield encode_event({"event": "error", "type": "InternalServerError", "error": str(e)})
+            return
+        finally:
+            admission_slot.release()
+            trace.finish()
 
+    headers = {
+        "cache-control": "no-cache",
+        "X-Accel-Buffering": "no",
+        "Server-Timing": trace.server_timing(),
+    }
 
+    return StreamingResponse(
+        generate_ndjson_response(),
+        media_type="application/x-ndjson",
+        headers=headers,
+        background=BackgroundTask(admission_slot.release),
+    )
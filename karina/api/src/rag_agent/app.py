@@ -1,10 +1,61 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from rag_agent.core.config import settings
+from rag_agent.core.http_clients import aclose_http_clients, keep_warm
+from rag_agent.core.logging_config import configure_logging
+from rag_agent.api.health import router as health_router
 from rag_agent.api.rag import router
+from rag_agent.services.retriever.registry import RetrieverRegistry
+from rag_agent.services.warmup import WarmupFailed, warmup
 
-app = FastAPI(title=settings.APP_NAME)
+configure_logging()
+logger = logging.getLogger(__name__)
+
+
+async def _warmup(retriever_registry: RetrieverRegistry) -> dict:
+    if not settings.WARMUP_ENABLED:
+        return {}
+    try:
+        return await asyncio.wait_for(warmup(await retriever_registry.get()), timeout=settings.WARMUP_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        logger.error(f"Warmup did not finish within {settings.WARMUP_TIMEOUT_S}s; reporting not ready")
+        raise WarmupFailed(f"Warmup did not finish within {settings.WARMUP_TIMEOUT_S}s") from None
+    except Exception:
+        # Logged once here; /ready keeps answering 503 with the error
+        logger.exception("Warmup failed; reporting not ready")
+        raise
 
-app.include_router(router)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build retrievers (and their connection pools) once per process and share them across requests
+    retriever_registry = RetrieverRegistry(settings)
+    await retriever_registry.open()
+    app.state.retriever_registry = retriever_registry
+    # Warm up in the background: the server starts answering (/health, /ready → 503) right away
+    app.state.warmup = asyncio.create_task(_warmup(retriever_registry))
+    # Keep the provider connections warm between bursts of traffic
+    keep_warm_task = (
+        asyncio.create_task(keep_warm(settings.HTTP_KEEP_WARM_INTERVAL_S))
+        if settings.HTTP_KEEP_WARM_INTERVAL_S
+        else None
+    )
+    try:
+        yield
+    finally:
+        app.state.warmup.cancel()
+        if keep_warm_task is not None:
+            keep_warm_task.cancel()
+        await retriever_registry.close()
+        await aclose_http_clients()
+
+
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
+
+app.include_router(health_router)
+app.include_router(router)
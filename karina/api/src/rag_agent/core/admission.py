@@ -0,0 +1,185 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from enum import IntEnum
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from rag_agent.core import metrics
+from rag_agent.core.config import settings
+
+
+class Lane(IntEnum):
+    """Priority lanes of the admission queue; lower values are admitted first."""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted; map to an HTTP response with Retry-After."""
+
+    def __init__(self, status_code: int, detail: str, retry_after_s: float):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after_s = retry_after_s
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after_s)))}
+
+
+class AdmissionSlot:
+    """A granted request slot. release() is idempotent."""
+
+    def __init__(self, controller: "AdmissionController"):
+        self._controller = controller
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller._release()
+
+
+class AdmissionController:
+    """
+    Limits how many requests run at once. Requests over the limit wait in a bounded
+    priority queue (per-lane bounds); a full lane is rejected immediately with 429, and a
+    request still queued after `queue_timeout_s` is rejected with 503.
+    All methods must be called on the event loop that serves requests.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: Dict[Lane, int],
+        queue_timeout_s: float,
+        retry_after_s: float,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+        self.retry_after_s = retry_after_s
+        self._in_flight = 0
+        self._queued: Dict[Lane, int] = {lane: 0 for lane in Lane}
+        self._waiters: List[Tuple[int, int, "asyncio.Future[None]"]] = []
+        self._sequence = itertools.count()
+
+        self.in_flight_gauge = metrics.gauge("admission.in_flight")
+        self.queue_depth = {lane: metrics.gauge(f"admission.queue_depth.{lane.name.lower()}") for lane in Lane}
+        self.wait_s = metrics.histogram("admission.wait_s")
+        self.admitted = metrics.counter("admission.admitted")
+        self.rejected_queue_full = metrics.counter("admission.rejected.queue_full")
+        self.rejected_timeout = metrics.counter("admission.rejected.timeout")
+
+    def _set_queued(self, lane: Lane, delta: int) -> None:
+        self._queued[lane] += delta
+        self.queue_depth[lane].set(self._queued[lane])
+
+    def _grant(self) -> None:
+        self._in_flight += 1
+        self.in_flight_gauge.set(self._in_flight)
+        self.admitted.inc()
+
+    async def acquire(self, lane: Lane = Lane.INTERACTIVE) -> AdmissionSlot:
+        if self._in_flight < self.max_in_flight and not any(self._queued.values()):
+            self._grant()
+            self.wait_s.observe(0.0)
+            return AdmissionSlot(self)
+
+        if self._queued[lane] >= self.max_queue[lane]:
+            self.rejected_queue_full.inc()
+            raise AdmissionRejected(429, "Too many queued requests", self.retry_after_s)
+
+        wait_start = time.perf_counter()
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (lane.value, next(self._sequence), waiter))
+        self._set_queued(lane, 1)
+        try:
+            await asyncio.wait({waiter}, timeout=self.queue_timeout_s)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted by _release() just before the cancellation arrived: hand the slot back
+                self._release()
+            raise
+        finally:
+            if not waiter.done():
+                # Timed out or cancelled while queued; the stale heap entry is skipped on release
+                waiter.cancel()
+                self._set_queued(lane, -1)
+        self.wait_s.observe(time.perf_counter() - wait_start)
+        if waiter.cancelled():
+            self.rejected_timeout.inc()
+            raise AdmissionRejected(503, "Timed out waiting for capacity", self.retry_after_s)
+        return AdmissionSlot(self)
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        while self._waiters and self._in_flight < self.max_in_flight:
+            lane_value, _, waiter = heapq.heappop(self._waiters)
+            if waiter.done():
+                continue
+            self._set_queued(Lane(lane_value), -1)
+            self._grant()
+            waiter.set_result(None)
+        self.in_flight_gauge.set(self._in_flight)
+
+
+class StageLimiter:
+    """Concurrency limit for one pipeline stage (DB, embeddings, generation), with wait metrics."""
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(limit)
+        self.in_use = metrics.gauge(f"stage.{name}.in_use")
+        self.waiting = metrics.gauge(f"stage.{name}.waiting")
+        self.wait_s = metrics.histogram(f"stage.{name}.wait_s")
+
+    async def __aenter__(self) -> None:
+        wait_start = time.perf_counter()
+        self.waiting.inc()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting.dec()
+        self.wait_s.observe(time.perf_counter() - wait_start)
+        self.in_use.inc()
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.in_use.dec()
+        self._semaphore.release()
+
+
+@lru_cache(maxsize=None)
+def get_admission_controller() -> AdmissionController:
+    """Process-wide admission controller for the RAG endpoints, configured from settings."""
+    return AdmissionController(
+        max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+        max_queue={
+            Lane.INTERACTIVE: settings.ADMISSION_MAX_QUEUE_INTERACTIVE,
+            Lane.BATCH: settings.ADMISSION_MAX_QUEUE_BATCH,
+        },
+        queue_timeout_s=settings.ADMISSION_QUEUE_TIMEOUT_S,
+        retry_after_s=settings.ADMISSION_RETRY_AFTER_S,
+    )
+
+
+_STAGE_LIMITS = {
+    "db": lambda: settings.DB_POOL_MAX_SIZE,
+    "embedding": lambda: settings.ADMISSION_EMBEDDING_CONCURRENCY,
+    "generation": lambda: settings.ADMISSION_GENERATION_CONCURRENCY,
+}
+
+
+@lru_cache(maxsize=None)
+def stage(name: str) -> StageLimiter:
+    """
+    Process-wide limiter for a pipeline stage: `async with stage("db"): ...`.
+    The DB stage is capped at the pool size so requests wait here (with metrics) instead of
+    timing out inside the pool.
+    """
+    return StageLimiter(name, _STAGE_LIMITS[name]())
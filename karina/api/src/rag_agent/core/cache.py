@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, TypeVar
+
+from rag_agent.core import metrics
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """
+    Thread-safe LRU cache whose entries also expire `ttl_s` seconds after insertion.
+    Hit/miss counters are published as `<name>.hits` / `<name>.misses`.
+    """
+
+    def __init__(self, name: str, max_entries: int = 1024, ttl_s: float = 3600.0):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = metrics.counter(f"{name}.hits")
+        self.misses = metrics.counter(f"{name}.misses")
+        self.size = metrics.gauge(f"{name}.size")
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_s:
+                del self._entries[key]
+                self.size.set(len(self._entries))
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            self.misses.inc()
+            return None
+        self.hits.inc()
+        return entry[1]
+
+    def put(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.size.set(len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size.set(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteKVStore:
+    """
+    Small persistent string key/value store (one SQLite table per namespace).
+    Shared by every worker on the host that points at the same file; errors are logged, never raised.
+    """
+
+    def __init__(self, path: Path, namespace: str):
+        self.path = path
+        self.table = "kv_" + "".join(ch if ch.isalnum() else "_" for ch in namespace)
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False, timeout=5.0)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Persistent store {path}:{self.table} disabled: {e}")
+            self._db = None
+
+    def get(self, key: str, max_age_s: Optional[float] = None) -> Optional[str]:
+        if self._db is None:
+            return None
+        try:
+            with self._lock:
+                row = self._db.execute(f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Persistent store read failed: {e}")
+            return None
+        if row is None or (max_age_s is not None and time.time() - row[1] > max_age_s):
+            return None
+        return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        if self._db is None:
+            return
+        try:
+            with self._lock:
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, time.time()),
+                )
+                self._db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Persistent store write failed: {e}")
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent async calls: while a call for `key` is in flight, later callers
+    await the same result instead of starting their own.
+    """
+
+    def __init__(self, name: str):
+        self._in_flight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.shared = metrics.counter(f"{name}.singleflight_shared")
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[V]]) -> V:
+        future = self._in_flight.get(key)
+        while future is not None:
+            self.shared.inc()
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # this caller was cancelled
+                # The leading call was cancelled (e.g. its client disconnected); take over
+                future = self._in_flight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await fn()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark the exception as retrieved if nobody else was waiting
+                future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._in_flight.pop(key, None)
+
+
+class _Broadcast(Generic[V]):
+    """One upstream stream, buffered so every subscriber sees every item from the start."""
+
+    def __init__(self) -> None:
+        self.items: List[V] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.task: Optional["asyncio.Task[None]"] = None
+        self._changed = asyncio.Event()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def pump(self, stream: AsyncIterator[V]) -> None:
+        try:
+            async for item in stream:
+                self.items.append(item)
+                self._notify()
+        except asyncio.CancelledError:
+            self.error = asyncio.CancelledError()
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self._notify()
+
+    async def replay(self) -> AsyncIterator[V]:
+        position = 0
+        while True:
+            if position < len(self.items):
+                yield self.items[position]
+                position += 1
+                continue
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._changed.wait()
+
+
+class StreamSingleFlight:
+    """
+    Streaming counterpart of SingleFlight: while a stream for `key` is in flight, later callers
+    subscribe to it instead of starting their own. Items already produced are replayed to late
+    joiners first, then live items are fanned out. The upstream stream is cancelled once its
+    last subscriber goes away; finished streams are forgotten (caching them is not our job).
+    """
+
+    def __init__(self, name: str):
+        self._in_flight: Dict[Hashable, _Broadcast[Any]] = {}
+        self.started = metrics.counter(f"{name}.started")
+        self.shared = metrics.counter(f"{name}.shared")
+        self.in_flight = metrics.gauge(f"{name}.in_flight")
+
+    def joinable(self, key: Hashable) -> bool:
+        """True if subscribing to `key` now would join a stream already in flight."""
+        broadcast = self._in_flight.get(key)
+        return broadcast is not None and not broadcast.done
+
+    async def subscribe(self, key: Hashable, open_stream: Callable[[], AsyncIterator[V]]) -> AsyncIterator[V]:
+        broadcast = self._in_flight.get(key)
+        if broadcast is None or broadcast.done:
+            broadcast = _Broadcast()
+            broadcast.task = asyncio.create_task(self._run(key, broadcast, open_stream()))
+            self._in_flight[key] = broadcast
+            self.started.inc()
+        else:
+            self.shared.inc()
+
+        broadcast.subscribers += 1
+        try:
+            async for item in broadcast.replay():
+                yield item
+        finally:
+            broadcast.subscribers -= 1
+            if broadcast.subscribers == 0 and not broadcast.done:
+                broadcast.task.cancel()
+                if self._in_flight.get(key) is broadcast:
+                    del self._in_flight[key]
+
+    async def _run(self, key: Hashable, broadcast: _Broadcast[Any], stream: AsyncIterator[Any]) -> None:
+        self.in_flight.inc()
+        try:
+            await broadcast.pump(stream)
+        except asyncio.CancelledError:
+            pass  # every subscriber left
+        finally:
+            self.in_flight.dec()
+            if self._in_flight.get(key) is broadcast:
+                del self._in_flight[key]
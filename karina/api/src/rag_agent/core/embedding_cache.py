@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from rag_agent.core import metrics
+from rag_agent.core.config import settings
+from rag_agent.core.normalization import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache of query embeddings keyed by (model name, normalized text).
+
+    - Memory tier: bounded LRU of float32 arrays.
+    - Disk tier (optional): SQLite file shared by all workers on the host, survives restarts.
+      Disk hits are promoted into the memory tier.
+    """
+
+    def __init__(self, max_entries: int = 2048, disk_path: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self._memory: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_lock = threading.Lock()
+
+        self.memory_hits = metrics.counter("embedding_cache.hits.memory")
+        self.disk_hits = metrics.counter("embedding_cache.hits.disk")
+        self.misses = metrics.counter("embedding_cache.misses")
+        self.size = metrics.gauge("embedding_cache.memory_size")
+
+        if disk_path is not None:
+            try:
+                disk_path.parent.mkdir(parents=True, exist_ok=True)
+                self._disk = sqlite3.connect(str(disk_path), check_same_thread=False, timeout=5.0)
+                self._disk.execute("PRAGMA journal_mode=WAL")
+                self._disk.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    " key TEXT PRIMARY KEY, model_name TEXT NOT NULL, dim INTEGER NOT NULL,"
+                    " vector BLOB NOT NULL, created_at REAL NOT NULL)"
+                )
+                self._disk.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Embedding cache disk tier disabled ({disk_path}): {e}")
+                self._disk = None
+
+    @staticmethod
+    def _disk_key(model_name: str, normalized_text: str) -> str:
+        return hashlib.sha256(f"{model_name}\x00{normalized_text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: Tuple[str, str], vector: np.ndarray) -> None:
+        with self._memory_lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+            self.size.set(len(self._memory))
+
+    def _disk_get(self, model_name: str, normalized_text: str) -> Optional[np.ndarray]:
+        if self._disk is None:
+            return None
+        try:
+            with self._disk_lock:
+                row = self._disk.execute(
+                    "SELECT dim, vector FROM embeddings WHERE key = ?",
+                    (self._disk_key(model_name, normalized_text),),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Embedding cache disk read failed: {e}")
+            return None
+        if row is None:
+            return None
+        dim, blob = row
+        vector = np.frombuffer(blob, dtype=np.float32)
+        return vector if vector.shape[0] == dim else None
+
+    def _disk_put(self, model_name: str, normalized_text: str, vector: np.ndarray) -> None:
+        if self._disk is None:
+            return
+        try:
+            with self._disk_lock:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, model_name, dim, vector, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (self._disk_key(model_name, normalized_text), model_name, int(vector.shape[0]), vector.tobytes(), time.time()),
+                )
+                self._disk.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Embedding cache disk write failed: {e}")
+
+    def get(self, model_name: str, text: str) -> Optional[np.ndarray]:
+        key = (model_name, normalize_query(text))
+        with self._memory_lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+        if vector is not None:
+            self.memory_hits.inc()
+            return vector
+
+        vector = self._disk_get(*key)
+        if vector is not None:
+            self.disk_hits.inc()
+            self._remember(key, vector)
+            return vector
+
+        self.misses.inc()
+        return None
+
+    def put(self, model_name: str, text: str, embedding: List[float]) -> np.ndarray:
+        key = (model_name, normalize_query(text))
+        vector = np.asarray(embedding, dtype=np.float32)
+        self._remember(key, vector)
+        self._disk_put(*key, vector)
+        return vector
+
+    def close(self) -> None:
+        if self._disk is not None:
+            with self._disk_lock:
+                self._disk.close()
+                self._disk = None
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain embeddings client that consults an EmbeddingCache before calling `client`."""
+
+    def __init__(self, client: Embeddings, model_name: str, cache: EmbeddingCache):
+        self.client = client
+        self.model_name = model_name
+        self.cache = cache
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self.cache.get(self.model_name, text)
+        if vector is None:
+            vector = self.cache.put(self.model_name, text, self.client.embed_query(text))
+        return vector.tolist()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        # The disk tier is SQLite; keep its I/O off the event loop
+        vector = await asyncio.to_thread(self.cache.get, self.model_name, text)
+        if vector is None:
+            embedding = await self.client.aembed_query(text)
+            vector = await asyncio.to_thread(self.cache.put, self.model_name, text, embedding)
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = [self.cache.get(self.model_name, text) for text in texts]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embeddings = self.client.embed_documents([texts[i] for i in missing])
+            for i, embedding in zip(missing, embeddings):
+                vectors[i] = self.cache.put(self.model_name, texts[i], embedding)
+        return [vector.tolist() for vector in vectors]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = await asyncio.to_thread(lambda: [self.cache.get(self.model_name, text) for text in texts])
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embeddings = await self.client.aembed_documents([texts[i] for i in missing])
+            stored = await asyncio.to_thread(
+                lambda: [self.cache.put(self.model_name, texts[i], embedding) for i, embedding in zip(missing, embeddings)]
+            )
+            for i, vector in zip(missing, stored):
+                vectors[i] = vector
+        return [vector.tolist() for vector in vectors]
+
+
+@lru_cache(maxsize=None)
+def get_embedding_cache() -> EmbeddingCache:
+    """Process-wide embedding cache configured from settings."""
+    return EmbeddingCache(
+        max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+        disk_path=settings.EMBEDDING_CACHE_PATH if settings.EMBEDDING_CACHE_DISK_ENABLED else None,
+    )
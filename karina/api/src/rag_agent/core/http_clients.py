@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Any, Dict
+
+import httpx
+
+from rag_agent.core import metrics
+from rag_agent.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Base URL per provider; used for keep-warm pings
+PROVIDER_BASE_URLS = {
+    "openai": (settings.OPENAI_BASE_URL or "https://api.openai.com/v1").rstrip("/"),
+}
+
+
+@dataclass
+class ProviderHTTPClients:
+    """
+    One sync and one async httpx client per provider, shared by every model client of that
+    provider (chat, embeddings, query expansion, NER), so all calls draw from the same warm
+    keep-alive / HTTP/2 connections instead of one pool per SDK object.
+    """
+    provider: str
+    sync: httpx.Client
+    async_: httpx.AsyncClient
+    last_request_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        prefix = f"http.{self.provider}"
+        self.requests = metrics.counter(f"{prefix}.requests")
+        self.keep_warm_pings = metrics.counter(f"{prefix}.keep_warm_pings")
+        self.connections = {
+            kind: metrics.gauge(f"{prefix}.{kind}.connections") for kind in ("sync", "async")
+        }
+        self.idle_connections = {
+            kind: metrics.gauge(f"{prefix}.{kind}.idle_connections") for kind in ("sync", "async")
+        }
+
+    def record_pool_stats(self) -> None:
+        """Update the connection gauges (httpx does not publish pool stats; read the httpcore pool)."""
+        for kind, client in (("sync", self.sync), ("async", self.async_)):
+            pool = getattr(client._transport, "_pool", None)
+            pool_connections = getattr(pool, "connections", None)
+            if pool_connections is None:
+                continue
+            self.connections[kind].set(len(pool_connections))
+            self.idle_connections[kind].set(sum(1 for connection in pool_connections if connection.is_idle()))
+
+    def _on_request(self, request: httpx.Request) -> None:
+        self.last_request_at = time.monotonic()
+        self.requests.inc()
+
+    async def _on_async_request(self, request: httpx.Request) -> None:
+        self._on_request(request)
+
+    def _on_response(self, response: httpx.Response) -> None:
+        self.record_pool_stats()
+
+    async def _on_async_response(self, response: httpx.Response) -> None:
+        self._on_response(response)
+
+    def close(self) -> None:
+        self.sync.close()
+
+    async def aclose(self) -> None:
+        self.sync.close()
+        await self.async_.aclose()
+
+
+def _client_kwargs() -> Dict[str, Any]:
+    http2 = settings.HTTP2_ENABLED and find_spec("h2") is not None
+    if settings.HTTP2_ENABLED and not http2:
+        logger.warning("HTTP2_ENABLED but the h2 package is not installed; using HTTP/1.1 (pip install 'httpx[http2]')")
+    return {
+        "http2": http2,
+        "limits": httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_S,
+        ),
+        "timeout": httpx.Timeout(settings.HTTP_TIMEOUT_S, connect=settings.HTTP_CONNECT_TIMEOUT_S),
+    }
+
+
+@lru_cache(maxsize=None)
+def get_http_clients(provider: str) -> ProviderHTTPClients:
+    """Process-wide shared clients for `provider` (created in each worker, after fork)."""
+    clients = ProviderHTTPClients(
+        provider=provider,
+        sync=httpx.Client(**_client_kwargs()),
+        async_=httpx.AsyncClient(**_client_kwargs()),
+    )
+    clients.sync.event_hooks = {"request": [clients._on_request], "response": [clients._on_response]}
+    clients.async_.event_hooks = {"request": [clients._on_async_request], "response": [clients._on_async_response]}
+    return clients
+
+
+async def _ping(clients: ProviderHTTPClients) -> None:
+    # A small authenticated GET keeps one TLS connection (and the provider's edge) warm
+    api_key = settings.OPENAI_API_QUERY_KEY.get_secret_value()
+    response = await clients.async_.get(
+        f"{PROVIDER_BASE_URLS[clients.provider]}/models/{settings.QUERY_MODEL}",
+        headers={"Authorization": f"Bearer {api_key}"},
+    )
+    await response.aclose()
+    clients.keep_warm_pings.inc()
+
+
+async def keep_warm(interval_s: float) -> None:
+    """
+    Ping every provider whose async client has been idle for `interval_s`, so the next real
+    call does not pay a TCP/TLS handshake after the idle connection expired. Busy clients are
+    never pinged. Runs until cancelled (see the app lifespan).
+    """
+    while True:
+        await asyncio.sleep(interval_s)
+        for provider in PROVIDER_BASE_URLS:
+            clients = get_http_clients(provider)
+            if time.monotonic() - clients.last_request_at < interval_s:
+                continue
+            try:
+                await _ping(clients)
+            except Exception as e:
+                logger.warning(f"Keep-warm ping to {provider} failed: {e}")
+            clients.record_pool_stats()
+
+
+async def aclose_http_clients() -> None:
+    """Close the shared clients (app shutdown)."""
+    if get_http_clients.cache_info().currsize == 0:
+        return
+    for provider in PROVIDER_BASE_URLS:
+        await get_http_clients(provider).aclose()
+    get_http_clients.cache_clear()
@@ -1,27 +1,113 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
-
-# Create file handler for important logs
-file_handler = RotatingFileHandler(
-    "ai_agent_output.log",
-    maxBytes=10_000_000,
-    backupCount=5,
-    encoding="utf-8",
-)
-
-# Create console handler for important logs only
-stream_handler = logging.StreamHandler()
-
-# Configure main logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[file_handler, stream_handler]
-)
-
-# Reduce noise from external libraries
-logging.getLogger("httpx").setLevel(logging.WARNING)
-logging.getLogger("openai").setLevel(logging.WARNING)
-logging.getLogger("langchain").setLevel(logging.WARNING)
-logging.getLogger("urllib3").setLevel(logging.WARNING)
+import os
+import queue
+import random
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Mapping, Optional
 
+from rag_agent.core.config import settings
+
+_configured = False
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+_verbose: ContextVar[bool] = ContextVar("rag_agent_verbose_logging", default=False)
+
+
+def configure_logging() -> None:
+    """
+    Configure root logging (file + console). Called by the entry points (app, REPL, launcher)
+    rather than at import time, so importing the package has no side effects. Idempotent.
+
+    Request code only enqueues records (QueueHandler); formatting and the file/console writes
+    happen on a QueueListener thread, so a slow disk or terminal never blocks the event loop.
+    """
+    global _configured, _queue_handler
+    if _configured:
+        return
+    _configured = True
+
+    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+    # Create file handler for important logs
+    file_handler = RotatingFileHandler(
+        "ai_agent_output.log",
+        maxBytes=10_000_000,
+        backupCount=5,
+        encoding="utf-8",
+    )
+    file_handler.setFormatter(formatter)
+
+    # Create console handler for important logs only
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    _queue_handler = QueueHandler(queue.SimpleQueue())
+    # Only merge args into the message here; the listener's handlers apply the real format
+    _queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    _start_listener(file_handler, stream_handler)
+
+    # Configure main logging
+    logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+
+    # Reduce noise from external libraries
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("openai").setLevel(logging.WARNING)
+    logging.getLogger("langchain").setLevel(logging.WARNING)
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
+
+    atexit.register(stop_logging)
+    if hasattr(os, "register_at_fork"):
+        # The listener thread does not survive fork (csha-agent serve); each worker starts its own
+        os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+
+def _start_listener(*handlers: logging.Handler) -> None:
+    global _listener
+    _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_listener_in_child() -> None:
+    if _listener is None:
+        return
+    # Fresh queue: records enqueued by the parent belong to the parent's listener
+    _queue_handler.queue = queue.SimpleQueue()
+    _start_listener(*_listener.handlers)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def enable_verbose_logging(headers: Optional[Mapping[str, str]] = None) -> bool:
+    """
+    Decide whether this request logs per-request detail (stage-1 breakdowns, chunk bodies,
+    full responses): when the LOG_VERBOSE_HEADER header is set, or for a LOG_VERBOSE_SAMPLE_RATE
+    sample of requests. The decision holds for the current task and the tasks it creates.
+    """
+    verbose = (
+        (headers is not None and bool(headers.get(settings.LOG_VERBOSE_HEADER)))
+        or random.random() < settings.LOG_VERBOSE_SAMPLE_RATE
+    )
+    _verbose.set(verbose)
+    return verbose
+
+
+def set_verbose_logging(verbose: bool) -> None:
+    _verbose.set(verbose)
+
+
+def verbose_logging(logger: logging.Logger) -> bool:
+    """
+    True when per-request detail should be logged: the request opted in (see
+    enable_verbose_logging) or `logger` is at DEBUG. Check it before building detail,
+    so the default path does no formatting or sorting.
+    """
+    return _verbose.get() or logger.isEnabledFor(logging.DEBUG)
@@ -0,0 +1,115 @@
+import threading
+from collections import deque
+from typing import Any, Deque, Dict
+
+
+class Counter:
+    """Monotonic counter."""
+
+    def __init__(self) -> None:
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class Gauge:
+    """Value that can go up and down (sizes, in-flight counts)."""
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Histogram:
+    """Count/sum plus a bounded window of recent observations for percentiles."""
+
+    def __init__(self, window: int = 1024) -> None:
+        self._count = 0
+        self._sum = 0.0
+        self._recent: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._count += 1
+            self._sum += value
+            self._recent.append(value)
+
+    @property
+    def window_count(self) -> int:
+        """Number of observations in the percentile window."""
+        return len(self._recent)
+
+    def percentile(self, q: float) -> float:
+        with self._lock:
+            recent = sorted(self._recent)
+        if not recent:
+            return 0.0
+        index = min(len(recent) - 1, max(0, int(round(q / 100.0 * (len(recent) - 1)))))
+        return recent[index]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self._count,
+            "sum": round(self._sum, 6),
+            "p50": round(self.percentile(50), 6),
+            "p95": round(self.percentile(95), 6),
+            "p99": round(self.percentile(99), 6),
+        }
+
+
+_lock = threading.Lock()
+_counters: Dict[str, Counter] = {}
+_gauges: Dict[str, Gauge] = {}
+_histograms: Dict[str, Histogram] = {}
+
+
+def counter(name: str) -> Counter:
+    with _lock:
+        return _counters.setdefault(name, Counter())
+
+
+def gauge(name: str) -> Gauge:
+    with _lock:
+        return _gauges.setdefault(name, Gauge())
+
+
+def histogram(name: str) -> Histogram:
+    with _lock:
+        return _histograms.setdefault(name, Histogram())
+
+
+def snapshot() -> Dict[str, Any]:
+    """Point-in-time view of every metric in this process."""
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        histograms = dict(_histograms)
+    return {
+        "counters": {name: c.value for name, c in sorted(counters.items())},
+        "gauges": {name: g.value for name, g in sorted(gauges.items())},
+        "histograms": {name: h.summary() for name, h in sorted(histograms.items())},
+    }
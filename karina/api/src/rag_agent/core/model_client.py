@@ -1,11 +1,15 @@
 from dataclasses import dataclass
 from functools import lru_cache
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from typing import Union
+from typing import TYPE_CHECKING, Union
 
 from rag_agent.core.config import settings
 from rag_agent.core.enums import ModelType
 
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+    from rag_agent.core.embedding_cache import CachedEmbeddings
+    from rag_agent.core.resilient_embeddings import ResilientEmbeddings
+
 
 @dataclass (frozen=True)
 class ModelConfig:
@@ -13,30 +17,63 @@ class ModelConfig:
     model_name: str
     temperature: float = 0.0
     streaming: bool = False
+    # Embeddings only: False skips the query-embedding cache (for one-off texts that would only evict queries)
+    cached: bool = True
+
+
+def _base_url_kwargs() -> dict:
+    # Only override the SDK default (which also honours OPENAI_API_BASE) when configured
+    return {"openai_api_base": settings.OPENAI_BASE_URL} if settings.OPENAI_BASE_URL else {}
 
 
 @lru_cache(maxsize=None)
-def get_model_client(config: ModelConfig) -> Union[ChatOpenAI, OpenAIEmbeddings]:
+def get_model_client(config: ModelConfig) -> Union["ChatOpenAI", "OpenAIEmbeddings", "ResilientEmbeddings", "CachedEmbeddings"]:
+    # The provider SDKs take seconds to import; load them with the first client instead of at import time
+    from rag_agent.core.http_clients import get_http_clients
+
     if config.model_type == ModelType.QUERY:
         api_key = settings.OPENAI_API_QUERY_KEY.get_secret_value()
         if not api_key:
             raise EnvironmentError("CSHA_OPENAI_API_QUERY_KEY not set in environment variables")
+        from langchain_openai import ChatOpenAI
 
+        http_clients = get_http_clients("openai")
         return ChatOpenAI(
         openai_api_key=api_key,
         model_name=config.model_name,
         temperature=config.temperature,
-        streaming=config.streaming
+        streaming=config.streaming,
+        **_base_url_kwargs(),
+        http_client=http_clients.sync,
+        http_async_client=http_clients.async_,
     )
     elif config.model_type == ModelType.EMBEDDING:
         api_key = settings.OPENAI_API_EMBEDDINGS_KEY.get_secret_value()
         if not api_key:
             raise EnvironmentError("CSHA_OPENAI_API_EMBEDDINGS_KEY not set in environment variables")
+        from langchain_openai import OpenAIEmbeddings
 
-        return OpenAIEmbeddings(
+        http_clients = get_http_clients("openai")
+        embedding_client = OpenAIEmbeddings(
             openai_api_key=api_key,
-            model=config.model_name
+            model=config.model_name,
+            **_base_url_kwargs(),
+            http_client=http_clients.sync,
+            http_async_client=http_clients.async_,
+            # Async retries (and hedging) are handled by the resilience policy below
+            max_retries=0 if settings.RESILIENCE_ENABLED else 2,
         )
+        if settings.RESILIENCE_ENABLED:
+            from rag_agent.core.resilience import get_resilience_policy
+            from rag_agent.core.resilient_embeddings import ResilientEmbeddings
+            embedding_client = ResilientEmbeddings(
+                embedding_client,
+                get_resilience_policy("embedding"),
+                get_resilience_policy("embedding_documents"),
+            )
+        if settings.EMBEDDING_CACHE_ENABLED and config.cached:
+            from rag_agent.core.embedding_cache import CachedEmbeddings, get_embedding_cache
+            return CachedEmbeddings(embedding_client, config.model_name, get_embedding_cache())
+        return embedding_client
     else:
         raise ValueError(f"Invalid model type: {config.model_type}")
-    
\ No newline at end of file
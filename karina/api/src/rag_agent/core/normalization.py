@@ -0,0 +1,17 @@
+import re
+import unicodedata
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a user query used as a cache / coalescing key.
+
+    Case, punctuation and whitespace differences are dropped, so
+    "What is an SBHC?" and "what is an sbhc" map to the same key.
+    """
+    text = unicodedata.normalize("NFKC", query).casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
@@ -1,10 +1,13 @@
 from textwrap import dedent
 
-from .default import DEFAULT_TEMPLATE
+from .default import DEFAULT_PREFIX, DEFAULT_SUFFIX, DEFAULT_TEMPLATE
+from .layout import PromptLayout
 from .ner_keyword_extractor_template import NER_KEYWORD_EXTRACT_TEMPLATE
 from .multiple_references_template import MULTIPLE_REFERENCES_TEMPLATE
 from .direct_chat import DIRECT_CHAT_TEMPLATE
 
+DEFAULT_LAYOUT = PromptLayout("default", DEFAULT_PREFIX, DEFAULT_SUFFIX)
+
 PROMPT_TEMPLATES = {
     "default": dedent(DEFAULT_TEMPLATE).strip(),
     "ner_keyword_extractor": dedent(NER_KEYWORD_EXTRACT_TEMPLATE).strip(),
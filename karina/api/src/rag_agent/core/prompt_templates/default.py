@@ -1,15 +1,14 @@
-DEFAULT_TEMPLATE = """
+# Static instructions first and the per-request parts (date, context, question) last, so every
+# request starts with the same bytes and the provider can reuse its cached prompt prefix.
+# DEFAULT_PREFIX must not contain placeholders.
+DEFAULT_PREFIX = """
   You represent CSHA (California School-Based Health Alliance) tasked with providing helpful answers to stakeholder questions.
-
-  Answer time-related questions based on today's date: {today_date}.
+  Today's date, the text-chunks and the user question are given at the end.
 
   YOUR ROLE AND VOICE (CRITICAL):
     - Always speak directly to the person asking the question, as if they are a CSHA stakeholder.
     - Do NOT answer in the third person (e.g., "this AI agent can...") or second person (e.g., "you should...").
 
-  Here is the user question:
-  ```{query}```
-
   Follow these rules in order to answer the user question: 
   1. Handle missing information, out-of-scope queries, and inappropriate queries:
 
@@ -126,7 +125,16 @@ DEFAULT_TEMPLATE = """
   [3] https://www.internationallawreview.org/employee-privacy  
   [4] https://www.digitalrightscenter.net/device-vs-data
   ```
+"""
+
+DEFAULT_SUFFIX = """
+  Answer time-related questions based on today's date: {today_date}.
 
   Here are the text-chunks:
   ```{context}```
-  """
\ No newline at end of file
+
+  Here is the user question:
+  ```{query}```
+  """
+
+DEFAULT_TEMPLATE = DEFAULT_PREFIX + DEFAULT_SUFFIX
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PromptLayout:
+    """
+    A prompt split into a static prefix, sent byte-identical on every request so the provider's
+    prompt-prefix cache applies, and a suffix holding the per-request placeholders.
+    """
+    name: str
+    prefix: str
+    suffix: str
+
+    @property
+    def template(self) -> str:
+        """The whole prompt as one format string."""
+        return self.prefix + self.suffix
+
+    def render(self, **values: str) -> str:
+        # Only the suffix is formatted, so the prefix is never touched per request
+        return self.prefix + self.suffix.format(**values)
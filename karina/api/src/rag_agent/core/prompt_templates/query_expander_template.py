@@ -1,3 +1,11 @@
+# Shared by the LLM prompt below and the local rule-based expander (services/local_query_expander.py)
+ACRONYM_GLOSSARY = {
+    "V2R": "vision to reality",
+    "SBHC": "school-based health center",
+    "FQHC": "federally qualified health center",
+    "LCFF": "local control funding formula",
+}
+
 QUERY_EXPAND_TEMPLATE = """
     You are now a query expander model.
 
@@ -10,11 +18,7 @@ QUERY_EXPAND_TEMPLATE = """
 
     Acronym glossary:
     ```
-    V2R: vision to reality
-    SBHC: school-based health center
-    FQHC: federally qualified health center
-    LCFF: local control funding formula
-    ```
+""" + "".join(f"    {acronym}: {expansion}\n" for acronym, expansion in ACRONYM_GLOSSARY.items()) + """    ```
 
     Query:
     ```{query}```
@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import random
+import time
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from rag_agent.core import metrics
+from rag_agent.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying (and counting against the breaker); other 4xx are caller errors
+_RETRYABLE_STATUS = {408, 409, 429}
+
+
+class UpstreamUnavailable(Exception):
+    """Raised instead of calling the provider when the circuit is open or the deadline passed; degrade."""
+
+
+def _retryable(error: BaseException) -> bool:
+    status = getattr(error, "status_code", None)
+    return status is None or status in _RETRYABLE_STATUS or status >= 500
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failed calls. While open, calls are refused
+    (the caller degrades) until `reset_timeout_s` has passed; then a single probe call is let
+    through (half-open), which closes the circuit on success or re-opens it on failure.
+    All methods must be called on the event loop that serves requests.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout_s: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+        self.open_gauge = metrics.gauge(f"resilience.{name}.circuit_open")
+        self.opened = metrics.counter(f"resilience.{name}.circuit_opened")
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_timeout_s:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open" or self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def release_probe(self) -> None:
+        """The probe ended without an outcome (cancelled); let the next call probe."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probing = False
+        if self._opened_at is not None:
+            self._opened_at = None
+            self.open_gauge.set(0)
+            logger.info(f"Circuit {self.name} closed")
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        was_probe = self._probing
+        self._probing = False
+        if was_probe or (self._opened_at is None and self._failures >= self.failure_threshold):
+            if self._opened_at is None:
+                self.opened.inc()
+                logger.warning(f"Circuit {self.name} opened after {self._failures} failed calls; degrading")
+            self._opened_at = time.monotonic()
+            self.open_gauge.set(1)
+
+
+class ResiliencePolicy:
+    """
+    Wraps an idempotent upstream call (embedding, query expansion) with:
+
+    - a deadline for the whole call, retries included;
+    - a hedge: once an attempt is slower than the `hedge_quantile` of recent successful
+      attempts, an identical request is sent and whichever answers first wins;
+    - up to `max_retries` retries of retryable errors, with full-jitter exponential backoff;
+    - a CircuitBreaker that refuses calls after repeated failures.
+
+    Refused and timed-out calls raise UpstreamUnavailable; callers fall back to degraded
+    behaviour (raw query instead of an expansion, keyword-only retrieval without a vector).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        deadline_s: float,
+        max_retries: int,
+        backoff_base_s: float,
+        backoff_max_s: float,
+        hedge: bool,
+        hedge_quantile: float,
+        hedge_min_delay_s: float,
+        hedge_min_samples: int,
+        breaker: CircuitBreaker,
+    ):
+        self.name = name
+        self.deadline_s = deadline_s
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay_s = hedge_min_delay_s
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = breaker
+
+        prefix = f"resilience.{name}"
+        self.latency = metrics.histogram(f"{prefix}.attempt_latency_s")
+        self.calls = metrics.counter(f"{prefix}.calls")
+        self.hedges = metrics.counter(f"{prefix}.hedges")
+        self.hedge_wins = metrics.counter(f"{prefix}.hedge_wins")
+        self.retries = metrics.counter(f"{prefix}.retries")
+        self.timeouts = metrics.counter(f"{prefix}.timeouts")
+        self.failures = metrics.counter(f"{prefix}.failures")
+        self.short_circuits = metrics.counter(f"{prefix}.short_circuits")
+
+    def hedge_delay(self) -> Optional[float]:
+        """How long an attempt may run before it is hedged; None = no hedging (yet)."""
+        if not self.hedge or self.latency.window_count < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay_s, self.latency.percentile(self.hedge_quantile * 100))
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn` (a fresh awaitable per call, so it can be retried and hedged) under the policy."""
+        if not self.breaker.allow():
+            self.short_circuits.inc()
+            raise UpstreamUnavailable(f"{self.name}: circuit open")
+        self.calls.inc()
+        try:
+            result = await asyncio.wait_for(self._call_with_retries(fn), timeout=self.deadline_s)
+        except asyncio.TimeoutError as e:
+            self.timeouts.inc()
+            self.breaker.record_failure()
+            raise UpstreamUnavailable(f"{self.name}: no answer within {self.deadline_s}s") from e
+        except asyncio.CancelledError:
+            self.breaker.release_probe()
+            raise
+        except Exception as e:
+            self.failures.inc()
+            if _retryable(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.release_probe()
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def _call_with_retries(self, fn: Callable[[], Awaitable[T]]) -> T:
+        attempt = 0
+        while True:
+            try:
+                return await self._hedged(fn)
+            except Exception as e:
+                if attempt >= self.max_retries or not _retryable(e):
+                    raise
+                backoff = random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2 ** attempt))
+                attempt += 1
+                self.retries.inc()
+                logger.warning(f"{self.name} attempt {attempt} failed ({e}); retrying in {backoff:.3f}s")
+                await asyncio.sleep(backoff)
+
+    async def _timed(self, fn: Callable[[], Awaitable[T]]) -> T:
+        start = time.monotonic()
+        result = await fn()
+        self.latency.observe(time.monotonic() - start)
+        return result
+
+    async def _hedged(self, fn: Callable[[], Awaitable[T]]) -> T:
+        delay = self.hedge_delay()
+        if delay is None:
+            return await self._timed(fn)
+
+        tasks = [asyncio.ensure_future(self._timed(fn))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return tasks[0].result()
+            self.hedges.inc()
+            tasks.append(asyncio.ensure_future(self._timed(fn)))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is tasks[1]:
+                            self.hedge_wins.inc()
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+
+@lru_cache(maxsize=None)
+def get_resilience_policy(name: str) -> ResiliencePolicy:
+    """
+    Process-wide policy for one kind of upstream call: "embedding" (query embeddings),
+    "embedding_documents" (bulk embeddings; never hedged) or "expansion".
+    """
+    deadlines = {
+        "embedding": settings.RESILIENCE_EMBEDDING_DEADLINE_S,
+        "embedding_documents": settings.RESILIENCE_EMBEDDING_DOCUMENTS_DEADLINE_S,
+        "expansion": settings.RESILIENCE_EXPANSION_DEADLINE_S,
+    }
+    return ResiliencePolicy(
+        name,
+        deadline_s=deadlines[name],
+        max_retries=settings.RESILIENCE_MAX_RETRIES,
+        backoff_base_s=settings.RESILIENCE_BACKOFF_BASE_S,
+        backoff_max_s=settings.RESILIENCE_BACKOFF_MAX_S,
+        # A hedge of a bulk call would resend the whole batch
+        hedge=settings.RESILIENCE_HEDGE_ENABLED and name != "embedding_documents",
+        hedge_quantile=settings.RESILIENCE_HEDGE_QUANTILE,
+        hedge_min_delay_s=settings.RESILIENCE_HEDGE_MIN_DELAY_S,
+        hedge_min_samples=settings.RESILIENCE_HEDGE_MIN_SAMPLES,
+        breaker=CircuitBreaker(
+            name,
+            failure_threshold=settings.RESILIENCE_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout_s=settings.RESILIENCE_BREAKER_RESET_S,
+        ),
+    )
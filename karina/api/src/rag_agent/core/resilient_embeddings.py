@@ -0,0 +1,33 @@
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from rag_agent.core.resilience import ResiliencePolicy
+
+
+class ResilientEmbeddings(Embeddings):
+    """
+    LangChain embeddings client whose async calls to `client` run under a ResiliencePolicy
+    (deadline, hedging, retries, circuit breaker). Sync calls are passed through unchanged.
+    Sits below CachedEmbeddings, so cached vectors are still served while the circuit is open.
+
+    Query embeddings use `policy`; bulk document embeddings use `documents_policy`, so their
+    latency and failures stay out of the interactive hedge delay and circuit breaker.
+    """
+
+    def __init__(self, client: Embeddings, policy: ResiliencePolicy, documents_policy: ResiliencePolicy):
+        self.client = client
+        self.policy = policy
+        self.documents_policy = documents_policy
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.client.embed_query(text)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.client.embed_documents(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.policy.call(lambda: self.client.aembed_query(text))
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.documents_policy.call(lambda: self.client.aembed_documents(texts))
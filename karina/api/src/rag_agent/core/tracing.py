@@ -0,0 +1,154 @@
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from rag_agent.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    name: str
+    start_ns: int  # unix epoch
+    end_ns: int
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    span_id: str = field(default_factory=lambda: os.urandom(8).hex())
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class Trace:
+    """
+    Spans of one request, identified by the request id. Spans are recorded with the active
+    trace (see activate/span), so code below the endpoints never passes the trace around;
+    asyncio tasks inherit the trace of the code that created them.
+    """
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.start_ns = time.time_ns()
+        self.spans: List[Span] = []
+
+    def record(self, name: str, start_ns: int, end_ns: int, **attributes: Any) -> Span:
+        span_record = Span(name, start_ns, end_ns, attributes)
+        self.spans.append(span_record)
+        return span_record
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """Time the block; the yielded dict can be filled with attributes."""
+        start_ns = time.time_ns()
+        try:
+            yield attributes
+        finally:
+            self.record(name, start_ns, time.time_ns(), **attributes)
+
+    def summary(self) -> Dict[str, float]:
+        """Milliseconds per span name (repeated spans are summed), in recording order."""
+        totals: Dict[str, float] = {}
+        for span_record in self.spans:
+            totals[span_record.name] = totals.get(span_record.name, 0.0) + span_record.duration_ms
+        return {name: round(duration_ms, 1) for name, duration_ms in totals.items()}
+
+    def server_timing(self) -> str:
+        """Value for the Server-Timing response header."""
+        return ", ".join(f"{name};dur={duration_ms}" for name, duration_ms in self.summary().items())
+
+    def finish(self) -> None:
+        """Record the `total` span and hand the trace to the exporter (if configured)."""
+        self.record("total", self.start_ns, time.time_ns())
+        exporter = get_span_exporter()
+        if exporter is not None:
+            exporter.export(self)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("rag_agent_trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def activate(trace: Optional[Trace]) -> None:
+    """Make `trace` the active trace for the current task (and the tasks it creates)."""
+    _current_trace.set(trace)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """Record a span on the active trace; a no-op without one."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield attributes
+        return
+    with trace.span(name, **attributes) as span_attributes:
+        yield span_attributes
+
+
+def child_trace(suffix: str) -> Optional[Trace]:
+    """A trace for one part of the active request (e.g. one query of a batch)."""
+    trace = _current_trace.get()
+    return Trace(f"{trace.trace_id}/{suffix}") if trace is not None else None
+
+
+class JSONLSpanExporter:
+    """
+    Appends spans as JSON lines using OTLP span field names (traceId/spanId are hex; the request
+    id is kept as the `request_id` attribute), so the file can be replayed into an OTLP collector.
+    Writes happen on a background thread.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._queue: "queue.Queue[Trace]" = queue.Queue(maxsize=10_000)
+        threading.Thread(target=self._write_loop, name="span-exporter", daemon=True).start()
+
+    def export(self, trace: Trace) -> None:
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            logger.warning(f"Span export queue full; dropping trace {trace.trace_id}")
+
+    @staticmethod
+    def _lines(trace: Trace) -> List[str]:
+        trace_id_hex = hashlib.md5(trace.trace_id.encode("utf-8")).hexdigest()
+        return [
+            json.dumps({
+                "traceId": trace_id_hex,
+                "spanId": span_record.span_id,
+                "name": span_record.name,
+                "startTimeUnixNano": span_record.start_ns,
+                "endTimeUnixNano": span_record.end_ns,
+                "attributes": {"request_id": trace.trace_id, **span_record.attributes},
+            }, separators=(",", ":"), default=str)
+            for span_record in trace.spans
+        ]
+
+    def _write_loop(self) -> None:
+        while True:
+            trace = self._queue.get()
+            try:
+                with open(self.path, "a", encoding="utf-8") as trace_file:
+                    trace_file.write("\n".join(self._lines(trace)) + "\n")
+            except OSError as e:
+                logger.error(f"Span export to {self.path} failed: {e}")
+
+
+@lru_cache(maxsize=None)
+def get_span_exporter() -> Optional[JSONLSpanExporter]:
+    if settings.TRACE_EXPORT_PATH is None:
+        return None
+    return JSONLSpanExporter(settings.TRACE_EXPORT_PATH)
@@ -1,5 +1,9 @@
+from typing import List, Optional, Tuple
+
 from pydantic import BaseModel, Field, field_validator
 
+from rag_agent.core.config import settings
+
 class RAGQueryRequest(BaseModel):
     query: str = Field(..., min_length=1, description="User's question")
 
@@ -10,3 +14,53 @@ class RAGQueryRequest(BaseModel):
             raise ValueError("Query cannot be empty")
         return value
 
+
+class RAGBatchQuery(RAGQueryRequest):
+    id: Optional[str] = Field(None, description="Caller's id for this query; defaults to its index in the batch")
+
+
+class RAGBatchRequest(BaseModel):
+    queries: List[RAGBatchQuery] = Field(..., min_length=1, max_length=settings.BATCH_MAX_QUERIES)
+
+    @field_validator("queries")
+    @classmethod
+    def validate_unique_ids(cls, value: List[RAGBatchQuery]) -> List[RAGBatchQuery]:
+        ids = [item.id if item.id is not None else str(index) for index, item in enumerate(value)]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Query ids must be unique within a batch")
+        return value
+
+    def query_pairs(self) -> List[Tuple[str, str]]:
+        """(query_id, query) for every query in the batch."""
+        return [
+            (item.id if item.id is not None else str(index), item.query)
+            for index, item in enumerate(self.queries)
+        ]
+
+
+class RAGRetrieveRequest(RAGQueryRequest):
+    offset: int = Field(0, ge=0, lt=settings.RETRIEVE_MAX_RESULTS, description="Rank of the first chunk to return")
+    limit: int = Field(10, ge=1, le=settings.RETRIEVE_MAX_PAGE_SIZE, description="Number of chunks to return")
+
+
+class RetrievedChunk(BaseModel):
+    rank: int
+    source_type: str
+    source_uuid: str
+    chunk_uuid: str
+    link: str
+    content: str
+    combined_score: float
+    semantic_score: float
+    keyword_score: float
+    chunk_index: Optional[int] = None
+
+
+class RAGRetrieveResponse(BaseModel):
+    query: str
+    chunks: List[RetrievedChunk]
+    offset: int
+    limit: int
+    total: int
+    next_offset: Optional[int]
+    latency_ms: int
@@ -0,0 +1,150 @@
+import logging
+import os
+import signal
+import socket
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import uvicorn
+
+from rag_agent.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def default_workers() -> int:
+    """One worker per CPU this process may run on (respects container/cgroup CPU affinity)."""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+@dataclass
+class ServeOptions:
+    host: str = settings.SERVER_HOST
+    port: int = settings.SERVER_PORT
+    workers: Optional[int] = settings.SERVER_WORKERS
+    keep_alive_s: int = settings.SERVER_KEEP_ALIVE_S
+    backlog: int = settings.SERVER_BACKLOG
+    graceful_timeout_s: int = settings.SERVER_GRACEFUL_TIMEOUT_S
+    reuse_port: bool = settings.SERVER_REUSE_PORT
+
+
+def _bind(options: ServeOptions, reuse_port: bool) -> socket.socket:
+    family = socket.AF_INET6 if ":" in options.host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((options.host, options.port))
+    sock.listen(options.backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, options: ServeOptions, sock: socket.socket) -> None:
+    """
+    Serve on `sock` until SIGTERM/SIGINT. The app lifespan runs here, so every worker opens its own
+    connection pool and clients. On shutdown uvicorn stops accepting, closes idle keep-alive
+    connections and lets in-flight responses (NDJSON streams included) finish for up to
+    `graceful_timeout_s` before cancelling them.
+    """
+    config = uvicorn.Config(
+        app,
+        lifespan="on",
+        timeout_keep_alive=options.keep_alive_s,
+        backlog=options.backlog,
+        timeout_graceful_shutdown=options.graceful_timeout_s,
+        log_config=None,  # keep rag_agent.core.logging_config.configure_logging()
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(options: ServeOptions) -> None:
+    """
+    Pre-fork server: the app is imported once in the master (workers share its memory
+    copy-on-write), then one uvicorn worker is forked per CPU.
+
+    With SO_REUSEPORT each worker binds its own listening socket and the kernel spreads
+    connections across them; otherwise the workers share the master's socket. The master
+    restarts workers that die, and on SIGTERM/SIGINT forwards SIGTERM for a graceful drain,
+    killing any worker still running after the graceful timeout.
+    """
+    from rag_agent.app import app  # preload
+
+    workers = options.workers or default_workers()
+    reuse_port = options.reuse_port and hasattr(socket, "SO_REUSEPORT")
+
+    if not hasattr(os, "fork") or workers == 1:
+        logger.info(f"Serving on {options.host}:{options.port} with 1 worker")
+        _run_worker(app, options, _bind(options, reuse_port=False))
+        return
+
+    shared_socket = None if reuse_port else _bind(options, reuse_port=False)
+    children: Dict[int, int] = {}  # pid -> worker number
+    stopping = False
+
+    def _spawn(worker_number: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            try:
+                _run_worker(app, options, shared_socket or _bind(options, reuse_port=True))
+            except BaseException:
+                logger.exception(f"Worker {worker_number} crashed")
+                os._exit(1)
+            os._exit(0)
+        children[pid] = worker_number
+
+    def _stop(signum, frame) -> None:
+        nonlocal stopping
+        if stopping:
+            return
+        stopping = True
+        logger.info(f"Received {signal.Signals(signum).name}; draining {len(children)} workers")
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    logger.info(
+        f"Serving on {options.host}:{options.port} with {workers} workers "
+        f"({'SO_REUSEPORT' if reuse_port else 'shared socket'}, keep-alive {options.keep_alive_s}s, backlog {options.backlog})"
+    )
+    for worker_number in range(workers):
+        _spawn(worker_number)
+
+    drain_deadline = None
+    while children:
+        if stopping and drain_deadline is None:
+            # uvicorn's own graceful timeout plus time for the lifespan shutdown (closing pools)
+            drain_deadline = time.monotonic() + options.graceful_timeout_s + 10
+        if drain_deadline is not None and time.monotonic() > drain_deadline:
+            for pid in list(children):
+                logger.warning(f"Worker {children[pid]} (pid {pid}) did not drain in time; killing it")
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+            drain_deadline = float("inf")
+
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid == 0:
+            time.sleep(0.2)
+            continue
+        worker_number = children.pop(pid)
+        if not stopping:
+            logger.error(f"Worker {worker_number} (pid {pid}) exited with status {os.waitstatus_to_exitcode(status)}; restarting it")
+            time.sleep(1.0)  # don't spin if the worker fails on startup
+            _spawn(worker_number)
+
+    logger.info("All workers stopped")
@@ -0,0 +1,149 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rag_agent.core import metrics
+from rag_agent.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (corpus version, prompt template hash, model name, today's date)
+CacheScope = Tuple[str, str, str, str]
+
+
+def prompt_template_hash(template: str) -> str:
+    """Short stable hash of a prompt template; editing the template invalidates cached answers."""
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class CachedAnswer:
+    scope: CacheScope
+    normalized_query: str
+    query_vector: Optional[np.ndarray]  # unit-normalized float32, None if never embedded
+    response_chunks: List[str]
+    created_at: float
+
+
+class AnswerCache:
+    """
+    In-process answer cache with TTL + LRU eviction.
+
+    Answers are found either by exact normalized query, or by cosine similarity of the
+    query embedding to a cached query above `similarity_threshold`. Entries only match
+    within the same scope, so a corpus reload, a template edit or a new day misses.
+    The streamed response chunks are stored as-is so a hit replays the same token events.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_s: float = 3600.0,
+        similarity_threshold: float = 0.97,
+    ):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[Tuple[CacheScope, str], CachedAnswer]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.exact_hits = metrics.counter("answer_cache.hits.exact")
+        self.semantic_hits = metrics.counter("answer_cache.hits.semantic")
+        self.misses = metrics.counter("answer_cache.misses")
+        self.evictions = metrics.counter("answer_cache.evictions")
+        self.size = metrics.gauge("answer_cache.size")
+
+    @staticmethod
+    def _unit_vector(query_vector: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(query_vector, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def _is_expired(self, entry: CachedAnswer, now: float) -> bool:
+        return now - entry.created_at > self.ttl_s
+
+    def get_exact(self, scope: CacheScope, normalized_query: str) -> Optional[CachedAnswer]:
+        """Look up by normalized query. Does not count a miss (a semantic lookup may follow)."""
+        key = (scope, normalized_query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._is_expired(entry, time.time()):
+                del self._entries[key]
+                self.size.set(len(self._entries))
+                return None
+            self._entries.move_to_end(key)
+        self.exact_hits.inc()
+        return entry
+
+    def get_similar(self, scope: CacheScope, query_vector: Sequence[float]) -> Optional[CachedAnswer]:
+        """Look up the most similar cached query in `scope`; counts a miss if none is close enough."""
+        now = time.time()
+        with self._lock:
+            candidates = [
+                (key, entry) for key, entry in self._entries.items()
+                if key[0] == scope and entry.query_vector is not None and not self._is_expired(entry, now)
+            ]
+        if not candidates:
+            self.misses.inc()
+            return None
+
+        similarities = np.stack([entry.query_vector for _, entry in candidates]) @ self._unit_vector(query_vector)
+        best = int(np.argmax(similarities))
+        if float(similarities[best]) < self.similarity_threshold:
+            self.misses.inc()
+            return None
+
+        key, entry = candidates[best]
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        self.semantic_hits.inc()
+        logger.info(f"Answer cache semantic hit: '{entry.normalized_query}' (similarity={float(similarities[best]):.4f})")
+        return entry
+
+    def put(
+        self,
+        scope: CacheScope,
+        normalized_query: str,
+        query_vector: Optional[Sequence[float]],
+        response_chunks: List[str],
+    ) -> None:
+        entry = CachedAnswer(
+            scope=scope,
+            normalized_query=normalized_query,
+            query_vector=self._unit_vector(query_vector) if query_vector is not None else None,
+            response_chunks=list(response_chunks),
+            created_at=time.time(),
+        )
+        key = (scope, normalized_query)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions.inc()
+            self.size.set(len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size.set(0)
+
+
+@lru_cache(maxsize=None)
+def get_answer_cache() -> AnswerCache:
+    """Process-wide answer cache configured from settings."""
+    return AnswerCache(
+        max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+        ttl_s=settings.ANSWER_CACHE_TTL_S,
+        similarity_threshold=settings.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+    )
@@ -0,0 +1,209 @@
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from rag_agent.core import metrics
+from rag_agent.core.config import settings
+from rag_agent.services.retriever.base_retriever import ScoredChunk
+
+if TYPE_CHECKING:
+    import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Shortest prefix/suffix match treated as chunk overlap (shorter matches are likely coincidental)
+_MIN_OVERLAP_CHARS = 16
+# Upper bound on overlap length in characters per overlap token
+_MAX_CHARS_PER_TOKEN = 12
+# Token estimate when no tiktoken encoding can be loaded
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(model_name: str) -> Optional["tiktoken.Encoding"]:
+    """
+    tiktoken encoding for `model_name` (o200k_base for models tiktoken does not know).
+    None if the encoding cannot be loaded (tiktoken downloads encodings on first use).
+    """
+    import tiktoken
+
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"Could not load a tiktoken encoding for {model_name} ({e}); estimating token counts")
+        return None
+
+
+@dataclass
+class ContextAssembly:
+    """Context blocks for the prompt plus the token accounting behind them."""
+    blocks: List[str]
+    context_tokens: int
+    chunks_used: int
+    chunks_dropped: int
+    overlap_tokens_trimmed: int
+    dropped_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        """Tokens left out of the prompt compared to joining every retrieved chunk."""
+        return self.overlap_tokens_trimmed + self.dropped_tokens
+
+
+def _overlap(previous: str, following: str, max_chars: int) -> int:
+    """Length of the longest suffix of `previous` that is also a prefix of `following`."""
+    for length in range(min(len(previous), len(following), max_chars), _MIN_OVERLAP_CHARS - 1, -1):
+        if previous.endswith(following[:length]):
+            return length
+    return 0
+
+
+class ContextBudgeter:
+    """
+    Packs ranked chunks into prompt context under a token budget.
+
+    Chunks are admitted best-first while they fit. A chunk's cost is its token count minus
+    the text it shares with an admitted neighbour (same source, adjacent chunk_index), since
+    the ETL chunker repeats CHUNK_OVERLAP tokens between consecutive chunks. Admitted chunks
+    are then grouped by link like format_chunk_blocks(), ordered by chunk_index inside each
+    group (groups keep the rank order of their best chunk), and the repeated text is cut from
+    the start of the later chunk.
+    """
+
+    def __init__(self, budget_tokens: int, overlap_tokens: int, model_name: str):
+        self.budget_tokens = budget_tokens
+        self.max_overlap_chars = max(_MIN_OVERLAP_CHARS, overlap_tokens * _MAX_CHARS_PER_TOKEN)
+        self.model_name = model_name
+
+        self.context_tokens = metrics.histogram("context.tokens")
+        self.tokens_saved = metrics.counter("context.tokens_saved")
+        self.chunks_dropped = metrics.counter("context.chunks_dropped")
+
+    def count_tokens(self, text: str) -> int:
+        tokenizer = get_tokenizer(self.model_name)
+        if tokenizer is None:
+            return -(-len(text) // _CHARS_PER_TOKEN)
+        return len(tokenizer.encode(text, disallowed_special=()))
+
+    @staticmethod
+    def _neighbour_key(chunk: ScoredChunk, offset: int) -> Optional[Tuple[str, int]]:
+        if chunk.chunk_index is None:
+            return None
+        return (chunk.source_uuid, chunk.chunk_index + offset)
+
+    def _overlap_chars(self, previous: ScoredChunk, following: ScoredChunk) -> int:
+        return _overlap(previous.content, following.content, self.max_overlap_chars)
+
+    @staticmethod
+    def _reference(link: str) -> str:
+        return f"\n<reference><url>{link}</url></reference>" if link else ""
+
+    def assemble(self, chunks: List[ScoredChunk]) -> ContextAssembly:
+        by_position: Dict[Tuple[str, int], ScoredChunk] = {}
+        for chunk in chunks:
+            if chunk.chunk_index is not None:
+                by_position.setdefault((chunk.source_uuid, chunk.chunk_index), chunk)
+
+        admitted: List[ScoredChunk] = []
+        admitted_ids: Set[str] = set()
+        admitted_links: Set[str] = set()
+        overlap_tokens: Dict[Tuple[str, str], int] = {}  # (previous, following) chunk_uuid -> tokens
+        used_tokens = 0
+        dropped_tokens = 0
+        chunks_dropped = 0
+
+        for chunk in chunks:
+            if chunk.chunk_uuid in admitted_ids:
+                continue
+            cost = self.count_tokens(chunk.content)
+            if chunk.link not in admitted_links:
+                cost += self.count_tokens(f"<text></text>{self._reference(chunk.link)}")
+
+            pair_overlaps: Dict[Tuple[str, str], int] = {}
+            for previous, following in (
+                (by_position.get(self._neighbour_key(chunk, -1)), chunk),
+                (chunk, by_position.get(self._neighbour_key(chunk, 1))),
+            ):
+                if previous is None or following is None or previous.link != following.link:
+                    continue
+                if (previous if following is chunk else following).chunk_uuid not in admitted_ids:
+                    continue
+                overlap_chars = self._overlap_chars(previous, following)
+                if overlap_chars:
+                    pair_overlaps[(previous.chunk_uuid, following.chunk_uuid)] = self.count_tokens(
+                        following.content[:overlap_chars]
+                    )
+            cost -= sum(pair_overlaps.values())
+
+            if used_tokens + cost > self.budget_tokens:
+                chunks_dropped += 1
+                dropped_tokens += self.count_tokens(chunk.content)
+                continue
+            admitted.append(chunk)
+            admitted_ids.add(chunk.chunk_uuid)
+            admitted_links.add(chunk.link)
+            overlap_tokens.update(pair_overlaps)
+            used_tokens += cost
+
+        blocks = self._format(admitted)
+        assembly = ContextAssembly(
+            blocks=blocks,
+            context_tokens=used_tokens,
+            chunks_used=len(admitted),
+            chunks_dropped=chunks_dropped,
+            overlap_tokens_trimmed=sum(overlap_tokens.values()),
+            dropped_tokens=dropped_tokens,
+        )
+        self.context_tokens.observe(assembly.context_tokens)
+        self.tokens_saved.inc(assembly.tokens_saved)
+        self.chunks_dropped.inc(chunks_dropped)
+        return assembly
+
+    def _format(self, admitted: List[ScoredChunk]) -> List[str]:
+        chunks_by_link: Dict[str, List[ScoredChunk]] = {}
+        for chunk in admitted:
+            chunks_by_link.setdefault(chunk.link, []).append(chunk)
+
+        blocks = []
+        for link, link_chunks in chunks_by_link.items():
+            # Document order within a source; chunks without an index keep their rank order at the end
+            ordered = sorted(
+                link_chunks,
+                key=lambda c: (0, c.source_uuid, c.chunk_index) if c.chunk_index is not None else (1, "", 0),
+            )
+            texts: List[str] = []
+            previous: Optional[ScoredChunk] = None
+            for chunk in ordered:
+                content = chunk.content
+                if (
+                    previous is not None
+                    and chunk.chunk_index is not None
+                    and previous.chunk_index is not None
+                    and previous.source_uuid == chunk.source_uuid
+                    and chunk.chunk_index == previous.chunk_index + 1
+                ):
+                    overlap_chars = self._overlap_chars(previous, chunk)
+                    if overlap_chars:
+                        # Continues the previous chunk: join without the paragraph break
+                        texts[-1] += content[overlap_chars:]
+                        previous = chunk
+                        continue
+                texts.append(content)
+                previous = chunk
+            text = "\n\n".join(texts)
+            blocks.append(f"<text>{text}</text>{self._reference(link)}")
+        return blocks
+
+
+@lru_cache(maxsize=None)
+def get_context_budgeter() -> ContextBudgeter:
+    """Process-wide budgeter configured from settings."""
+    return ContextBudgeter(
+        budget_tokens=settings.CONTEXT_MAX_TOKENS,
+        overlap_tokens=settings.CONTEXT_CHUNK_OVERLAP_TOKENS,
+        model_name=settings.QUERY_MODEL,
+    )
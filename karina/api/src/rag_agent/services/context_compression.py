@@ -0,0 +1,199 @@
+import logging
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from rag_agent.core import metrics
+from rag_agent.core.admission import stage
+from rag_agent.core.config import settings
+from rag_agent.core.model_client import get_model_client, ModelConfig, ModelType
+from rag_agent.services.local_query_expander import STOPWORDS
+
+logger = logging.getLogger(__name__)
+
+_BLOCK_RE = re.compile(r"<text>(.*?)</text>", re.DOTALL)
+# Sentence ends: terminal punctuation followed by whitespace, or a blank line / list break
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[\"'“(\[A-Z0-9])|\n\s*\n|\n(?=\s*[-•*\d])")
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_ELISION = "…"
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in _SENTENCE_RE.split(text) if sentence and sentence.strip()]
+
+
+def _terms(text: str) -> Set[str]:
+    return {word for word in _WORD_RE.findall(text.lower()) if word not in STOPWORDS and len(word) > 1}
+
+
+def query_terms(query: str, enhanced_query: Optional[str] = None) -> Set[str]:
+    """Content words of the query plus every term of its expansion ("a OR b OR c d")."""
+    terms = _terms(query)
+    if enhanced_query:
+        for term in enhanced_query.split(" OR "):
+            terms |= _terms(term.strip('"'))
+    return terms
+
+
+@dataclass
+class CompressedContext:
+    blocks: List[str]
+    original_chars: int
+    compressed_chars: int
+    sentences_kept: int
+    sentences_total: int
+
+    @property
+    def ratio(self) -> float:
+        """Compressed size over original size (characters of sentence text)."""
+        return self.compressed_chars / self.original_chars if self.original_chars else 1.0
+
+
+class ContextCompressor:
+    """
+    Extractive compression of context blocks (<text>...</text> plus optional <reference> tags).
+
+    Each sentence is scored against the query by lexical overlap with the query and expansion
+    terms and, when `semantic_weight` > 0, by cosine similarity of its embedding to the query
+    vector. Sentences are taken best-first, each with `neighbors` sentences on either side for
+    continuity, until `keep_ratio` of the text is kept; every block keeps at least its best
+    sentence so its reference stays citable. Kept sentences stay in document order, gaps are
+    marked with an ellipsis, and everything outside the <text> tags is left untouched.
+    """
+
+    def __init__(self, keep_ratio: float, neighbors: int, semantic_weight: float, embedding_model: str):
+        self.keep_ratio = keep_ratio
+        self.neighbors = neighbors
+        self.semantic_weight = semantic_weight
+        self.embedding_model = embedding_model
+
+        self.compression_ratio = metrics.histogram("context_compression.ratio")
+        self.semantic_failures = metrics.counter("context_compression.semantic_failures")
+
+    async def _semantic_scores(self, sentences: List[str], query_vector: Optional[Sequence[float]]) -> Optional[np.ndarray]:
+        if self.semantic_weight <= 0 or query_vector is None or not sentences:
+            return None
+        try:
+            # Uncached: sentences would flood the query-embedding cache and evict query vectors. The bulk call
+            # runs under the document-embedding resilience policy, not the interactive query one
+            embedding_client = get_model_client(
+                ModelConfig(model_type=ModelType.EMBEDDING, model_name=self.embedding_model, cached=False)
+            )
+            async with stage("embedding"):
+                sentence_vectors = np.asarray(await embedding_client.aembed_documents(sentences), dtype=np.float32)
+        except Exception as e:
+            self.semantic_failures.inc()
+            logger.warning(f"Sentence embedding failed; compressing with lexical scores only: {e}")
+            return None
+        query = np.asarray(query_vector, dtype=np.float32)
+        norms = np.linalg.norm(sentence_vectors, axis=1) * (np.linalg.norm(query) or 1.0)
+        return (sentence_vectors @ query) / np.where(norms == 0, 1.0, norms)
+
+    @staticmethod
+    def _lexical_scores(sentences: List[str], terms: Set[str]) -> np.ndarray:
+        if not terms:
+            return np.zeros(len(sentences), dtype=np.float32)
+        return np.asarray(
+            [len(_terms(sentence) & terms) / math.sqrt(len(terms)) for sentence in sentences],
+            dtype=np.float32,
+        )
+
+    async def compress(
+        self,
+        blocks: List[str],
+        terms: Set[str],
+        query_vector: Optional[Sequence[float]] = None,
+    ) -> CompressedContext:
+        # Sentences of every <text> element per block; text outside the elements is kept verbatim
+        block_sentences: List[List[List[str]]] = []
+        sentences: List[str] = []
+        owners: List[Tuple[int, int, int]] = []  # (block, text element, position) per sentence
+        for block_index, block in enumerate(blocks):
+            elements = [split_sentences(text) for text in _BLOCK_RE.findall(block)]
+            block_sentences.append(elements)
+            for element_index, element in enumerate(elements):
+                for position, sentence in enumerate(element):
+                    sentences.append(sentence)
+                    owners.append((block_index, element_index, position))
+
+        original_chars = sum(len(sentence) for sentence in sentences)
+        if not sentences:
+            return CompressedContext(list(blocks), 0, 0, 0, 0)
+
+        scores = self._lexical_scores(sentences, terms)
+        if scores.max() > 0:
+            scores = scores / scores.max()
+        semantic = await self._semantic_scores(sentences, query_vector)
+        if semantic is not None:
+            scores = (1 - self.semantic_weight) * scores + self.semantic_weight * semantic
+
+        kept: Set[Tuple[int, int, int]] = set()
+        kept_chars = 0
+
+        def _keep(owner: Tuple[int, int, int]) -> int:
+            block_index, element_index, position = owner
+            element = block_sentences[block_index][element_index]
+            added = 0
+            for neighbor in range(max(0, position - self.neighbors), min(len(element), position + self.neighbors + 1)):
+                key = (block_index, element_index, neighbor)
+                if key not in kept:
+                    kept.add(key)
+                    added += len(element[neighbor])
+            return added
+
+        order = np.argsort(-scores, kind="stable")
+        # Best sentence of every block first, so no reference loses all of its text
+        best_per_block: Dict[int, int] = {}
+        for sentence_index in order:
+            best_per_block.setdefault(owners[sentence_index][0], int(sentence_index))
+        for sentence_index in best_per_block.values():
+            kept_chars += _keep(owners[sentence_index])
+        for sentence_index in order:
+            if kept_chars >= self.keep_ratio * original_chars:
+                break
+            kept_chars += _keep(owners[sentence_index])
+
+        compressed_blocks = []
+        for block_index, block in enumerate(blocks):
+            elements = iter(range(len(block_sentences[block_index])))
+
+            def _compress_element(match: "re.Match[str]") -> str:
+                element_index = next(elements)
+                element = block_sentences[block_index][element_index]
+                parts: List[str] = []
+                previous = -1
+                for position, sentence in enumerate(element):
+                    if (block_index, element_index, position) not in kept:
+                        continue
+                    if parts and position != previous + 1:
+                        parts.append(_ELISION)
+                    parts.append(sentence)
+                    previous = position
+                return f"<text>{' '.join(parts)}</text>"
+
+            compressed_blocks.append(_BLOCK_RE.sub(_compress_element, block))
+
+        compressed = CompressedContext(
+            blocks=compressed_blocks,
+            original_chars=original_chars,
+            compressed_chars=kept_chars,
+            sentences_kept=len(kept),
+            sentences_total=len(sentences),
+        )
+        self.compression_ratio.observe(compressed.ratio)
+        return compressed
+
+
+@lru_cache(maxsize=None)
+def get_context_compressor() -> ContextCompressor:
+    """Process-wide compressor configured from settings."""
+    return ContextCompressor(
+        keep_ratio=settings.CONTEXT_COMPRESSION_KEEP_RATIO,
+        neighbors=settings.CONTEXT_COMPRESSION_NEIGHBORS,
+        semantic_weight=settings.CONTEXT_COMPRESSION_SEMANTIC_WEIGHT,
+        embedding_model=settings.EMBEDDING_MODEL,
+    )
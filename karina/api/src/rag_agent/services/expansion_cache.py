@@ -0,0 +1,88 @@
+import asyncio
+import hashlib
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional, Tuple
+
+from rag_agent.core.cache import SingleFlight, SQLiteKVStore, TTLCache
+from rag_agent.core.config import settings
+from rag_agent.core.normalization import normalize_query
+
+
+class ExpansionCache:
+    """
+    Cache of LLM query rewrites (query expansion, NER keywords).
+
+    Keys combine the normalized query with a hash of the prompt template and model name,
+    so editing a template or switching models never serves a stale rewrite. Lookups go
+    memory (TTL/LRU) → optional persistent store; concurrent identical misses share one call.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_s: float = 86400.0,
+        store: Optional[SQLiteKVStore] = None,
+    ):
+        self.ttl_s = ttl_s
+        self.memory: TTLCache[str] = TTLCache("expansion_cache", max_entries=max_entries, ttl_s=ttl_s)
+        self.store = store
+        self.single_flight = SingleFlight("expansion_cache")
+
+    @staticmethod
+    def make_key(query: str, prompt_template: str, model_name: str) -> str:
+        version = hashlib.sha256(f"{model_name}\x00{prompt_template}".encode("utf-8")).hexdigest()[:16]
+        return f"{version}:{normalize_query(query)}"
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is None and self.store is not None:
+            value = self.store.get(key, max_age_s=self.ttl_s)
+            if value is not None:
+                self.memory.put(key, value)
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        self.memory.put(key, value)
+        if self.store is not None:
+            self.store.put(key, value)
+
+    async def aget_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Tuple[str, bool]]],
+    ) -> str:
+        """
+        Return the cached value for `key`, or run `compute` once for all concurrent callers.
+        `compute` returns (value, cacheable); fallbacks after errors should not be cached.
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        async def _load() -> str:
+            if self.store is not None:
+                stored = await asyncio.to_thread(self.store.get, key, self.ttl_s)
+                if stored is not None:
+                    self.memory.put(key, stored)
+                    return stored
+            computed, cacheable = await compute()
+            if cacheable:
+                self.memory.put(key, computed)
+                if self.store is not None:
+                    await asyncio.to_thread(self.store.put, key, computed)
+            return computed
+
+        return await self.single_flight.do(key, _load)
+
+
+@lru_cache(maxsize=None)
+def get_expansion_cache() -> ExpansionCache:
+    """Process-wide expansion cache configured from settings."""
+    store = None
+    if settings.EXPANSION_CACHE_STORE_PATH is not None:
+        store = SQLiteKVStore(settings.EXPANSION_CACHE_STORE_PATH, namespace="query_expansions")
+    return ExpansionCache(
+        max_entries=settings.EXPANSION_CACHE_MAX_ENTRIES,
+        ttl_s=settings.EXPANSION_CACHE_TTL_S,
+        store=store,
+    )
@@ -0,0 +1,250 @@
+import asyncio
+import json
+import logging
+import random
+import re
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rag_agent.core import metrics
+from rag_agent.core.admission import stage
+from rag_agent.core.config import settings
+from rag_agent.core.model_client import get_model_client, ModelConfig, ModelType
+
+logger = logging.getLogger(__name__)
+# Routing decisions sampled for precision review (one JSON object per record)
+sample_logger = logging.getLogger(f"{__name__}.samples")
+
+# Unrouted decisions this close below the threshold are sampled as near misses
+_NEAR_MISS_BAND = 0.1
+
+
+class Intent(str, Enum):
+    CONTACT = "contact"
+    OUT_OF_SCOPE = "out_of_scope"
+    IDENTITY = "identity"
+    GREETING = "greeting"
+    ANSWERABLE = "answerable"  # anything that needs retrieval; only used as negative exemplars
+
+
+# The fixed answers DEFAULT_PREFIX asks the LLM to return (rules 1-3), plus a greeting
+CANNED_ANSWERS: Dict[Intent, str] = {
+    Intent.CONTACT: "You can contact the CSHA team here: https://www.schoolhealthcenters.org/about/contact-us/",
+    Intent.OUT_OF_SCOPE: "Sorry, this topic is beyond my current scope. I cannot help with that.",
+    Intent.IDENTITY: (
+        "I’m an AI agent representing CSHA, designed to answer questions about CSHA and "
+        "school-based health centers using information they’ve provided."
+    ),
+    Intent.GREETING: (
+        "Hello! I’m an AI agent representing CSHA. Ask me anything about CSHA or "
+        "school-based health centers."
+    ),
+}
+
+INTENT_EXEMPLARS: Dict[Intent, List[str]] = {
+    Intent.CONTACT: [
+        "How do I contact you?",
+        "How can I get in touch with CSHA?",
+        "What is CSHA's email address or phone number?",
+        "I'm a reporter working on a story, who should I contact at CSHA?",
+        "If someone wants to reach out, can we give them the contact form link?",
+        "Can you serve up the Contact Us link?",
+        "Who should a journalist talk to at the California School-Based Health Alliance?",
+    ],
+    Intent.OUT_OF_SCOPE: [
+        "What's the weather going to be tomorrow?",
+        "Write me a poem about the ocean.",
+        "Who won the basketball game last night?",
+        "What stocks should I buy?",
+        "Give me a recipe for chocolate chip cookies.",
+        "Help me debug my Python code.",
+        "What is the capital of France?",
+    ],
+    Intent.IDENTITY: [
+        "Who are you?",
+        "What are you?",
+        "Are you a bot or a human?",
+        "What can this AI agent do?",
+        "Are you ChatGPT?",
+    ],
+    Intent.GREETING: [
+        "Hi",
+        "Hello there",
+        "Hey!",
+        "Good morning",
+        "Thanks, bye!",
+    ],
+    Intent.ANSWERABLE: [
+        "What services do school-based health centers provide?",
+        "How do I start a school-based health center?",
+        "How does HIPAA apply to school-based health centers?",
+        "What funding is available for SBHCs in California?",
+        "Can SBHCs share student health records with the school?",
+        "How can a school-based health center contact parents about consent?",
+        "What is CSHA's position on school mental health services?",
+        "When is the CSHA annual conference?",
+        "Who is on CSHA's youth board?",
+        "How many school-based health centers are there in California?",
+    ],
+}
+
+# Rules that are confident on their own (matched against the lowercased, stripped query)
+_LEXICAL_RULES: List[Tuple[Intent, "re.Pattern[str]"]] = [
+    (Intent.GREETING, re.compile(
+        r"^(hi|hello|hey|hiya|howdy|good (morning|afternoon|evening)|thanks?( you)?|thank you( so much)?|bye|goodbye)"
+        r"( there| csha)?[\s!.,]*$"
+    )),
+    (Intent.IDENTITY, re.compile(
+        r"^(who|what) are you\??$|^are you (an? )?(ai|bot|robot|chatbot|human|real person|person)\??$"
+    )),
+    # Whole-query contact requests only; questions that merely mention contacting CSHA go to the classifier
+    (Intent.CONTACT, re.compile(
+        r"^(please )?(how (do|can) (i|we) |can (i|we) |i('d like| want) to )?"
+        r"(contact|email|e-mail|call|phone|reach( out to)?|get in touch with) "
+        r"(you|csha|the csha team|your team|someone at csha)[\s?!.]*$"
+        r"|^(where (is|can i find) )?(the |your )?contact( us)? (form|page|link)[\s?!.]*$"
+    )),
+]
+
+
+@dataclass
+class IntentDecision:
+    intent: Intent
+    source: str  # "rule" or "embedding"
+    score: float  # best exemplar similarity (1.0 for rules)
+    margin: float  # best similarity minus the best ANSWERABLE similarity
+    exemplar: Optional[str] = None
+
+    @property
+    def answer(self) -> str:
+        return CANNED_ANSWERS[self.intent]
+
+
+class IntentRouter:
+    """
+    Pre-retrieval router for the questions DEFAULT_PREFIX answers with a fixed string.
+
+    A query is routed when a lexical rule matches, or when its nearest exemplar (cosine
+    similarity of embeddings) belongs to a canned intent, is at least `threshold` similar and
+    beats the nearest ANSWERABLE exemplar by `margin`. Everything else goes through retrieval.
+    Exemplar embeddings are computed once per process (and kept in the embedding cache).
+    A `sample_rate` share of decisions, routed or near misses, is logged for precision review.
+    """
+
+    def __init__(
+        self,
+        exemplars: Dict[Intent, List[str]],
+        threshold: float,
+        margin: float,
+        sample_rate: float,
+        embedding_model: str,
+    ):
+        self.exemplars = exemplars
+        self.threshold = threshold
+        self.margin = margin
+        self.sample_rate = sample_rate
+        self.embedding_model = embedding_model
+        self._labels: List[Intent] = [intent for intent, texts in exemplars.items() for _ in texts]
+        self._texts: List[str] = [text for texts in exemplars.values() for text in texts]
+        self._matrix: Optional[np.ndarray] = None
+        self._lock = asyncio.Lock()
+
+        self.routed = {intent: metrics.counter(f"intent_router.routed.{intent.value}") for intent in CANNED_ANSWERS}
+        self.passed = metrics.counter("intent_router.passed")
+
+    async def aload(self) -> None:
+        """Embed the exemplars (once)."""
+        if self._matrix is not None:
+            return
+        async with self._lock:
+            if self._matrix is not None:
+                return
+            embedding_client = get_model_client(
+                ModelConfig(model_type=ModelType.EMBEDDING, model_name=self.embedding_model)
+            )
+            async with stage("embedding"):
+                vectors = np.asarray(await embedding_client.aembed_documents(self._texts), dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            self._matrix = vectors / np.where(norms == 0, 1.0, norms)
+
+    @staticmethod
+    def match_rules(query: str) -> Optional[Intent]:
+        text = " ".join(query.lower().split())
+        for intent, pattern in _LEXICAL_RULES:
+            if pattern.search(text):
+                return intent
+        return None
+
+    def _nearest(self, query_vector: Sequence[float]) -> IntentDecision:
+        query = np.asarray(query_vector, dtype=np.float32)
+        similarities = self._matrix @ (query / (np.linalg.norm(query) or 1.0))
+        best = int(np.argmax(similarities))
+        answerable = [i for i, label in enumerate(self._labels) if label is Intent.ANSWERABLE]
+        best_answerable = float(similarities[answerable].max()) if answerable else -1.0
+        return IntentDecision(
+            intent=self._labels[best],
+            source="embedding",
+            score=float(similarities[best]),
+            margin=float(similarities[best]) - best_answerable,
+            exemplar=self._texts[best],
+        )
+
+    async def aroute(self, query: str, query_vector: Optional[Sequence[float]]) -> Optional[IntentDecision]:
+        """The canned-answer decision for `query`, or None to answer it with retrieval."""
+        rule_intent = self.match_rules(query)
+        if rule_intent is not None:
+            decision = IntentDecision(rule_intent, source="rule", score=1.0, margin=1.0)
+        elif query_vector is None:
+            decision = None
+        else:
+            await self.aload()
+            decision = self._nearest(query_vector)
+
+        routed = (
+            decision is not None
+            and decision.intent is not Intent.ANSWERABLE
+            and decision.score >= self.threshold
+            and decision.margin >= self.margin
+        )
+        if routed or (
+            decision is not None
+            and decision.intent is not Intent.ANSWERABLE
+            and decision.score >= self.threshold - _NEAR_MISS_BAND
+        ):
+            # Near misses are sampled too, so reviewers can estimate what the thresholds cost
+            self._sample(query, decision, routed)
+        if not routed:
+            self.passed.inc()
+            return None
+        self.routed[decision.intent].inc()
+        logger.info(f"Intent router: {decision.intent.value} ({decision.source}, score {decision.score:.3f}) for: {query}")
+        return decision
+
+    def _sample(self, query: str, decision: IntentDecision, routed: bool) -> None:
+        if random.random() >= self.sample_rate:
+            return
+        sample_logger.info(json.dumps({
+            "query": query,
+            "intent": decision.intent.value,
+            "routed": routed,
+            "source": decision.source,
+            "score": round(decision.score, 4),
+            "margin": round(decision.margin, 4),
+            "exemplar": decision.exemplar,
+        }, ensure_ascii=False))
+
+
+@lru_cache(maxsize=None)
+def get_intent_router() -> IntentRouter:
+    """Process-wide router configured from settings."""
+    return IntentRouter(
+        INTENT_EXEMPLARS,
+        threshold=settings.INTENT_ROUTER_SIMILARITY_THRESHOLD,
+        margin=settings.INTENT_ROUTER_MARGIN,
+        sample_rate=settings.INTENT_ROUTER_SAMPLE_RATE,
+        embedding_model=settings.EMBEDDING_MODEL,
+    )
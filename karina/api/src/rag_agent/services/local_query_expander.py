@@ -0,0 +1,160 @@
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from rag_agent.core.prompt_templates.query_expander_template import ACRONYM_GLOSSARY
+
+logger = logging.getLogger(__name__)
+
+# English stop words (question words included) plus words that carry no retrieval signal for this corpus.
+STOPWORDS = frozenset("""
+a about above across after afterwards again against all almost alone along already also although always am
+among amongst an and another any anyhow anyone anything anyway anywhere are around as at be became because
+become becomes becoming been before beforehand behind being below beside besides between beyond both but by
+can cannot could did do does doing done down during each eg either else elsewhere enough etc even ever every
+everyone everything everywhere except few for former formerly from further get gets give given go had has
+have having he hence her here hereafter hereby herein hereupon hers herself him himself his how however i ie
+if in indeed into is it its itself just keep last latter latterly least less let like made many may me
+meanwhile might mine more moreover most mostly much must my myself namely neither never nevertheless next no
+nobody none noone nor not nothing now nowhere of off often on once one only onto or other others otherwise
+our ours ourselves out over own per perhaps please put rather re really same say see seem seemed seeming
+seems several she should show since so some somehow someone something sometime sometimes somewhere still such
+tell than that the their theirs them themselves then thence there thereafter thereby therefore therein
+thereupon these they this those though through throughout thru thus to together too toward towards under
+until up upon us very via want was we well were what whatever when whence whenever where whereafter whereas
+whereby wherein whereupon wherever whether which while whither who whoever whole whom whose why will with
+within without would yet you your yours yourself yourselves
+""".split())
+
+# Removed from the query before tokenizing (see rule 4 of QUERY_EXPAND_TEMPLATE)
+STOP_PHRASES = ("california school-based health alliance", "california school based health alliance", "csha")
+
+_TOKEN = re.compile(r"[A-Za-z0-9]+(?:[-'.][A-Za-z0-9]+)*\.?")
+_ACRONYM = re.compile(r"^(?=.*[A-Z].*[A-Z])[A-Z0-9]{2,}$")
+
+
+@dataclass
+class LocalExpansion:
+    """Result of a local expansion attempt. `expanded_query` is None when the LLM is needed."""
+    expanded_query: Optional[str]
+    unknown_terms: List[str] = field(default_factory=list)
+
+
+class LocalQueryExpander:
+    """
+    Rule-based version of QUERY_EXPAND_TEMPLATE:
+      - acronyms are looked up in the glossary,
+      - stop words (and CSHA) are dropped,
+      - runs of capitalized words are treated as entities and expanded into the phrase and its words,
+      - the remaining terms are joined with OR.
+
+    Unknown acronyms and dotted abbreviations (e.g. "ED", "U.S.") are reported as unknown so the
+    caller can fall back to the LLM, which knows how to expand them.
+    """
+
+    def __init__(
+        self,
+        glossary: Dict[str, str] = ACRONYM_GLOSSARY,
+        stopwords: frozenset = STOPWORDS,
+        stop_phrases: tuple = STOP_PHRASES,
+    ):
+        self.glossary = {acronym.upper(): expansion for acronym, expansion in glossary.items()}
+        self.stopwords = stopwords
+        self._stop_phrases = re.compile(
+            r"\b(?:" + "|".join(re.escape(phrase) for phrase in stop_phrases) + r")(?:'s)?\b",
+            re.IGNORECASE,
+        )
+
+    def tokenize(self, query: str) -> List[str]:
+        text = self._stop_phrases.sub(" ", query)
+        tokens = []
+        for token in _TOKEN.findall(text):
+            if token.lower().endswith("'s"):
+                token = token[:-2]
+            # A trailing period is sentence punctuation unless the token is an abbreviation like "U.S."
+            if token.endswith(".") and "." not in token[:-1]:
+                token = token[:-1]
+            if token:
+                tokens.append(token)
+        return tokens
+
+    def _acronym(self, token: str) -> Optional[str]:
+        """Return the acronym form of `token` (plural 's' stripped) or None if it is not an acronym."""
+        # Glossary acronyms match in any case ("sbhc", "Lcffs"); unknown ones need two capitals
+        upper = token.upper()
+        if upper in self.glossary:
+            return upper
+        if upper.endswith("S") and upper[:-1] in self.glossary:
+            return upper[:-1]
+        if _ACRONYM.match(token):
+            return token
+        if token.endswith("s") and _ACRONYM.match(token[:-1]):
+            return token[:-1]
+        return None
+
+    @staticmethod
+    def entity_variants(words: List[str]) -> List[str]:
+        """Every form of a multi-word entity: the full phrase, then each word."""
+        if len(words) == 1:
+            return list(words)
+        return [" ".join(words)] + list(words)
+
+    @staticmethod
+    def join_terms(terms: List[str]) -> str:
+        seen = set()
+        unique_terms = []
+        for term in terms:
+            if term.lower() not in seen:
+                seen.add(term.lower())
+                unique_terms.append(term)
+        return " OR ".join(unique_terms)
+
+    def expand(self, query: str) -> LocalExpansion:
+        tokens = self.tokenize(query)
+        terms: List[str] = []
+        unknown_terms: List[str] = []
+        entity: List[str] = []
+
+        def _flush_entity() -> None:
+            if entity:
+                terms.extend(self.entity_variants(entity))
+                entity.clear()
+
+        for position, token in enumerate(tokens):
+            acronym = self._acronym(token)
+            if acronym is not None:
+                _flush_entity()
+                expansion = self.glossary.get(acronym)
+                if expansion is None:
+                    unknown_terms.append(token)
+                    continue
+                terms.extend(expansion.split())
+                terms.append(acronym)
+                continue
+
+            if "." in token:
+                _flush_entity()
+                unknown_terms.append(token)
+                continue
+
+            if token.lower() in self.stopwords:
+                _flush_entity()
+                continue
+
+            # Capitalized words form entity phrases; the sentence-initial word only if the next one is capitalized too
+            if token[0].isupper() and (position > 0 or tokens[1:2] and tokens[1][0].isupper()):
+                entity.append(token)
+                continue
+
+            _flush_entity()
+            terms.append(token)
+
+        _flush_entity()
+
+        if unknown_terms:
+            return LocalExpansion(expanded_query=None, unknown_terms=unknown_terms)
+        if not terms:
+            # Nothing but stop words left: search on the raw query, as the LLM path does on failure
+            return LocalExpansion(expanded_query=query)
+        return LocalExpansion(expanded_query=self.join_terms(terms))
@@ -1,8 +1,9 @@
 import logging
-from typing import List
+from typing import List, Optional, Tuple
 from rag_agent.core.model_client import get_model_client, ModelConfig, ModelType
 from rag_agent.core.prompt_templates.ner_keyword_extractor_template import NER_KEYWORD_EXTRACT_TEMPLATE
 from rag_agent.core.config import settings
+from rag_agent.services.expansion_cache import ExpansionCache, get_expansion_cache
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +19,19 @@ class NERKeywordExtractor:
             temperature=0.0
         )
         self.model_client = get_model_client(self.model_config)
-    
+        self.cache: Optional[ExpansionCache] = get_expansion_cache() if settings.EXPANSION_CACHE_ENABLED else None
+
+    def _parse_response(self, query: str, response) -> str:
+        # Extract the content from the response
+        if hasattr(response, 'content'):
+            enhanced_query = response.content.strip()
+        else:
+            enhanced_query = str(response).strip()
+
+        logger.info(f"NER Keyword Extraction: '{query}' → '{enhanced_query}'")
+
+        return enhanced_query
+
     def extract_keywords(self, query: str) -> str:
         """
         Extract keywords and entities from a user query using NER and keyword expansion.
@@ -29,21 +42,51 @@ class NERKeywordExtractor:
         Returns:
             Query string with extracted keywords and entities
         """
+        cache_key = ExpansionCache.make_key(query, NER_KEYWORD_EXTRACT_TEMPLATE, self.model_name)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
-            prompt = QUERY_EXPAND_TEMPLATE.format(query=query)
+            prompt = NER_KEYWORD_EXTRACT_TEMPLATE.format(query=query)
             response = self.model_client.invoke(prompt)
-            
-            # Extract the content from the response
-            if hasattr(response, 'content'):
-                enhanced_query = response.content.strip()
-            else:
-                enhanced_query = str(response).strip()
-            
-            logger.info(f"NER Keyword Extraction: '{query}' → '{enhanced_query}'")
-            
+            enhanced_query = self._parse_response(query, response)
+            if self.cache is not None:
+                self.cache.put(cache_key, enhanced_query)
             return enhanced_query
             
         except Exception as e:
             logger.error(f"Error extracting keywords: {e}")
             # Return original query if extraction fails
             return query
+
+    async def aextract_keywords(self, query: str) -> str:
+        """
+        Async version of extract_keywords; does not block the event loop.
+
+        Args:
+            query: The user's query string to extract keywords and entities from
+
+        Returns:
+            Query string with extracted keywords and entities
+        """
+        if self.cache is None:
+            enhanced_query, _cacheable = await self._aextract_with_llm(query)
+            return enhanced_query
+        return await self.cache.aget_or_compute(
+            ExpansionCache.make_key(query, NER_KEYWORD_EXTRACT_TEMPLATE, self.model_name),
+            lambda: self._aextract_with_llm(query),
+        )
+
+    async def _aextract_with_llm(self, query: str) -> Tuple[str, bool]:
+        """Returns (keywords, cacheable); the raw-query fallback after an error is not cacheable."""
+        try:
+            prompt = NER_KEYWORD_EXTRACT_TEMPLATE.format(query=query)
+            response = await self.model_client.ainvoke(prompt)
+            return self._parse_response(query, response), True
+
+        except Exception as e:
+            logger.error(f"Error extracting keywords: {e}")
+            # Return original query if extraction fails
+            return query, False
@@ -1,16 +1,26 @@
 import logging
-from typing import List
+from typing import List, Optional, Tuple
+from rag_agent.core import metrics
 from rag_agent.core.model_client import get_model_client, ModelConfig, ModelType
 from rag_agent.core.prompt_templates.query_expander_template import QUERY_EXPAND_TEMPLATE
 from rag_agent.core.config import settings
+from rag_agent.core.resilience import UpstreamUnavailable, get_resilience_policy
+from rag_agent.services.expansion_cache import ExpansionCache, get_expansion_cache
+from rag_agent.services.local_query_expander import LocalQueryExpander
 
 logger = logging.getLogger(__name__)
 
 
 class QueryExpander:
-    """Extract keywords and entities from user queries to enhance retrieval."""
+    """
+    Extract keywords and entities from user queries to enhance retrieval.
+
+    The local rule-based expander handles most queries; the LLM is only called when
+    the query contains acronyms or abbreviations the glossary does not know. LLM expansions
+    are cached per (normalized query, template, model) and concurrent identical ones share a call.
+    """
     
-    def __init__(self, model_name: str = settings.QUERY_MODEL):
+    def __init__(self, model_name: str = settings.QUERY_MODEL, use_local: bool = settings.QUERY_EXPANDER_LOCAL_ENABLED):
         self.model_name = model_name
         self.model_config = ModelConfig(
             model_type=ModelType.QUERY,
@@ -18,7 +28,35 @@ class QueryExpander:
             temperature=0.0
         )
         self.model_client = get_model_client(self.model_config)
-    
+        self.local_expander = LocalQueryExpander() if use_local else None
+        # Expansions actually computed: cache hits and shared in-flight calls are not counted
+        self.local_expansions = metrics.counter("query_expander.local")
+        self.llm_expansions = metrics.counter("query_expander.llm_fallback")
+        self.cache: Optional[ExpansionCache] = get_expansion_cache() if settings.EXPANSION_CACHE_ENABLED else None
+
+    def _expand_locally(self, query: str) -> Optional[str]:
+        """Return the local expansion, or None if the LLM is needed."""
+        if self.local_expander is None:
+            return None
+        expansion = self.local_expander.expand(query)
+        if expansion.expanded_query is None:
+            logger.info(f"Query Expansion: LLM fallback for unknown terms {expansion.unknown_terms}")
+            return None
+        self.local_expansions.inc()
+        logger.info(f"Query Expansion (local): '{query}' → '{expansion.expanded_query}'")
+        return expansion.expanded_query
+
+    def _parse_response(self, query: str, response) -> str:
+        # Extract the content from the response
+        if hasattr(response, 'content'):
+            enhanced_query = response.content.strip()
+        else:
+            enhanced_query = str(response).strip()
+
+        logger.info(f"Query Expansion: '{query}' → '{enhanced_query}'")
+
+        return enhanced_query
+
     def expand_query(self, query: str) -> str:
         """
         Expand a user query using a language model.
@@ -29,21 +67,67 @@ class QueryExpander:
         Returns:
             Expanded query string
         """
+        enhanced_query = self._expand_locally(query)
+        if enhanced_query is not None:
+            return enhanced_query
+
+        cache_key = ExpansionCache.make_key(query, QUERY_EXPAND_TEMPLATE, self.model_name)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        self.llm_expansions.inc()
         try:
             prompt = QUERY_EXPAND_TEMPLATE.format(query=query)
             response = self.model_client.invoke(prompt)
-            
-            # Extract the content from the response
-            if hasattr(response, 'content'):
-                enhanced_query = response.content.strip()
-            else:
-                enhanced_query = str(response).strip()
-            
-            logger.info(f"Query Expansion: '{query}' → '{enhanced_query}'")
-            
+            enhanced_query = self._parse_response(query, response)
+            if self.cache is not None:
+                self.cache.put(cache_key, enhanced_query)
             return enhanced_query
             
         except Exception as e:
             logger.error(f"Error expanding query: {e}")
             # Return original query if extraction fails
             return query
+
+    async def aexpand_query(self, query: str) -> str:
+        """
+        Async version of expand_query; does not block the event loop.
+
+        Args:
+            query: The user's query string to expand
+
+        Returns:
+            Expanded query string
+        """
+        enhanced_query = self._expand_locally(query)
+        if enhanced_query is not None:
+            return enhanced_query
+
+        if self.cache is None:
+            enhanced_query, _cacheable = await self._aexpand_with_llm(query)
+            return enhanced_query
+        return await self.cache.aget_or_compute(
+            ExpansionCache.make_key(query, QUERY_EXPAND_TEMPLATE, self.model_name),
+            lambda: self._aexpand_with_llm(query),
+        )
+
+    async def _aexpand_with_llm(self, query: str) -> Tuple[str, bool]:
+        """Returns (expanded query, cacheable); the raw-query fallback after an error is not cacheable."""
+        self.llm_expansions.inc()
+        try:
+            prompt = QUERY_EXPAND_TEMPLATE.format(query=query)
+            if settings.RESILIENCE_ENABLED:
+                response = await get_resilience_policy("expansion").call(lambda: self.model_client.ainvoke(prompt))
+            else:
+                response = await self.model_client.ainvoke(prompt)
+            return self._parse_response(query, response), True
+
+        except UpstreamUnavailable as e:
+            logger.warning(f"Query expansion degraded to the raw query: {e}")
+            return query, False
+        except Exception as e:
+            logger.error(f"Error expanding query: {e}")
+            # Return original query if extraction fails
+            return query, False
@@ -1,37 +1,162 @@
 import logging
-import rag_agent.core.logging_config
+from rag_agent.core.logging_config import configure_logging, set_verbose_logging, verbose_logging
 logger = logging.getLogger(__name__)
 
 import asyncio
 import time
 from datetime import datetime
+from functools import lru_cache
 from zoneinfo import ZoneInfo
-from typing import List, AsyncGenerator
-from langchain_openai import ChatOpenAI
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Dict, List, Optional, Tuple
 
+from rag_agent.core import metrics
+from rag_agent.core.admission import stage
+from rag_agent.core.cache import StreamSingleFlight
 from rag_agent.core.config import settings, Settings
 from rag_agent.services.retriever.base_retriever import BaseRetriever
-from rag_agent.services.retriever.hybrid import HybridRetriever
-from rag_agent.services.retriever.two_stage import TwoStageRetriever
+from rag_agent.services.retriever.registry import RetrieverRegistry, make_retriever
 from rag_agent.core.model_client import get_model_client, ModelConfig, ModelType
-from rag_agent.core.enums import RetrievalMethod
+from rag_agent.core.normalization import normalize_query
+from rag_agent.core.tracing import activate, child_trace, current_trace, span
+from rag_agent.services.answer_cache import get_answer_cache, prompt_template_hash
+from rag_agent.services.context_budget import get_context_budgeter
+from rag_agent.services.context_compression import get_context_compressor, query_terms
+from rag_agent.services.intent_router import get_intent_router
 
-from rag_agent.core.prompt_templates import DEFAULT_TEMPLATE
+from rag_agent.core.prompt_templates import DEFAULT_LAYOUT, PromptLayout
 
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
 
-def get_context(
+
+async def get_context(
     query: str,
     retriever: BaseRetriever,
+    query_vector: Optional[List[float]] = None,
+    expansion_task: Optional["asyncio.Future[str]"] = None,
 ) -> List[str]:
-    """Get the context for the query."""
-    return retriever.retrieve(query)
+    """
+    Get the context for the query (see _retrieve_context), compressed to the sentences
+    relevant to the query when CONTEXT_COMPRESSION_ENABLED.
+
+    The query is expanded once per request: retrieval and compression share `expansion_task`,
+    which is started here unless the caller already started it.
+    """
+    owns_expansion = False
+    query_expander = getattr(retriever, "query_expander", None)
+    if expansion_task is None and query_expander is not None:
+        expansion_task = asyncio.create_task(query_expander.aexpand_query(query))
+        owns_expansion = True
+    try:
+        context_parts = await _retrieve_context(query, retriever, query_vector, expansion_task)
+        if not settings.CONTEXT_COMPRESSION_ENABLED or not context_parts:
+            return context_parts
+        return await _compress_context(query, query_vector, expansion_task, context_parts)
+    finally:
+        if owns_expansion and not expansion_task.done():
+            expansion_task.cancel()
+
+
+async def _compress_context(
+    query: str,
+    query_vector: Optional[List[float]],
+    expansion_task: Optional["asyncio.Future[str]"],
+    context_parts: List[str],
+) -> List[str]:
+    compressor = get_context_compressor()
+    with span("context_compression") as attributes:
+        # The expansion retrieval used (already finished when it ran)
+        enhanced_query = None
+        if expansion_task is not None:
+            try:
+                enhanced_query = await asyncio.shield(expansion_task)
+            except Exception as e:
+                logger.warning(f"Query expansion for context compression failed: {e}")
+        if query_vector is None and compressor.semantic_weight > 0:
+            try:
+                query_vector = await _embed_query(query)
+            except Exception as e:
+                logger.warning(f"Query embedding for context compression failed: {e}")
+
+        compressed = await compressor.compress(context_parts, query_terms(query, enhanced_query), query_vector)
+        attributes.update(ratio=round(compressed.ratio, 3), sentences_kept=compressed.sentences_kept)
+    logger.info(
+        f"Context compression: kept {compressed.sentences_kept}/{compressed.sentences_total} sentences, "
+        f"{compressed.compressed_chars}/{compressed.original_chars} characters (ratio {compressed.ratio:.2f})"
+    )
+    return compressed.blocks
+
+
+async def _retrieve_context(
+    query: str,
+    retriever: BaseRetriever,
+    query_vector: Optional[List[float]] = None,
+    expansion_task: Optional["asyncio.Future[str]"] = None,
+) -> List[str]:
+    """
+    Retrievers that return scored chunks get their chunks packed under CONTEXT_MAX_TOKENS
+    (see ContextBudgeter); others return formatted blocks as-is.
+    """
+    if settings.CONTEXT_MAX_TOKENS is None:
+        return await retriever.aretrieve(query, query_vector, expansion_task)
+    try:
+        chunks = await retriever.aretrieve_scored(query, query_vector, expansion_task=expansion_task)
+    except NotImplementedError:
+        return await retriever.aretrieve(query, query_vector, expansion_task)
+
+    with span("context_budget") as attributes:
+        assembly = get_context_budgeter().assemble(chunks)
+        attributes.update(context_tokens=assembly.context_tokens, tokens_saved=assembly.tokens_saved)
+    logger.info(
+        f"Context: {assembly.context_tokens} tokens from {assembly.chunks_used}/{len(chunks)} chunks "
+        f"in {len(assembly.blocks)} blocks; saved {assembly.tokens_saved} tokens "
+        f"({assembly.overlap_tokens_trimmed} overlap, {assembly.dropped_tokens} over budget)"
+    )
+    return assembly.blocks
+
+
+def _today_date() -> str:
+    now = datetime.now(ZoneInfo("America/Los_Angeles"))
+    return now.strftime("%Y-%m-%d") + " (Pacific Time)"
+
+
+class PromptCacheMetrics:
+    """Provider prompt-cache usage of one prompt layout, read from the response usage metadata."""
+
+    def __init__(self, layout_name: str):
+        self.requests = metrics.counter(f"prompt_cache.{layout_name}.requests")
+        self.hits = metrics.counter(f"prompt_cache.{layout_name}.hits")
+        self.input_tokens = metrics.counter(f"prompt_cache.{layout_name}.input_tokens")
+        self.cached_tokens = metrics.counter(f"prompt_cache.{layout_name}.cached_tokens")
+        # Share of input tokens served from the provider cache since startup
+        self.hit_rate = metrics.gauge(f"prompt_cache.{layout_name}.hit_rate")
+
+    def record(self, usage_metadata: Dict[str, Any]) -> int:
+        """Record one response's usage; returns its cached input tokens."""
+        input_tokens = usage_metadata.get("input_tokens") or 0
+        cached_tokens = (usage_metadata.get("input_token_details") or {}).get("cache_read") or 0
+        self.requests.inc()
+        if cached_tokens:
+            self.hits.inc()
+        self.input_tokens.inc(input_tokens)
+        self.cached_tokens.inc(cached_tokens)
+        if self.input_tokens.value:
+            self.hit_rate.set(round(self.cached_tokens.value / self.input_tokens.value, 4))
+        return cached_tokens
+
+
+@lru_cache(maxsize=None)
+def get_prompt_cache_metrics(layout_name: str) -> PromptCacheMetrics:
+    return PromptCacheMetrics(layout_name)
 
 
 async def handle_query(
     query: str,
     retriever: BaseRetriever,
-    model_client: ChatOpenAI,
-    prompt_template: str
+    model_client: "ChatOpenAI",
+    prompt_layout: PromptLayout,
+    query_vector: Optional[List[float]] = None,
+    expansion_task: Optional["asyncio.Future[str]"] = None,
 ) -> AsyncGenerator[str, None]:
     """
     Run one retrieval+generation cycle:
@@ -42,7 +167,9 @@ async def handle_query(
     
     # Retrieval (timing already logged in retriever.retrieve())
     retrieval_start = time.time()
-    context_parts = get_context(query, retriever)
+    with span("retrieval") as attributes:
+        context_parts = await get_context(query, retriever, query_vector, expansion_task)
+        attributes["chunk_blocks"] = len(context_parts)
     retrieval_time = time.time() - retrieval_start
     
     if not context_parts:
@@ -51,12 +178,12 @@ async def handle_query(
 
     # Build prompt
     prompt_start = time.time()
-    context = " ".join(context_parts).replace("\n", "\n\t")
+    with span("prompt_build"):
+        context = " ".join(context_parts).replace("\n", "\n\t")
 
-    now = datetime.now(ZoneInfo("America/Los_Angeles"))
-    today_date = now.strftime("%Y-%m-%d") + " (Pacific Time)"
-    logger.info(f"Today's date: {today_date}")
-    prompt = prompt_template.format(query=query, context=context, today_date=today_date)
+        today_date = _today_date()
+        logger.info(f"Today's date: {today_date}")
+        prompt = prompt_layout.render(query=query, context=context, today_date=today_date)
     prompt_time = time.time() - prompt_start
     
     # Generation/AI Response
@@ -64,33 +191,47 @@ async def handle_query(
     response = ""
     #For logging the OpenAI response object
     openai_langchain_response = None
-    async for response_chunk in model_client.astream(prompt, stream_usage=True):
-        try:
-            response += response_chunk.content
-        except Exception as e:
-            logger.error(f"Error adding response chunk. Response chunk may not contain content attribute: {e}")
-            continue
-
-        #For logging the OpenAI response object
-        openai_langchain_response = response_chunk if openai_langchain_response is None else openai_langchain_response + response_chunk
-        
-        yield response_chunk.content
+    first_token_time = None
+    async with stage("generation"):
+        with span("generation", model=getattr(model_client, "model_name", None)) as attributes:
+            generation_start_ns = time.time_ns()
+            async for response_chunk in model_client.astream(prompt, stream_usage=True):
+                if first_token_time is None:
+                    first_token_time = time.time() - generation_start
+                    trace = current_trace()
+                    if trace is not None:
+                        trace.record("llm_ttft", generation_start_ns, time.time_ns())
+                try:
+                    response += response_chunk.content
+                except Exception as e:
+                    logger.error(f"Error adding response chunk. Response chunk may not contain content attribute: {e}")
+                    continue
+
+                #For logging the OpenAI response object
+                openai_langchain_response = response_chunk if openai_langchain_response is None else openai_langchain_response + response_chunk
+
+                yield response_chunk.content
+            attributes["output_chars"] = len(response)
     
     generation_time = time.time() - generation_start
     total_handle_time = time.time() - handle_start
     
-    logger.info(f"Response generated ({len(response)} characters):")
-    logger.info(f"\n\n=========================== Response ===========================\n{response}")
+    logger.info(f"Response generated ({len(response)} characters)")
     usage_metadata = openai_langchain_response.usage_metadata
-    logger.info(f"\n\n=========================== Response Metadata ===========================\n{usage_metadata}")
+    cached_tokens = get_prompt_cache_metrics(prompt_layout.name).record(usage_metadata)
+    if verbose_logging(logger):
+        logger.info(f"\n\n=========================== Response ===========================\n{response}")
+        logger.info(f"\n\n=========================== Response Metadata ===========================\n{usage_metadata}")
     logger.info(f"\n\n=========================== Total Cost ===========================\n${(usage_metadata["input_tokens"] - usage_metadata["input_token_details"]["cache_read"]) * settings.QUERY_MODEL_PRICE_PER_INPUT_TOKEN + (usage_metadata["output_tokens"]) * settings.QUERY_MODEL_PRICE_PER_OUTPUT_TOKEN}")
     
     # Log generation latency
     logger.info("")
     logger.info("=" * 60 + " Generation Latency " + "=" * 60)
     logger.info(f"Total Generation Time: {generation_time:.3f}s")
-    logger.info(f"  - First Token Latency: N/A (streaming)")
+    if first_token_time is not None:
+        logger.info(f"  - First Token Latency: {first_token_time:.3f}s")
     logger.info(f"  - Tokens Generated: {usage_metadata.get('output_tokens', 'N/A')}")
+    logger.info(f"  - Cached Input Tokens: {cached_tokens}/{usage_metadata.get('input_tokens', 'N/A')} ({prompt_layout.name} prompt)")
     if usage_metadata.get('output_tokens'):
         tokens_per_sec = usage_metadata['output_tokens'] / generation_time
         logger.info(f"  - Generation Speed: {tokens_per_sec:.1f} tokens/sec")
@@ -108,39 +249,28 @@ async def handle_query(
     logger.info("=" * 140)
     logger.info("")
 
-def make_retriever(
-    *,
-    method: RetrievalMethod,
-    DSN: str,
-    TOP_K: int,
-    SQL_TIMEOUT_S: float,
-    VECTOR_WEIGHT: float,
-    KEYWORD_WEIGHT: float,
-) -> BaseRetriever:
-    """Return a retriever based on the method."""
-    if method == RetrievalMethod.HYBRID:
-        return HybridRetriever(
-            dsn=DSN,
-            top_k=TOP_K,
-            sql_timeout_s=SQL_TIMEOUT_S,
-            vector_weight=VECTOR_WEIGHT,
-            keyword_weight=KEYWORD_WEIGHT
-        )
-    elif method == RetrievalMethod.TWO_STAGE:
-        return TwoStageRetriever(
-            dsn=DSN,
-            top_k=TOP_K,  # Stage 2: final chunks
-            sql_timeout_s=SQL_TIMEOUT_S,
-            vector_weight=VECTOR_WEIGHT,
-            keyword_weight=KEYWORD_WEIGHT
-        )
-    elif method is RetrievalMethod.KEYWORD or method is RetrievalMethod.VECTOR:
-        raise ValueError(f"{method} retreival method has not been implemented yet.") 
-    else:
-        raise ValueError(f"Unsupported retrieval method: {method}")
+async def _embed_query(query: str) -> List[float]:
+    embedding_client = get_model_client(
+        ModelConfig(model_type=ModelType.EMBEDDING, model_name=settings.EMBEDDING_MODEL)
+    )
+    async with stage("embedding"):
+        return await embedding_client.aembed_query(query)
+
 
+async def retrieval_augmented_generation(
+    query: str,
+    retriever: BaseRetriever,
+    query_vector: Optional[List[float]] = None,
+    expansion_task: Optional["asyncio.Future[str]"] = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Answer a query with a shared, already-open retriever (see RetrieverRegistry).
 
-async def retrieval_augmented_generation(query: str) -> AsyncGenerator[str, None]:
+    Repeated questions are served from the answer cache: the cached response chunks are
+    yielded exactly as the original stream was, so callers see the same token events.
+    Pass `query_vector` when the query has already been embedded and `expansion_task` when
+    its expansion has already been started (e.g. a batch).
+    """
     rag_start = time.time()
     
     # Get the model client directly
@@ -151,24 +281,83 @@ async def retrieval_augmented_generation(query: str) -> AsyncGenerator[str, None
         streaming=True
     )
     model_client = get_model_client(model_config)
-
-    retriever = make_retriever(
-            method=settings.RETRIEVAL_METHOD,
-            DSN=settings.DSN,
-            TOP_K=settings.TOP_K,
-            SQL_TIMEOUT_S=settings.SQL_TIMEOUT_S,
-            VECTOR_WEIGHT=settings.VECTOR_WEIGHT,
-            KEYWORD_WEIGHT=settings.KEYWORD_WEIGHT
-    )
     setup_time = time.time() - setup_start
 
+    # Lookups below that need the query vector embed it here; retrieval's expansion starts at the
+    # same time, so a lookup miss does not pay the embedding and expansion round trips in series
+    query_expander = getattr(retriever, "query_expander", None)
+    owns_expansion = False
+
+    async def _embed_for_lookup() -> List[float]:
+        nonlocal expansion_task, owns_expansion
+        if expansion_task is None and query_expander is not None:
+            expansion_task = asyncio.create_task(query_expander.aexpand_query(query))
+            owns_expansion = True
+        return await _embed_query(query)
+
+    def _cancel_expansion() -> None:
+        # Answered without retrieval: the speculative expansion is not needed
+        if owns_expansion and not expansion_task.done():
+            expansion_task.cancel()
+
+    # Canned answers (contact, out-of-scope, identity, greeting) skip retrieval and generation
+    if settings.INTENT_ROUTER_ENABLED:
+        intent_router = get_intent_router()
+        with span("intent_router") as attributes:
+            try:
+                if query_vector is None and intent_router.match_rules(query) is None:
+                    # One embedding for routing, the answer cache lookup and retrieval
+                    query_vector = await _embed_for_lookup()
+                decision = await intent_router.aroute(query, query_vector)
+            except Exception as e:
+                logger.error(f"Intent routing failed; answering with retrieval: {e}")
+                decision = None
+            attributes["intent"] = decision.intent.value if decision is not None else None
+        if decision is not None:
+            _cancel_expansion()
+            yield decision.answer
+            return
+
+    # Answer cache lookup: exact normalized query first, then query-embedding similarity
+    answer_cache = get_answer_cache() if settings.ANSWER_CACHE_ENABLED else None
+    cache_scope = None
+    normalized_query = normalize_query(query)
+    if answer_cache is not None:
+        corpus_version = await retriever.acorpus_version()
+        if corpus_version is not None:
+            cache_scope = (corpus_version, prompt_template_hash(DEFAULT_LAYOUT.template), settings.QUERY_MODEL, _today_date())
+            with span("answer_cache") as attributes:
+                cached_answer = answer_cache.get_exact(cache_scope, normalized_query)
+                if cached_answer is None:
+                    try:
+                        if query_vector is None:
+                            query_vector = await _embed_for_lookup()
+                        cached_answer = answer_cache.get_similar(cache_scope, query_vector)
+                    except Exception as e:
+                        logger.error(f"Error embedding query for answer cache lookup: {e}")
+                attributes["hit"] = cached_answer is not None
+            if cached_answer is not None:
+                _cancel_expansion()
+                logger.info(f"Answer cache hit for: {query} ({time.time() - rag_start:.3f}s)")
+                for response_chunk in cached_answer.response_chunks:
+                    yield response_chunk
+                return
+
+    response_chunks: List[str] = []
     async for response_chunk in handle_query(
         query,
         retriever,
         model_client,
-        DEFAULT_TEMPLATE
+        DEFAULT_LAYOUT,
+        query_vector=query_vector,
+        expansion_task=expansion_task,
     ):
+        response_chunks.append(response_chunk)
         yield response_chunk
+
+    # Only complete answers reach this point (a disconnected client closes the generator first)
+    if cache_scope is not None and response_chunks:
+        answer_cache.put(cache_scope, normalized_query, query_vector, response_chunks)
     
     total_rag_time = time.time() - rag_start
     logger.info("")
@@ -180,20 +369,177 @@ async def retrieval_augmented_generation(query: str) -> AsyncGenerator[str, None
     logger.info("")
 
 
+@lru_cache(maxsize=None)
+def get_query_coalescer() -> StreamSingleFlight:
+    """Process-wide registry of in-flight answers, keyed by normalized query."""
+    return StreamSingleFlight("query_coalescer")
+
+
+async def coalesced_retrieval_augmented_generation(
+    query: str,
+    retriever: BaseRetriever,
+) -> AsyncGenerator[str, None]:
+    """
+    retrieval_augmented_generation, shared between concurrent identical questions.
+
+    Requests whose normalized query matches one already in flight subscribe to it instead of
+    running their own retrieval and LLM stream; chunks produced before they joined are replayed first.
+
+    The shared stream runs in the context of the request that started it, so only that request's
+    trace gets the stage spans (and only its verbose-logging flag applies). A request that joins
+    records a single `coalesced` span covering its wait instead.
+    """
+    if not settings.QUERY_COALESCING_ENABLED:
+        async for response_chunk in retrieval_augmented_generation(query, retriever):
+            yield response_chunk
+        return
+
+    key = normalize_query(query)
+    coalescer = get_query_coalescer()
+    subscription = coalescer.subscribe(key, lambda: retrieval_augmented_generation(query, retriever))
+    if not coalescer.joinable(key):
+        async for response_chunk in subscription:
+            yield response_chunk
+        return
+
+    with span("coalesced"):
+        async for response_chunk in subscription:
+            yield response_chunk
+
+
+def _prefetch_expansions(queries: List[str], retriever: BaseRetriever) -> Dict[str, "asyncio.Task[str]"]:
+    """
+    Start expanding every distinct query up front (bounded). Each query's retrieval awaits its
+    own task, so it starts as soon as its expansion lands and never expands the query again.
+    """
+    query_expander = getattr(retriever, "query_expander", None)
+    if query_expander is None:
+        return {}
+    limit = asyncio.Semaphore(settings.BATCH_EXPANSION_CONCURRENCY)
+
+    async def _expand(query: str) -> str:
+        async with limit:
+            return await query_expander.aexpand_query(query)
+
+    return {query: asyncio.create_task(_expand(query)) for query in dict.fromkeys(queries)}
+
+
+async def batch_retrieval_augmented_generation(
+    queries: List[Tuple[str, str]],
+    retriever: BaseRetriever,
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """
+    Answer many (query_id, query) pairs at once, yielding events tagged with the query id:
+      {"event": "token", "id", "text"}, {"event": "end", "id", "output_tokens", "latency_ms", "timings"},
+      {"event": "error", "id", "type", "error"}
+    Events of different queries are interleaved as they are produced.
+
+    All queries are embedded with one embed_documents call while their expansions run
+    concurrently; then at most BATCH_CONCURRENCY queries retrieve and generate at a time,
+    each reusing its own expansion.
+    A failing query only produces an error event for its id.
+    """
+    events: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+    texts = [query for _, query in queries]
+
+    expansion_tasks = _prefetch_expansions(texts, retriever)
+    query_vectors: List[Optional[List[float]]] = [None] * len(queries)
+    try:
+        embedding_client = get_model_client(
+            ModelConfig(model_type=ModelType.EMBEDDING, model_name=settings.EMBEDDING_MODEL)
+        )
+        async with stage("embedding"):
+            with span("batch_embedding", queries=len(texts)):
+                query_vectors = await embedding_client.aembed_documents(texts)
+    except Exception as e:
+        # Each query falls back to embedding itself
+        logger.error(f"Batch embedding failed for {len(texts)} queries: {e}")
+
+    limit = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+    async def _answer(query_id: str, query: str, query_vector: Optional[List[float]]) -> None:
+        async with limit:
+            # Each query gets its own trace (this task's context), exported with the batch's request id
+            trace = child_trace(query_id)
+            activate(trace)
+            start_time = time.perf_counter()
+            output_tokens = 0
+            try:
+                async for response_chunk in retrieval_augmented_generation(
+                    query, retriever, query_vector, expansion_tasks.get(query)
+                ):
+                    output_tokens += 1
+                    events.put_nowait({"event": "token", "id": query_id, "text": response_chunk})
+                end_event = {
+                    "event": "end",
+                    "id": query_id,
+                    "output_tokens": output_tokens,
+                    "latency_ms": int((time.perf_counter() - start_time) * 1000),
+                }
+                if trace is not None:
+                    end_event["timings"] = trace.summary()
+                events.put_nowait(end_event)
+            except Exception as e:
+                logger.exception(f"Batch query {query_id} failed: {e}")
+                error_type = "BadRequest" if isinstance(e, ValueError) else "InternalServerError"
+                events.put_nowait({"event": "error", "id": query_id, "type": error_type, "error": str(e)})
+            finally:
+                if trace is not None:
+                    trace.finish()
+
+    async def _answer_all() -> None:
+        await asyncio.gather(*(
+            _answer(query_id, query, query_vector)
+            for (query_id, query), query_vector in zip(queries, query_vectors)
+        ))
+        events.put_nowait(None)
+
+    answer_task = asyncio.create_task(_answer_all())
+    try:
+        while True:
+            pending = [await events.get()]
+            while not events.empty():
+                pending.append(events.get_nowait())
+            # Merge consecutive token events of the same query into one
+            merged: List[Dict[str, Any]] = []
+            for event in pending:
+                if (
+                    event is not None and event["event"] == "token" and merged
+                    and merged[-1]["event"] == "token" and merged[-1]["id"] == event["id"]
+                ):
+                    merged[-1] = {**merged[-1], "text": merged[-1]["text"] + event["text"]}
+                else:
+                    merged.append(event)
+            for event in merged:
+                if event is None:
+                    return
+                yield event
+    finally:
+        for task in (answer_task, *expansion_tasks.values()):
+            task.cancel()
+
+
 async def main() -> None:
     """CLI REPL: read a query and log response."""
-    while True:
-        raw_query = await asyncio.to_thread(
-            input, "\nEnter your query (or 'quit' to exit):\n>>> "
-        )
-        query = raw_query.strip()
-        if not query or query.lower() == "quit":
-            break
-
-        # Process the query and let logging handle the output
-        logger.info(f"\n\n====================================================== STARTING QUERY ======================================================\n\n")
-        async for response_chunk in retrieval_augmented_generation(query):
-            pass  # Just consume the chunks, logging will show the full response
+    configure_logging()
+    set_verbose_logging(True)  # the REPL is for inspecting retrieval and responses
+    retriever_registry = RetrieverRegistry()
+    await retriever_registry.open()
+    try:
+        while True:
+            raw_query = await asyncio.to_thread(
+                input, "\nEnter your query (or 'quit' to exit):\n>>> "
+            )
+            query = raw_query.strip()
+            if not query or query.lower() == "quit":
+                break
+
+            # Process the query and let logging handle the output
+            logger.info(f"\n\n====================================================== STARTING QUERY ======================================================\n\n")
+            async for response_chunk in retrieval_augmented_generation(query, await retriever_registry.get()):
+                pass  # Just consume the chunks, logging will show the full response
+    finally:
+        await retriever_registry.close()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,109 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class ScoredChunk:
+    """One ranked chunk with the scores it was ranked by (normalized per-arm scores and their weighted sum)."""
+    source_type: str
+    source_uuid: str
+    chunk_uuid: str
+    link: str
+    content: str
+    combined_score: float
+    semantic_score: float
+    keyword_score: float
+    chunk_index: Optional[int] = None  # position of the chunk within its source
+
+
+def format_chunk_blocks(chunks: List[ScoredChunk]) -> List[str]:
+    """
+    Context blocks for DEFAULT_TEMPLATE: chunks sharing a link are merged (in rank order) into
+      <text>...</text>\n<reference><url>...</url></reference>
+    """
+    chunks_by_url: Dict[str, str] = {}
+    for chunk in chunks:
+        if chunk.link in chunks_by_url:
+            chunks_by_url[chunk.link] += f"\n\n{chunk.content}"
+        else:
+            chunks_by_url[chunk.link] = chunk.content
+
+    blocks = []
+    for link, combined_content in chunks_by_url.items():
+        block = f"<text>{combined_content}</text>"
+        if link:
+            block += f"\n<reference><url>{link}</url></reference>"
+        blocks.append(block)
+    return blocks
 
 
 class BaseRetriever(ABC):
+    """
+    Retrievers are async-first: the API awaits aretrieve() on the server event loop.
+
+    The sync methods (open/retrieve/close) are thin wrappers for scripts and the REPL.
+    They run the async methods on a private event loop owned by the retriever, so a
+    retriever must be used either through the sync API or the async API, not both.
+    """
+
+    _sync_loop: Optional[asyncio.AbstractEventLoop] = None
+
     @abstractmethod
-    def retrieve(self, query: str) -> List[str]:
-        raise NotImplementedError("Subclasses must implement BaseRetriever.retrieve method.")
+    async def aretrieve(
+        self,
+        query: str,
+        query_vector: Optional[List[float]] = None,
+        expansion_task: Optional["asyncio.Future[str]"] = None,
+    ) -> List[str]:
+        """
+        Return formatted context chunks for `query`.
+        `query_vector` lets callers that already embedded the raw query skip a second embedding call;
+        `expansion_task` (an in-flight or finished query expansion) does the same for retrievers that expand.
+        """
+        raise NotImplementedError("Subclasses must implement BaseRetriever.aretrieve method.")
+
+    async def aretrieve_scored(
+        self,
+        query: str,
+        query_vector: Optional[List[float]] = None,
+        top_k: Optional[int] = None,
+        expansion_task: Optional["asyncio.Future[str]"] = None,
+    ) -> List[ScoredChunk]:
+        """Return the ranked chunks behind aretrieve(), with their scores (top_k defaults to the retriever's)."""
+        raise NotImplementedError(f"{type(self).__name__} does not return scored chunks.")
+
+    async def acorpus_version(self) -> Optional[str]:
+        """Version of the indexed corpus, used to scope caches. None means unknown (do not cache)."""
+        return None
+
+    async def aopen(self) -> None:
+        """Acquire long-lived resources (e.g. open the connection pool). No-op by default."""
+        pass
+
+    async def aprewarm(self) -> int:
+        """Load the retriever's indexes into the database cache (startup warmup); returns blocks loaded."""
+        return 0
+
+    async def aclose(self) -> None:
+        """Release long-lived resources acquired in aopen(). No-op by default."""
+        pass
+
+    def retrieve(self, query: str, query_vector: Optional[List[float]] = None) -> List[str]:
+        """Blocking wrapper around aretrieve(). Do not call from a running event loop."""
+        return self._run_sync(self.aretrieve(query, query_vector))
+
+    def open(self) -> None:
+        self._run_sync(self.aopen())
+
+    def close(self) -> None:
+        self._run_sync(self.aclose())
+        if self._sync_loop is not None:
+            self._sync_loop.close()
+            self._sync_loop = None
 
+    def _run_sync(self, coro: Awaitable[Any]) -> Any:
+        if self._sync_loop is None or self._sync_loop.is_closed():
+            self._sync_loop = asyncio.new_event_loop()
+        return self._sync_loop.run_until_complete(coro)
@@ -0,0 +1,50 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import psycopg_pool
+
+from rag_agent.services.retriever.sql_loader import read_sql
+
+logger = logging.getLogger(__name__)
+
+
+class CorpusVersionTracker:
+    """
+    Reads the corpus version from the database and caches it for `ttl_s` seconds.
+
+    Caches keyed by corpus version (answers, retrieval results) are invalidated as a
+    whole when the ETL reloads the database, without restarting the API.
+    """
+
+    def __init__(self, pool: psycopg_pool.AsyncConnectionPool, ttl_s: float = 30.0):
+        self.pool = pool
+        self.ttl_s = ttl_s
+        self._version: Optional[str] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> Optional[str]:
+        """Return the current corpus version, or None if it cannot be read."""
+        if self._version is not None and time.monotonic() - self._checked_at < self.ttl_s:
+            return self._version
+        async with self._lock:
+            if self._version is not None and time.monotonic() - self._checked_at < self.ttl_s:
+                return self._version
+            try:
+                corpus_version_sql = read_sql("corpus_version.sql")
+                async with self.pool.connection() as db_connection:
+                    async with db_connection.cursor() as db_cursor:
+                        await db_cursor.execute(corpus_version_sql)
+                        row = await db_cursor.fetchone()
+                version = row[0] if row else None
+            except Exception as e:
+                logger.error(f"Error reading corpus version: {e}")
+                version = None
+
+            if version != self._version and self._version is not None:
+                logger.info(f"Corpus version changed: {self._version} → {version}")
+            self._version = version
+            self._checked_at = time.monotonic()
+            return version
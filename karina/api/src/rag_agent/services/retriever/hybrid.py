@@ -1,8 +1,12 @@
-import psycopg
+import asyncio
+import psycopg_pool
+from rag_agent.core.admission import stage
 from rag_agent.core.model_client import get_model_client, ModelConfig, ModelType
 from rag_agent.core.config import settings
 from rag_agent.services.retriever.base_retriever import BaseRetriever
-from typing import List
+from rag_agent.services.retriever.corpus_version import CorpusVersionTracker
+from rag_agent.services.retriever.sql_loader import read_sql
+from typing import List, Optional
 
 class HybridRetriever(BaseRetriever):
     def __init__(
@@ -12,6 +16,8 @@ class HybridRetriever(BaseRetriever):
         sql_timeout_s: float,
         vector_weight: float,
         keyword_weight: float,
+        pool_min_size: int = 1,
+        pool_max_size: int = 3,
     ):
         self.dsn = dsn
         self.top_k = top_k
@@ -22,32 +28,57 @@ class HybridRetriever(BaseRetriever):
         self.embedding_model = settings.EMBEDDING_MODEL
         self.model_type = ModelType.EMBEDDING
 
+        self.pool = psycopg_pool.AsyncConnectionPool(
+            dsn,
+            min_size=pool_min_size,
+            max_size=pool_max_size,
+            timeout=sql_timeout_s,
+            open=False,
+        )
+        self.corpus_version = CorpusVersionTracker(self.pool, ttl_s=settings.CORPUS_VERSION_TTL_S)
+
+    async def aopen(self) -> None:
+        await self.pool.open(wait=True, timeout=self.sql_timeout_s)
+
+    async def acorpus_version(self) -> Optional[str]:
+        return await self.corpus_version.get()
 
-    def _embed_query(self, query: str):
+    async def aclose(self) -> None:
+        await self.pool.close()
+
+    async def _embed_query(self, query: str):
         query_vector_config = ModelConfig(
             model_type=self.model_type,
             model_name=self.embedding_model
         )
-        return get_model_client(query_vector_config).embed_query(query)
+        async with stage("embedding"):
+            return await get_model_client(query_vector_config).aembed_query(query)
 
 
-    def retrieve(self, query: str) -> List[str]:
+    async def aretrieve(
+        self,
+        query: str,
+        query_vector: Optional[List[float]] = None,
+        expansion_task: Optional["asyncio.Future[str]"] = None,
+    ) -> List[str]:
+        # The hybrid query searches the raw query, so `expansion_task` is not used
 
         sql_query = (
-            open(settings.SQL_DIR / "hybrid_query.sql").read()
+            read_sql("hybrid_query.sql")
             .replace("%TIMEOUT_MS%", str(int(self.sql_timeout_s * 1000)))
             .replace("%TOP_K%", str(self.top_k))
         )
 
-        query_vector = self._embed_query(query)  # -> list[float] of length 3072
+        if query_vector is None:
+            query_vector = await self._embed_query(query)  # -> list[float] of length 3072
 
-        with psycopg.connect(self.dsn) as db_connection:
-            with db_connection.cursor() as db_cursor:
+        async with stage("db"), self.pool.connection() as db_connection:
+            async with db_connection.cursor() as db_cursor:
                 # First execute the SET LOCAL command
-                db_cursor.execute(f"SET LOCAL statement_timeout = {int(self.sql_timeout_s * 1000)};")
+                await db_cursor.execute(f"SET LOCAL statement_timeout = {int(self.sql_timeout_s * 1000)};")
                 
                 # Then execute the main query (the entire sql_query since we removed SET LOCAL from the file)
-                db_cursor.execute(
+                await db_cursor.execute(
                     sql_query,
                     {
                         'query': query,
@@ -56,7 +87,7 @@ class HybridRetriever(BaseRetriever):
                         'keyword_weight': self.keyword_weight
                     }
                 )
-                rows = db_cursor.fetchall()
+                rows = await db_cursor.fetchall()
 
         
         return [row[0] for row in rows]
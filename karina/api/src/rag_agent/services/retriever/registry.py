@@ -0,0 +1,107 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from rag_agent.core.config import settings, Settings
+from rag_agent.core.enums import RetrievalMethod
+from rag_agent.services.retriever.base_retriever import BaseRetriever
+
+logger = logging.getLogger(__name__)
+
+
+def make_retriever(
+    *,
+    method: RetrievalMethod,
+    DSN: str,
+    TOP_K: int,
+    SQL_TIMEOUT_S: float,
+    VECTOR_WEIGHT: float,
+    KEYWORD_WEIGHT: float,
+    POOL_MIN_SIZE: int = 1,
+    POOL_MAX_SIZE: int = 3,
+) -> BaseRetriever:
+    """Return a retriever based on the method. Implementations (and psycopg) are imported on first use."""
+    if method == RetrievalMethod.HYBRID:
+        from rag_agent.services.retriever.hybrid import HybridRetriever
+        return HybridRetriever(
+            dsn=DSN,
+            top_k=TOP_K,
+            sql_timeout_s=SQL_TIMEOUT_S,
+            vector_weight=VECTOR_WEIGHT,
+            keyword_weight=KEYWORD_WEIGHT,
+            pool_min_size=POOL_MIN_SIZE,
+            pool_max_size=POOL_MAX_SIZE,
+        )
+    elif method == RetrievalMethod.TWO_STAGE:
+        from rag_agent.services.retriever.two_stage import TwoStageRetriever
+        return TwoStageRetriever(
+            dsn=DSN,
+            top_k=TOP_K,  # Stage 2: final chunks
+            sql_timeout_s=SQL_TIMEOUT_S,
+            vector_weight=VECTOR_WEIGHT,
+            keyword_weight=KEYWORD_WEIGHT,
+            pool_min_size=POOL_MIN_SIZE,
+            pool_max_size=POOL_MAX_SIZE,
+        )
+    elif method is RetrievalMethod.KEYWORD or method is RetrievalMethod.VECTOR:
+        raise ValueError(f"{method} retreival method has not been implemented yet.")
+    else:
+        raise ValueError(f"Unsupported retrieval method: {method}")
+
+
+class RetrieverRegistry:
+    """
+    Process-lifetime store of retrievers, one instance per retrieval method.
+
+    Retrievers own a connection pool, so they are built once (on open() for the
+    configured method, lazily for any other method) and shared by every request.
+    close() shuts all pools down; call it from the application shutdown hook.
+    All methods must be awaited on the event loop that serves requests.
+    """
+
+    def __init__(self, config: Settings = settings):
+        self.config = config
+        self._retrievers: Dict[RetrievalMethod, BaseRetriever] = {}
+        self._lock = asyncio.Lock()
+
+    async def _build(self, method: RetrievalMethod) -> BaseRetriever:
+        retriever = make_retriever(
+            method=method,
+            DSN=self.config.DSN,
+            TOP_K=self.config.TOP_K,
+            SQL_TIMEOUT_S=self.config.SQL_TIMEOUT_S,
+            VECTOR_WEIGHT=self.config.VECTOR_WEIGHT,
+            KEYWORD_WEIGHT=self.config.KEYWORD_WEIGHT,
+            POOL_MIN_SIZE=self.config.DB_POOL_MIN_SIZE,
+            POOL_MAX_SIZE=self.config.DB_POOL_MAX_SIZE,
+        )
+        await retriever.aopen()
+        logger.info(f"Retriever ready: {method.value} ({type(retriever).__name__})")
+        return retriever
+
+    async def open(self) -> None:
+        """Build the configured retriever and warm its connection pool."""
+        await self.get(self.config.RETRIEVAL_METHOD)
+
+    async def get(self, method: Optional[RetrievalMethod] = None) -> BaseRetriever:
+        """Return the shared retriever for `method` (defaults to the configured method)."""
+        method = method or self.config.RETRIEVAL_METHOD
+        retriever = self._retrievers.get(method)
+        if retriever is not None:
+            return retriever
+        async with self._lock:
+            retriever = self._retrievers.get(method)
+            if retriever is None:
+                retriever = await self._build(method)
+                self._retrievers[method] = retriever
+        return retriever
+
+    async def close(self) -> None:
+        """Close every retriever built by this registry."""
+        while self._retrievers:
+            method, retriever = self._retrievers.popitem()
+            try:
+                await retriever.aclose()
+                logger.info(f"Retriever closed: {method.value}")
+            except Exception as e:
+                logger.error(f"Error closing {method.value} retriever: {e}")
@@ -0,0 +1,35 @@
+import logging
+from typing import Any, List, Optional, Tuple
+
+from rag_agent.core.cache import TTLCache
+from rag_agent.services.retriever.base_retriever import ScoredChunk
+
+logger = logging.getLogger(__name__)
+
+
+class RetrievalCache:
+    """
+    Caches for TwoStageRetriever, all tagged with the corpus version:
+      - chunks:          final Stage-2 scored chunks
+      - stage1_vector:   Stage-1 vector-arm candidate rows (depend on the raw query vector)
+      - stage1_keyword:  Stage-1 keyword-arm candidate rows (depend on the expanded query)
+
+    Every key starts with the corpus version, and sync_version() drops all entries as soon
+    as a new version is observed, so an ETL reload invalidates everything without a restart.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_s: float = 3600.0):
+        self.chunks: TTLCache[List[ScoredChunk]] = TTLCache("retrieval_cache.chunks", max_entries, ttl_s)
+        self.stage1_vector: TTLCache[List[Tuple[Any, ...]]] = TTLCache("retrieval_cache.stage1_vector", max_entries, ttl_s)
+        self.stage1_keyword: TTLCache[List[Tuple[Any, ...]]] = TTLCache("retrieval_cache.stage1_keyword", max_entries, ttl_s)
+        self._corpus_version: Optional[str] = None
+
+    def sync_version(self, corpus_version: Optional[str]) -> None:
+        if corpus_version is None or corpus_version == self._corpus_version:
+            return
+        if self._corpus_version is not None:
+            logger.info(f"Corpus version changed ({self._corpus_version} → {corpus_version}); clearing retrieval cache")
+        self.chunks.clear()
+        self.stage1_vector.clear()
+        self.stage1_keyword.clear()
+        self._corpus_version = corpus_version
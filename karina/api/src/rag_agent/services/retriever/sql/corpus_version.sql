@@ -0,0 +1,12 @@
+-- Corpus version — changes whenever the ETL reloads or rewrites the prod schema.
+-- Table OIDs change on pg_restore / CREATE TABLE; tuple counters change on INSERT/UPDATE/DELETE.
+-- Output: one text value (md5), compared for equality only.
+
+SELECT md5(
+  COALESCE(
+    string_agg(relid::text || ':' || (n_tup_ins + n_tup_upd + n_tup_del)::text, ',' ORDER BY relid),
+    ''
+  )
+)
+FROM pg_stat_user_tables
+WHERE schemaname = 'prod';
@@ -0,0 +1,77 @@
+-- Stage 1 (keyword arm) — BM25 candidates for documents + sections
+-- Needs the expanded query text, so it runs once query expansion lands.
+-- Inputs:
+--   %(query_text)s       :: text
+--   %(include_docs)s     :: boolean
+--   %(include_sections)s :: boolean
+-- Output: (stream_type, source_type, source_uuid, title, link, sem_score, kw_score)
+
+WITH params(query_text, inc_docs, inc_secs) AS (
+  VALUES (
+    %(query_text)s::text,
+    %(include_docs)s::boolean,
+    %(include_sections)s::boolean
+  )
+),
+
+-- ---------------------------
+-- Keyword candidates 
+-- ---------------------------
+
+doc_kw AS MATERIALIZED (
+  SELECT
+    'doc_kw'::text      AS stream_type,
+    'document'::text    AS source_type,
+    d.document_uuid     AS source_uuid,
+    d.title,
+    d.link,
+    NULL::float8        AS sem_score,
+    s.score::float8     AS kw_score
+  FROM params p
+  JOIN LATERAL (SELECT p.query_text::text AS q) q ON true
+  JOIN LATERAL (
+    SELECT
+      dd.document_uuid,
+      paradedb.score(dd.document_uuid) AS score
+    FROM prod.documents dd
+    WHERE
+      dd.title   ||| q.q OR
+      dd.excerpt ||| q.q OR
+      dd.content ||| q.q
+    ORDER BY paradedb.score(dd.document_uuid) DESC
+    LIMIT 30
+  ) s ON true
+  JOIN prod.documents d ON d.document_uuid = s.document_uuid
+  WHERE p.inc_docs
+),
+
+sec_kw AS MATERIALIZED (
+  SELECT
+    'sec_kw'::text      AS stream_type,
+    'section'::text     AS source_type,
+    s.section_uuid      AS source_uuid,
+    s.title,
+    s.link,
+    NULL::float8        AS sem_score,
+    x.score::float8     AS kw_score
+  FROM params p
+  JOIN LATERAL (SELECT p.query_text::text AS q) q ON true
+  JOIN LATERAL (
+    SELECT
+      ss.section_uuid,
+      paradedb.score(ss.section_uuid) AS score
+    FROM prod.sections ss
+    WHERE
+    ss.title   ||| q.q OR
+      ss.excerpt ||| q.q OR
+      ss.content ||| q.q
+    ORDER BY paradedb.score(ss.section_uuid) DESC
+    LIMIT 30
+  ) x ON true
+  JOIN prod.sections s ON s.section_uuid = x.section_uuid
+  WHERE p.inc_secs
+)
+
+SELECT stream_type, source_type, source_uuid, title, link, sem_score, kw_score FROM doc_kw
+UNION ALL
+SELECT stream_type, source_type, source_uuid, title, link, sem_score, kw_score FROM sec_kw;
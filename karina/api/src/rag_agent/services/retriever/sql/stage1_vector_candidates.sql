@@ -0,0 +1,57 @@
+-- Stage 1 (vector arm) — excerpt-embedding candidates for documents + sections
+-- Only needs the raw-query embedding, so it runs as soon as the vector is ready.
+-- Inputs:
+--   %(vector)s           :: float4[] length 3072
+--   %(model_name)s       :: text
+--   %(include_docs)s     :: boolean
+--   %(include_sections)s :: boolean
+-- Output: (stream_type, source_type, source_uuid, title, link, sem_score, kw_score)
+
+WITH params(qvec, model_name, inc_docs, inc_secs) AS (
+  VALUES (
+    (%(vector)s::float4[])::vector(3072),
+    %(model_name)s::text,
+    %(include_docs)s::boolean,
+    %(include_sections)s::boolean
+  )
+),
+
+-- ---------------------------
+-- Vector candidates (excerpt)
+-- ---------------------------
+doc_vec AS (
+  SELECT
+    'doc_vec'::text AS stream_type,
+    'document'::text AS source_type,
+    d.document_uuid  AS source_uuid,
+    d.title,
+    d.link,
+    (1 - (dee.embedding <-> p.qvec))::float8 AS sem_score,
+    NULL::float8 AS kw_score
+  FROM prod.document_excerpt_embeddings_3072 dee
+  JOIN prod.documents d ON d.document_uuid = dee.document_uuid
+  JOIN params p ON p.inc_docs
+  WHERE dee.model_name = p.model_name
+  ORDER BY dee.embedding <-> p.qvec
+  LIMIT 30
+),
+sec_vec AS (
+  SELECT
+    'sec_vec'::text AS stream_type,
+    'section'::text  AS source_type,
+    s.section_uuid   AS source_uuid,
+    s.title,
+    s.link,
+    (1 - (see.embedding <-> p.qvec))::float8 AS sem_score,
+    NULL::float8 AS kw_score
+  FROM prod.section_excerpt_embedding_3072 see
+  JOIN prod.sections s ON s.section_uuid = see.section_uuid
+  JOIN params p ON p.inc_secs
+  WHERE see.model_name = p.model_name
+  ORDER BY see.embedding <-> p.qvec
+  LIMIT 30
+)
+
+SELECT stream_type, source_type, source_uuid, title, link, sem_score, kw_score FROM doc_vec
+UNION ALL
+SELECT stream_type, source_type, source_uuid, title, link, sem_score, kw_score FROM sec_vec;
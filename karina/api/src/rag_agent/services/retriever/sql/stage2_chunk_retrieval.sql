@@ -8,6 +8,8 @@
 --   %(vector_weight)s  :: float8 (use 0.7)
 --   %(keyword_weight)s :: float8 (use 0.3)
 -- Output: top %TOP_K% chunks across docs+sections with combined score
+--   (source_type, source_uuid, content_chunk, link, combined_score, sem_score, kw_score, chunk_uuid, chunk_index)
+--   sem_score / kw_score are the normalized per-arm scores that combined_score is built from
 
 WITH params(query_text, qvec, model_name, doc_uuids, sec_uuids, w_sem, w_kw) AS (
   VALUES (
@@ -29,6 +31,7 @@ doc_chunk_vec AS (
     'document'::text      AS source_type,
     dc.document_uuid      AS source_uuid,
     dc.chunk_uuid,
+    dc.chunk_index,
     d.link,
     dc.content_chunk,
    (1 - (dce.embedding <-> p.qvec))::float8 AS sem_score,
@@ -48,6 +51,7 @@ sec_chunk_vec AS (
     'section'::text       AS source_type,
     sc.section_uuid       AS source_uuid,
     sc.chunk_uuid,
+    sc.chunk_index,
     s.link,
     sc.content_chunk,
     (1 - (sce.embedding <-> p.qvec))::float8 AS sem_score,
@@ -73,6 +77,7 @@ doc_chunk_kw AS MATERIALIZED (
     dc.document_uuid      AS source_uuid,
     d.link,
     dc.chunk_uuid,
+    dc.chunk_index,
     dc.content_chunk,
     NULL::float8          AS sem_score,
     x.score::float8       AS kw_score
@@ -98,6 +103,7 @@ sec_chunk_kw AS MATERIALIZED (
     sc.section_uuid       AS source_uuid,
     s.link,
     sc.chunk_uuid,
+    sc.chunk_index,
     sc.content_chunk,
     NULL::float8          AS sem_score,
     x.score::float8       AS kw_score
@@ -124,6 +130,7 @@ doc_chunks AS (
     COALESCE(v.source_type, k.source_type) AS source_type,
     COALESCE(v.source_uuid, k.source_uuid) AS source_uuid,
     COALESCE(v.chunk_uuid,  k.chunk_uuid)  AS chunk_uuid,
+    COALESCE(v.chunk_index, k.chunk_index) AS chunk_index,
     COALESCE(v.link,        k.link)        AS link,
     COALESCE(v.content_chunk, k.content_chunk) AS content_chunk,
     COALESCE(v.sem_score, 0.0)::float8 AS sem_score,
@@ -137,6 +144,7 @@ sec_chunks AS (
     COALESCE(v.source_type, k.source_type) AS source_type,
     COALESCE(v.source_uuid, k.source_uuid) AS source_uuid,
     COALESCE(v.chunk_uuid,  k.chunk_uuid)  AS chunk_uuid,
+    COALESCE(v.chunk_index, k.chunk_index) AS chunk_index,
     COALESCE(v.link,        k.link)        AS link,
     COALESCE(v.content_chunk, k.content_chunk) AS content_chunk,
     COALESCE(v.sem_score, 0.0)::float8 AS sem_score,
@@ -159,6 +167,7 @@ scored AS (
     source_type,
     source_uuid,
     chunk_uuid,
+    chunk_index,
     link,
     content_chunk,
     GREATEST(0.0, sem_score) AS sem_norm,
@@ -182,7 +191,11 @@ SELECT
   source_uuid,
   content_chunk,
   link,
-  combined_score
+  combined_score,
+  sem_norm AS sem_score,
+  kw_norm  AS kw_score,
+  chunk_uuid,
+  chunk_index
 FROM ranked
 ORDER BY combined_score DESC, sem_norm DESC, chunk_uuid ASC
 LIMIT %TOP_K%;
\ No newline at end of file
@@ -0,0 +1,14 @@
+-- Warmup — load the prod schema's HNSW (pgvector) and BM25 (ParadeDB) indexes into shared buffers.
+-- Requires the pg_prewarm extension (CREATE EXTENSION pg_prewarm;); warmup skips this step without it.
+-- Output: (index_name, blocks_loaded) per index
+
+SELECT
+  c.relname              AS index_name,
+  pg_prewarm(c.oid::regclass) AS blocks_loaded
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+JOIN pg_am am ON am.oid = c.relam
+WHERE n.nspname = 'prod'
+  AND c.relkind = 'i'
+  AND am.amname IN ('hnsw', 'bm25')
+ORDER BY c.relname;
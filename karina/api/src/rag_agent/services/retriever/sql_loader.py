@@ -0,0 +1,18 @@
+from functools import lru_cache
+from typing import List
+
+from rag_agent.core.config import settings
+
+
+@lru_cache(maxsize=None)
+def read_sql(sql_file: str) -> str:
+    """Contents of a file in SQL_DIR, read once per process."""
+    return (settings.SQL_DIR / sql_file).read_text()
+
+
+def preload_sql() -> List[str]:
+    """Read every SQL file up front (startup warmup); returns the file names."""
+    sql_files = sorted(path.name for path in settings.SQL_DIR.glob("*.sql"))
+    for sql_file in sql_files:
+        read_sql(sql_file)
+    return sql_files
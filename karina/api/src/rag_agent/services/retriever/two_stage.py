@@ -1,16 +1,27 @@
-import psycopg
+import asyncio
 import psycopg_pool
 import logging
 import time
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
+from rag_agent.core import metrics
 from rag_agent.core.model_client import get_model_client, ModelConfig, ModelType
 from rag_agent.core.config import settings
-from rag_agent.services.retriever.base_retriever import BaseRetriever
+from rag_agent.services.retriever.base_retriever import BaseRetriever, ScoredChunk, format_chunk_blocks
+from rag_agent.services.retriever.corpus_version import CorpusVersionTracker
+from rag_agent.services.retriever.retrieval_cache import RetrievalCache
+from rag_agent.services.retriever.sql_loader import read_sql
+from rag_agent.core.normalization import normalize_query
+from rag_agent.core.admission import stage
+from rag_agent.core.logging_config import verbose_logging
+from rag_agent.core.tracing import span
 from rag_agent.services.ner_extractor import NERKeywordExtractor
 from rag_agent.services.query_expander import QueryExpander
 
 logger = logging.getLogger(__name__)
 
+# Stage-2 query vector when embedding is unavailable (the SQL casts to vector(3072))
+_ZERO_VECTOR = [0.0] * 3072
+
 
 class TwoStageRetriever(BaseRetriever):
     """
@@ -30,6 +41,8 @@ class TwoStageRetriever(BaseRetriever):
         sql_timeout_s: float = 10.0,
         vector_weight: float = 0.7,
         keyword_weight: float = 0.3,
+        pool_min_size: int = 1,
+        pool_max_size: int = 3,
     ):
         self.dsn = dsn
         # Keep original arg names for compatibility; Stage-1 will internally cap to 75.
@@ -38,13 +51,15 @@ class TwoStageRetriever(BaseRetriever):
         self.vector_weight = vector_weight
         self.keyword_weight = keyword_weight
 
-        # Create connection pool for better performance
-        self.pool = psycopg_pool.ConnectionPool(
+        # Connection pool is opened by aopen() and shared for the lifetime of the retriever
+        self.pool = psycopg_pool.AsyncConnectionPool(
             dsn,
-            min_size=1,
-            max_size=3,
-            timeout=sql_timeout_s
+            min_size=pool_min_size,
+            max_size=pool_max_size,
+            timeout=sql_timeout_s,
+            open=False,
         )
+        self.corpus_version = CorpusVersionTracker(self.pool, ttl_s=settings.CORPUS_VERSION_TTL_S)
 
         # Initialize models
         self.embedding_model = settings.EMBEDDING_MODEL
@@ -57,10 +72,40 @@ class TwoStageRetriever(BaseRetriever):
         self.ner_extractor = NERKeywordExtractor()
         self.query_expander = QueryExpander()
         self.embedding_client = get_model_client(self.embedding_config)
+        self.keyword_only_retrievals = metrics.counter("retrieval.degraded.keyword_only")
+
+        self.cache: Optional[RetrievalCache] = None
+        if settings.RETRIEVAL_CACHE_ENABLED:
+            self.cache = RetrievalCache(
+                max_entries=settings.RETRIEVAL_CACHE_MAX_ENTRIES,
+                ttl_s=settings.RETRIEVAL_CACHE_TTL_S,
+            )
+
+    async def aopen(self) -> None:
+        """Open the connection pool and wait until `min_size` connections are ready."""
+        await self.pool.open(wait=True, timeout=self.sql_timeout_s)
+
+    async def acorpus_version(self) -> Optional[str]:
+        return await self.corpus_version.get()
+
+    async def aprewarm(self) -> int:
+        """pg_prewarm the HNSW and BM25 indexes used by both stages (needs the pg_prewarm extension)."""
+        async with self.pool.connection() as db_connection:
+            async with db_connection.cursor() as db_cursor:
+                await db_cursor.execute(read_sql("warmup_prewarm.sql"))
+                rows = await db_cursor.fetchall()
+        for index_name, blocks_loaded in rows:
+            logger.info(f"Prewarmed {index_name}: {blocks_loaded} blocks")
+        return sum(blocks_loaded for _, blocks_loaded in rows)
+
+    async def aclose(self) -> None:
+        """Close the connection pool."""
+        await self.pool.close()
 
-    def _embed_query(self, query: str) -> List[float]:
+    async def _embed_query(self, query: str) -> List[float]:
         """Generate embedding for a query."""
-        return self.embedding_client.embed_query(query)
+        async with stage("embedding"):
+            return await self.embedding_client.aembed_query(query)
 
     def _log_results_from_data(
         self,
@@ -187,109 +232,168 @@ class TwoStageRetriever(BaseRetriever):
     # -----------------------------
     # New Stage-1 (rank fusion) API
     # -----------------------------
-    def _stage1_unit_filter(
+    async def _stage1_fetch_candidates(
+        self,
+        arm: str,
+        sql_file: str,
+        params: Dict[str, Any],
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Run one Stage-1 candidate arm on its own pooled connection.
+        Rows: (stream_type, source_type, source_uuid, title, link, sem_score, kw_score)
+        """
+        stage1_sql = read_sql(sql_file)
+
+        async with stage("db"), self.pool.connection() as db_connection:
+            async with db_connection.cursor() as db_cursor:
+                # Set timeout
+                await db_cursor.execute(
+                    f"SET LOCAL statement_timeout = {int(self.sql_timeout_s * 1000)};"
+                )
+
+                # Execute Stage 1 arm
+                await db_cursor.execute(stage1_sql, params)
+
+                # ensure we actually have a result set
+                if db_cursor.description is None:
+                    logger.error("STAGE1 (%s): NO RESULT SET (db_cursor.description is None)", arm)
+                    logger.debug("STAGE1 (%s) SQL TAIL:\n%s", arm, stage1_sql[-800:])
+                    return []
+
+                # Fetch rows while cursor is alive
+                rows = await db_cursor.fetchall()
+
+                if logger.isEnabledFor(logging.DEBUG):
+                    # column order (ground truth) and first row raw values
+                    logger.debug(
+                        "STAGE1 (%s) COLUMNS: %s; FIRST ROW: %r",
+                        arm,
+                        [(col.name, col.type_code) for col in db_cursor.description],
+                        rows[0] if rows else None,
+                    )
+
+        return rows
+
+    async def _stage1_vector_candidates(
         self,
-        query: str,
         query_vector: List[float],
         include_docs: bool = True,
         include_sections: bool = True,
+    ) -> List[Tuple[Any, ...]]:
+        """Stage 1 vector arm: excerpt-embedding candidates (needs only the query vector)."""
+        try:
+            return await self._stage1_fetch_candidates(
+                "vector",
+                "stage1_vector_candidates.sql",
+                {
+                    "vector": query_vector,
+                    "model_name": self.embedding_model,
+                    "include_docs": include_docs,
+                    "include_sections": include_sections,
+                },
+            )
+        except Exception as e:
+            logger.exception(f"Error in Stage 1 vector candidates: {e}")
+            return []
+
+    async def _stage1_keyword_candidates(
+        self,
+        query: str,
+        include_docs: bool = True,
+        include_sections: bool = True,
+    ) -> List[Tuple[Any, ...]]:
+        """Stage 1 keyword arm: BM25 candidates (needs only the expanded query text)."""
+        try:
+            return await self._stage1_fetch_candidates(
+                "keyword",
+                "stage1_keyword_candidates.sql",
+                {
+                    "query_text": query,
+                    "include_docs": include_docs,
+                    "include_sections": include_sections,
+                },
+            )
+        except Exception as e:
+            logger.exception(f"Error in Stage 1 keyword candidates: {e}")
+            return []
+
+    def _stage1_merge_units(
+        self,
+        candidate_rows: List[Tuple[Any, ...]],
         cap_units: int = 75,
     ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
-        Stage 1: Recall-heavy unit filter with rank fusion (no weights).
+        Dedupe Stage-1 candidates by identity (source_type, source_uuid), keeping the best
+        score per arm and the set of arms that found the unit.
         Returns two lists:
         - documents: [{uuid, title, link, best_sem_score, best_kw_score, retrieval_sources}, ...]
         - sections : [same keys, ...]
         """
-        try:
-            stage1_sql_path = settings.SQL_DIR / "stage1_document_section_filter.sql"
-            stage1_sql = open(stage1_sql_path).read()
-
-            documents: List[Dict[str, Any]] = []
-            sections: List[Dict[str, Any]] = []
-            all_units: List[Dict[str, Any]] = []
-
-            # IMPORTANT: rows must be defined outside the cursor scope so we can use it later.
-            rows = []
-
-            with self.pool.connection() as db_connection:
-                with db_connection.cursor() as db_cursor:
-                    # Set timeout
-                    db_cursor.execute(
-                        f"SET LOCAL statement_timeout = {int(self.sql_timeout_s * 1000)};"
-                    )
-
-                    # Execute Stage 1 query
-                    db_cursor.execute(
-                        stage1_sql,
-                        {
-                            "query_text": query,
-                            "vector": query_vector,
-                            "model_name": self.embedding_model,
-                            "include_docs": include_docs,
-                            "include_sections": include_sections,
-                        },
-                    )
-
-                    # debug: ensure we actually have a result set
-                    if db_cursor.description is None:
-                        logger.error("STAGE1: NO RESULT SET (db_cursor.description is None)")
-                        logger.error("STAGE1 SQL HEAD:\n%s", stage1_sql[:300])
-                        logger.error("STAGE1 SQL TAIL:\n%s", stage1_sql[-800:])
-                        return [], []
-
-                    # Fetch rows while cursor is alive
-                    rows = db_cursor.fetchall()
-
-                    # debug: column order (ground truth)
-                    logger.error("STAGE1 COLUMN ORDER:")
-                    for i, col in enumerate(db_cursor.description):
-                        logger.error("  r[%d] = %s (%s)", i, col.name, col.type_code)
-
-                    # debug: first row raw values
-                    if rows:
-                        logger.error("STAGE1 FIRST ROW RAW:")
-                        for i, val in enumerate(rows[0]):
-                            logger.error("  r[%d] = %r", i, val)
-                    else:
-                        logger.error("STAGE1 RETURNED NO ROWS")
-
-            # Normal processing after cursor closes (rows are already fetched)
-            for r in rows[:cap_units]:
-                source_type = r[0]
+        merged: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        for stream_type, source_type, source_uuid, title, link, sem_score, kw_score in candidate_rows:
+            unit = merged.get((source_type, source_uuid))
+            if unit is None:
                 unit = {
                     "source_type": source_type,
-                    "uuid": r[1],
-                    "title": r[2],
-                    "link": r[3],
-                    "best_sem_score": float(r[4]) if r[4] is not None else None,
-                    "best_kw_score": float(r[5]) if r[5] is not None else None,
-                    "retrieval_sources": r[6],
+                    "uuid": source_uuid,
+                    "title": title,
+                    "link": link,
+                    "best_sem_score": None,
+                    "best_kw_score": None,
+                    "retrieval_sources": [],
                 }
-                all_units.append(unit)
-                if source_type == "document":
-                    documents.append(unit)
-                else:
-                    sections.append(unit)
-
-            # Log breakdown using the fetched units
+                merged[(source_type, source_uuid)] = unit
+            unit["title"] = max(filter(None, (unit["title"], title)), default=None)
+            unit["link"] = max(filter(None, (unit["link"], link)), default=None)
+            if sem_score is not None:
+                sem_score = float(sem_score)
+                if unit["best_sem_score"] is None or sem_score > unit["best_sem_score"]:
+                    unit["best_sem_score"] = sem_score
+            if kw_score is not None:
+                kw_score = float(kw_score)
+                if unit["best_kw_score"] is None or kw_score > unit["best_kw_score"]:
+                    unit["best_kw_score"] = kw_score
+            if stream_type not in unit["retrieval_sources"]:
+                unit["retrieval_sources"] = sorted(unit["retrieval_sources"] + [stream_type])
+
+        all_units = list(merged.values())[:cap_units]
+        documents = [u for u in all_units if u["source_type"] == "document"]
+        sections = [u for u in all_units if u["source_type"] != "document"]
+
+        # Log breakdown using the merged units (opt-in: it sorts and formats every unit)
+        if verbose_logging(logger):
             self._log_results_from_data(all_units)
 
-            logger.info(
-                f"\n====================================================== Stage 1: {len(documents)} documents, {len(sections)} sections (total {len(rows)}) ======================================================"
-            )
+        logger.info(
+            f"\n====================================================== Stage 1: {len(documents)} documents, {len(sections)} sections (total {len(merged)}) ======================================================"
+        )
 
-            return documents, sections
+        return documents, sections
 
-        except Exception as e:
-            logger.exception(f"Error in Stage 1 (rank fusion) filtering: {e}")
-            return [], []
+    async def _stage1_unit_filter(
+        self,
+        query: str,
+        query_vector: List[float],
+        include_docs: bool = True,
+        include_sections: bool = True,
+        cap_units: int = 75,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Stage 1: Recall-heavy unit filter with rank fusion (no weights).
+        Runs the vector and keyword arms concurrently when both inputs are already known.
+        aretrieve() starts each arm as soon as its own input is ready instead.
+        """
+        vector_rows, keyword_rows = await asyncio.gather(
+            self._stage1_vector_candidates(query_vector, include_docs, include_sections),
+            self._stage1_keyword_candidates(query, include_docs, include_sections),
+        )
+        return self._stage1_merge_units(vector_rows + keyword_rows, cap_units=cap_units)
 
 
     # --------------------------------------------
     # Back-compat Stage-1 method (kept, minimal)
     # --------------------------------------------
-    def _stage1_document_filter(
+    async def _stage1_document_filter(
         self, 
         query_text: str, 
         query_vector: List[float]
@@ -298,7 +402,7 @@ class TwoStageRetriever(BaseRetriever):
         Backward-compatible wrapper that returns only documents in the old shape.
         NOTE: Uses the new rank-fusion Stage-1 internally.
         """
-        docs, _secs = self._stage1_unit_filter(query_text, query_vector)
+        docs, _secs = await self._stage1_unit_filter(query_text, query_vector)
         documents = []
         for doc in docs:
             documents.append({
@@ -314,31 +418,31 @@ class TwoStageRetriever(BaseRetriever):
     # -----------------------------
     # New Stage-2 (70/30 fusion) API
     # -----------------------------
-    def _stage2_chunk_retrieval_fusion(
+    async def _stage2_scored_chunks(
         self,
         query: str,
         query_vector: List[float],
         document_uuids: List[str],
         section_uuids: List[str],
-    ) -> List[str]:
+        top_k: Optional[int] = None,
+    ) -> List[ScoredChunk]:
         """
-        Stage 2: Retrieve chunks with authoritative 70/30 fusion (semantic/keyword).
-        Returns formatted chunk blocks:
-          <text>...</text>\n<reference><url>...</url></reference>
+        Stage 2: Retrieve the top_k chunks with authoritative 70/30 fusion (semantic/keyword),
+        best first, with their per-arm scores.
         """
         try:
             stage2_sql = (
-                open(settings.SQL_DIR / "stage2_chunk_retrieval.sql").read()
-                .replace("%TOP_K%", str(self.top_k))
+                read_sql("stage2_chunk_retrieval.sql")
+                .replace("%TOP_K%", str(top_k or self.top_k))
             )
 
-            with self.pool.connection() as db_connection:
-                with db_connection.cursor() as db_cursor:
+            async with stage("db"), self.pool.connection() as db_connection:
+                async with db_connection.cursor() as db_cursor:
                     # Set timeout
-                    db_cursor.execute(f"SET LOCAL statement_timeout = {int(self.sql_timeout_s * 1000)};")
+                    await db_cursor.execute(f"SET LOCAL statement_timeout = {int(self.sql_timeout_s * 1000)};")
 
                     # Execute Stage 2 (fusion) query
-                    db_cursor.execute(
+                    await db_cursor.execute(
                         stage2_sql,
                         {
                             "query_text": query,
@@ -352,43 +456,61 @@ class TwoStageRetriever(BaseRetriever):
                     )
 
                     if db_cursor.description is None:
-                        logger.error("STAGE2: NO RESULT SET. SQL TAIL:\n%s", stage2_sql[-800:])
+                        logger.error("STAGE2: NO RESULT SET")
+                        logger.debug("STAGE2 SQL TAIL:\n%s", stage2_sql[-800:])
                         return []
 
-                    rows = db_cursor.fetchall() 
-
-                    # rows: (source_type, source_uuid, content_chunk, link, combined_score)
-                    chunks_by_url: Dict[str, str] = {}
-                    for row in rows:
-                        content_chunk = row[2]
-                        link = row[3] if len(row) > 3 and row[3] else ""
-                        if link in chunks_by_url:
-                            chunks_by_url[link] += f"\n\n{content_chunk}"
-                        else:
-                            chunks_by_url[link] = content_chunk
-
-                    # Format combined chunks with proper tags for DEFAULT_TEMPLATE
-                    chunks = []
-                    for link, combined_content in chunks_by_url.items():
-                        formatted_chunk = f"<text>{combined_content}</text>"
-                        if link:
-                            formatted_chunk += f"\n<reference><url>{link}</url></reference>"
-                        chunks.append(formatted_chunk)
-
-                    logger.info(f"\n====================================================== Stage 2: Retrieved {len(chunks)} chunk blocks ======================================================")
-                    for i, chunk in enumerate(chunks, 1):
-                        logger.info(f"\n   {i}. {chunk}{"..." if len(chunk) > 120 else ""}")
-
-                    return chunks
+                    rows = await db_cursor.fetchall()
+
+            # rows: (source_type, source_uuid, content_chunk, link, combined_score, sem_score, kw_score, chunk_uuid, chunk_index)
+            return [
+                ScoredChunk(
+                    source_type=row[0],
+                    source_uuid=str(row[1]),
+                    chunk_uuid=str(row[7]),
+                    link=row[3] or "",
+                    content=row[2],
+                    combined_score=float(row[4]),
+                    semantic_score=float(row[5]),
+                    keyword_score=float(row[6]),
+                    chunk_index=row[8],
+                )
+                for row in rows
+            ]
 
         except Exception as e:
             logger.exception(f"Error in Stage 2 chunk retrieval: {e}")
             return []
 
+    def _log_chunk_blocks(self, chunks: List[str]) -> None:
+        logger.info(f"\n====================================================== Stage 2: Retrieved {len(chunks)} chunk blocks ======================================================")
+        if not verbose_logging(logger):
+            return
+        for i, chunk in enumerate(chunks, 1):
+            logger.info(f"\n   {i}. {chunk}{"..." if len(chunk) > 120 else ""}")
+
+    async def _stage2_chunk_retrieval_fusion(
+        self,
+        query: str,
+        query_vector: List[float],
+        document_uuids: List[str],
+        section_uuids: List[str],
+    ) -> List[str]:
+        """
+        Stage 2: Retrieve chunks with authoritative 70/30 fusion (semantic/keyword).
+        Returns formatted chunk blocks:
+          <text>...</text>\n<reference><url>...</url></reference>
+        """
+        chunks = format_chunk_blocks(
+            await self._stage2_scored_chunks(query, query_vector, document_uuids, section_uuids)
+        )
+        self._log_chunk_blocks(chunks)
+        return chunks
+
     # --------------------------------------------
     # Back-compat Stage-2 method (kept, minimal)
     # --------------------------------------------
-    def _stage2_chunk_retrieval(
+    async def _stage2_chunk_retrieval(
         self, 
         query: str, 
         query_vector: List[float], 
@@ -398,7 +520,7 @@ class TwoStageRetriever(BaseRetriever):
         Backward-compatible wrapper that calls the new Stage-2 with only document UUIDs.
         Prefer using _stage2_chunk_retrieval_fusion with both doc & section UUIDs.
         """
-        return self._stage2_chunk_retrieval_fusion(
+        return await self._stage2_chunk_retrieval_fusion(
             query=query,
             query_vector=query_vector,
             document_uuids=document_uuids,
@@ -408,32 +530,145 @@ class TwoStageRetriever(BaseRetriever):
     # --------------
     # Public API
     # --------------
-    def retrieve(self, query: str) -> List[str]:
+    async def aretrieve(
+        self,
+        query: str,
+        query_vector: Optional[List[float]] = None,
+        expansion_task: Optional["asyncio.Future[str]"] = None,
+    ) -> List[str]:
+        """Two-stage retrieval (see aretrieve_scored), formatted as context blocks for the prompt."""
+        chunks = format_chunk_blocks(await self.aretrieve_scored(query, query_vector, expansion_task=expansion_task))
+        self._log_chunk_blocks(chunks)
+        return chunks
+
+    async def aretrieve_scored(
+        self,
+        query: str,
+        query_vector: Optional[List[float]] = None,
+        top_k: Optional[int] = None,
+        expansion_task: Optional["asyncio.Future[str]"] = None,
+    ) -> List[ScoredChunk]:
         """
-        Two-stage retrieval process:
-        1. Extract keywords and enhance query
-        2. Stage 1: Rank-fusion unit filter (documents + sections)
+        Two-stage retrieval process, pipelined by data dependency:
+        1. Start query expansion (LLM) and query embedding at the same time
+        2. Stage 1: the vector arm starts as soon as the embedding lands and the keyword arm
+           as soon as the expansion lands; their candidates are merged by rank fusion
         3. Stage 2: Chunk retrieval with authoritative 70/30 fusion
+
+        The embedding uses the raw query, so it never waits on the expansion round trip.
+        A caller that already started the expansion passes it as `expansion_task`; it is awaited
+        (not cancelled) here, so the caller can reuse its result.
+
+        With the retrieval cache enabled, the final chunk list is looked up as soon as the
+        expansion lands, and each Stage-1 arm reuses cached candidates; all keys carry the
+        corpus version so a database reload invalidates them.
         """
+        top_k = top_k or self.top_k
         retrieval_start = time.time()
         logger.info(f"Starting two-stage retrieval for: {query}")
-        try:
-            # Step 1: Embed query
-            embed_start = time.time()
+        timings: Dict[str, float] = {}
+        normalized_query = normalize_query(query)
+
+        async def _corpus_version() -> Optional[str]:
+            if self.cache is None:
+                return None
+            corpus_version = await self.acorpus_version()
+            self.cache.sync_version(corpus_version)
+            return corpus_version
+
+        async def _expand() -> str:
+            start = time.time()
             #TODO: Research how to enhance query with NER or query expansion
-            # enhanced_query = self.ner_extractor.extract_keywords(query)
-            enhanced_query = self.query_expander.expand_query(query)
+            # enhanced_query = await self.ner_extractor.aextract_keywords(query)
+            with span("expansion"):
+                if expansion_task is not None:
+                    # Shielded: the caller owns the task and may still need its result
+                    enhanced_query = await asyncio.shield(expansion_task)
+                else:
+                    enhanced_query = await self.query_expander.aexpand_query(query)
+            timings["expansion"] = time.time() - start
             logger.info(f"Enhanced query: {enhanced_query}")
+            return enhanced_query
+
+        async def _embed() -> Optional[List[float]]:
+            if query_vector is not None:
+                return query_vector
+            start = time.time()
+            with span("embedding") as attributes:
+                try:
+                    vector = await self._embed_query(query)
+                except Exception as e:
+                    # Degraded mode: retrieve with the keyword arms only
+                    logger.warning(f"Query embedding failed; keyword-only retrieval: {e}")
+                    self.keyword_only_retrievals.inc()
+                    attributes["degraded"] = True
+                    vector = None
+            timings["embedding"] = time.time() - start
+            return vector
+
+        expansion_task = asyncio.create_task(_expand())
+        embedding_task = asyncio.create_task(_embed())
+        version_task = asyncio.create_task(_corpus_version())
+
+        async def _vector_arm() -> List[Tuple[Any, ...]]:
+            corpus_version = await version_task
+            cache_key = (corpus_version, normalized_query, self.embedding_model)
+            if corpus_version is not None:
+                rows = self.cache.stage1_vector.get(cache_key)
+                if rows is not None:
+                    return rows
+            vector = await embedding_task
+            if vector is None:
+                return []
+            start = time.time()
+            with span("stage1_vector") as attributes:
+                rows = await self._stage1_vector_candidates(vector)
+                attributes["rows"] = len(rows)
+            timings["stage1_vector"] = time.time() - start
+            if corpus_version is not None and rows:
+                self.cache.stage1_vector.put(cache_key, rows)
+            return rows
+
+        async def _keyword_arm() -> List[Tuple[Any, ...]]:
+            enhanced_query = await expansion_task
+            corpus_version = await version_task
+            cache_key = (corpus_version, enhanced_query)
+            if corpus_version is not None:
+                rows = self.cache.stage1_keyword.get(cache_key)
+                if rows is not None:
+                    return rows
+            start = time.time()
+            with span("stage1_keyword") as attributes:
+                rows = await self._stage1_keyword_candidates(enhanced_query)
+                attributes["rows"] = len(rows)
+            timings["stage1_keyword"] = time.time() - start
+            if corpus_version is not None and rows:
+                self.cache.stage1_keyword.put(cache_key, rows)
+            return rows
+
+        vector_arm_task = asyncio.create_task(_vector_arm())
+        keyword_arm_task = asyncio.create_task(_keyword_arm())
+        pipeline_tasks = (expansion_task, embedding_task, version_task, vector_arm_task, keyword_arm_task)
 
-            query_vector = self._embed_query(query)
-            embed_time = time.time() - embed_start
-
-            # Step 2: Stage 1 - Rank fusion (documents + sections)
-            stage1_start = time.time()
-            doc_units, sec_units = self._stage1_unit_filter(
-                enhanced_query, query_vector, include_docs=True, include_sections=True, cap_units=75
+        try:
+            # Final-result cache: only needs the expansion, while the vector arm keeps running meanwhile
+            enhanced_query = await expansion_task
+            corpus_version = await version_task
+            chunks_key = (
+                corpus_version, normalized_query, enhanced_query, self.embedding_model,
+                top_k, self.vector_weight, self.keyword_weight,
             )
-            stage1_time = time.time() - stage1_start
+            if corpus_version is not None:
+                cached_chunks = self.cache.chunks.get(chunks_key)
+                if cached_chunks is not None:
+                    logger.info(f"Retrieval cache hit ({len(cached_chunks)} chunks) in {time.time() - retrieval_start:.3f}s")
+                    return cached_chunks
+
+            # Step 1 + 2: expansion/embedding feed the two Stage-1 arms as they complete
+            vector_rows, keyword_rows = await asyncio.gather(vector_arm_task, keyword_arm_task)
+            stage1_done = time.time() - retrieval_start
+
+            doc_units, sec_units = self._stage1_merge_units(vector_rows + keyword_rows, cap_units=75)
 
             if not doc_units and not sec_units:
                 logger.warning("No units found in Stage 1")
@@ -445,20 +680,29 @@ class TwoStageRetriever(BaseRetriever):
 
             # Step 3: Stage 2 - Chunk retrieval with 70/30 fusion
             stage2_start = time.time()
-            chunks = self._stage2_chunk_retrieval_fusion(
-                enhanced_query, query_vector, document_uuids, section_uuids
-            )
+            stage2_vector = await embedding_task
+            with span("stage2", units=len(document_uuids) + len(section_uuids)) as attributes:
+                chunks = await self._stage2_scored_chunks(
+                    # A zero vector is equidistant from every chunk, so all semantic scores are 0
+                    enhanced_query, stage2_vector or _ZERO_VECTOR, document_uuids, section_uuids, top_k
+                )
+                attributes["chunks"] = len(chunks)
             stage2_time = time.time() - stage2_start
+            # Degraded (keyword-only) results are not cached under the query's normal key
+            if corpus_version is not None and chunks and stage2_vector is not None:
+                self.cache.chunks.put(chunks_key, chunks)
 
-            # Log retrieval latency
+            # Log retrieval latency (expansion/embedding and the Stage-1 arms overlap, so they don't sum to the total)
             total_time = time.time() - retrieval_start
             logger.info("")
             logger.info("=" * 60 + " Retrieval Latency " + "=" * 60)
             logger.info(f"Total Retrieval Time: {total_time:.3f}s")
-            logger.info(f"  - Embedding:        {embed_time:.3f}s ({embed_time/total_time*100:.1f}%)")
-            logger.info(f"  - Stage 1 (Filter): {stage1_time:.3f}s ({stage1_time/total_time*100:.1f}%)")
-            logger.info(f"  - Stage 2 (Chunks): {stage2_time:.3f}s ({stage2_time/total_time*100:.1f}%)")
-            logger.info(f"  - Other:            {total_time - embed_time - stage1_time - stage2_time:.3f}s")
+            logger.info(f"  - Query Expansion:     {timings.get('expansion', 0.0):.3f}s (concurrent with embedding)")
+            logger.info(f"  - Embedding:           {timings.get('embedding', 0.0):.3f}s")
+            logger.info(f"  - Stage 1 vector arm:  {timings.get('stage1_vector', 0.0):.3f}s (starts after embedding)")
+            logger.info(f"  - Stage 1 keyword arm: {timings.get('stage1_keyword', 0.0):.3f}s (starts after expansion)")
+            logger.info(f"  - Stage 1 complete at: {stage1_done:.3f}s ({stage1_done/total_time*100:.1f}%)")
+            logger.info(f"  - Stage 2 (Chunks):    {stage2_time:.3f}s ({stage2_time/total_time*100:.1f}%)")
             logger.info("=" * 140)
             logger.info("")
 
@@ -467,8 +711,8 @@ class TwoStageRetriever(BaseRetriever):
         except Exception as e:
             logger.error(f"Error in two-stage retrieval: {e}")
             return []
-
-    def __del__(self):
-        """Clean up connection pool when object is destroyed."""
-        if hasattr(self, "pool"):
-            self.pool.close()
+        finally:
+            # Don't leave pipeline stages running if one of them failed or we were cancelled
+            for task in pipeline_tasks:
+                if not task.done():
+                    task.cancel()
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+from typing import Dict
+
+from rag_agent.core.config import settings
+from rag_agent.core.model_client import get_model_client, ModelConfig, ModelType
+from rag_agent.services.context_budget import get_tokenizer
+from rag_agent.services.intent_router import get_intent_router
+from rag_agent.services.retriever.base_retriever import BaseRetriever
+from rag_agent.services.retriever.sql_loader import preload_sql
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupFailed(Exception):
+    """A required warmup step failed (or warmup timed out); the worker must not report ready."""
+
+
+async def _step(name: str, timings: Dict[str, float], coro, required: bool = False) -> None:
+    """
+    Run one warmup step. A failing optional step is logged and skipped; a failing required
+    step raises WarmupFailed, which keeps /ready at 503.
+    """
+    start = time.time()
+    try:
+        await coro
+    except Exception as e:
+        if required:
+            raise WarmupFailed(f"Warmup step '{name}' failed: {e}") from e
+        logger.warning(f"Warmup step '{name}' failed: {e}")
+    finally:
+        timings[name] = round(time.time() - start, 3)
+
+
+async def _build_clients() -> None:
+    get_model_client(ModelConfig(model_type=ModelType.QUERY, model_name=settings.QUERY_MODEL, streaming=True))
+    get_model_client(ModelConfig(model_type=ModelType.EMBEDDING, model_name=settings.EMBEDDING_MODEL))
+
+
+async def _load_sql() -> None:
+    preload_sql()
+
+
+async def _load_tokenizer() -> None:
+    # OpenAIEmbeddings tokenizes inputs with tiktoken, and so does the context budgeter;
+    # loading an encoding can mean a download
+    import tiktoken
+    await asyncio.to_thread(tiktoken.encoding_for_model, settings.EMBEDDING_MODEL)
+    await asyncio.to_thread(get_tokenizer, settings.QUERY_MODEL)
+
+
+async def _probe(retriever: BaseRetriever) -> None:
+    chunks = await retriever.aretrieve(settings.WARMUP_PROBE_QUERY)
+    # Retrievers log and swallow database errors, so a broken pool shows up as an empty result
+    if not chunks:
+        raise RuntimeError("probe query returned no chunks")
+    logger.info(f"Warmup probe query returned {len(chunks)} chunk blocks")
+
+
+async def warmup(retriever: BaseRetriever) -> Dict[str, float]:
+    """
+    Pay the first-request costs before taking traffic:
+      1. build the generation and embedding clients (get_model_client caches them)
+      2. read every SQL file
+      3. load the tiktoken encoding
+      4. embed the intent router exemplars
+      5. pg_prewarm the HNSW/BM25 indexes
+      6. run a probe query end to end (embedding, Stage 1 and Stage 2 on warm connections)
+    The retriever's pool is already open with `min_size` connections (RetrieverRegistry.open).
+    Steps 1, 2 and 6 are required (WarmupFailed if they fail); the others only make the first
+    requests faster and are skipped on failure. Returns seconds per step.
+    """
+    warmup_start = time.time()
+    timings: Dict[str, float] = {}
+    await _step("clients", timings, _build_clients(), required=True)
+    await _step("sql", timings, _load_sql(), required=True)
+    await _step("tokenizer", timings, _load_tokenizer())
+    if settings.INTENT_ROUTER_ENABLED:
+        await _step("intent_exemplars", timings, get_intent_router().aload())
+    if settings.WARMUP_PREWARM_ENABLED:
+        await _step("prewarm", timings, retriever.aprewarm())
+    await _step("probe", timings, _probe(retriever), required=True)
+    logger.info(f"Warmup finished in {time.time() - warmup_start:.3f}s: {timings}")
+    return timings
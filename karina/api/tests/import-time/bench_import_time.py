@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Import-time regression benchmark for the API package.
+
+Each module is imported in a fresh interpreter with `python -X importtime`; the best of
+--runs cumulative times is compared against its budget. Modules that must stay lazy
+(provider SDKs, database drivers, unused backends) are reported if an import pulls them in.
+Exits 1 on any violation.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+SRC_DIR = Path(__file__).parent.parent.parent / "src"
+
+# Cumulative import time budget per entry point, in milliseconds
+BUDGETS_MS: Dict[str, int] = {
+    "rag_agent.core.config": 400,
+    "rag_agent.services.rag": 600,
+    "rag_agent.app": 1200,
+    "rag_agent.__main__": 1200,
+}
+
+# Loaded on first use (clients, retrievers) or only by optional extras; never at import time
+LAZY_MODULES: Set[str] = {
+    "langchain_openai",
+    "openai",
+    "tiktoken",
+    "psycopg",
+    "psycopg_pool",
+    "pinecone",
+    "langchain_pinecone",
+    "nltk",
+    "rank_bm25",
+}
+
+
+def import_profile(module: str) -> Tuple[float, Dict[str, float]]:
+    """Return (cumulative ms of `module`, {imported module: cumulative ms}) from -X importtime."""
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    imported: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        imported[name.strip()] = int(cumulative_us) / 1000
+    return imported.get(module, 0.0), imported
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS_MS), help="Modules to check (default: all budgeted)")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module; the fastest run counts")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to show per module")
+    args = parser.parse_args(argv)
+
+    violations = 0
+    for module in args.modules:
+        profiles = [import_profile(module) for _ in range(args.runs)]
+        total_ms, imported = min(profiles, key=lambda profile: profile[0])
+        budget_ms = BUDGETS_MS.get(module)
+        over_budget = budget_ms is not None and total_ms > budget_ms
+        eager = sorted(name for name in imported if name.split(".")[0] in LAZY_MODULES and "." not in name)
+
+        status = "✗" if over_budget or eager else "✓"
+        print(f"\n{status} {module}: {total_ms:.0f} ms (budget {budget_ms if budget_ms is not None else '-'} ms)")
+        for name, cumulative_ms in sorted(imported.items(), key=lambda item: -item[1])[1:args.top + 1]:
+            print(f"    {cumulative_ms:8.1f} ms  {name}")
+        if eager:
+            print(f"    eagerly imported: {', '.join(eager)}")
+        violations += over_budget + bool(eager)
+
+    print(f"\n{'All import budgets met' if not violations else f'{violations} import-time violation(s)'}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
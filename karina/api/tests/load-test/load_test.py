@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Load-test driver for POST /rag/query (NDJSON streaming).
+
+Ramps through a list of concurrency levels; at each level that many clients send queries
+back to back for --step-duration seconds. Per level it reports throughput (completed
+requests/s), rejections (429/503) and errors, client-side TTFT (first token event) and total
+latency, and p50/p95/p99 of every server stage from the `timings` of the `end` event.
+
+Results can be saved as a named baseline (baselines/<name>.json) and later runs compared
+against it; the comparison exits 1 when a metric regressed by more than --tolerance.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+HERE = Path(__file__).parent
+BASELINE_DIR = HERE / "baselines"
+PERCENTILES = (50, 95, 99)
+# Compared against baselines: (metric path, True if higher is better)
+COMPARED_METRICS = [
+    ("rps", True),
+    ("ttft_ms.p50", False),
+    ("ttft_ms.p95", False),
+    ("ttft_ms.p99", False),
+    ("latency_ms.p95", False),
+    ("latency_ms.p99", False),
+]
+
+
+@dataclass
+class RequestResult:
+    status: int
+    ttft_s: Optional[float] = None
+    latency_s: float = 0.0
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200 and self.error is None
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {f"p{q}": 0.0 for q in PERCENTILES}
+    ordered = sorted(values)
+    return {
+        f"p{q}": round(ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))], 1)
+        for q in PERCENTILES
+    }
+
+
+async def send_query(client: httpx.AsyncClient, query: str, request_id: str) -> RequestResult:
+    start = time.perf_counter()
+    try:
+        async with client.stream("POST", "/rag/query", json={"query": query}, headers={"x-request-id": request_id}) as response:
+            if response.status_code != 200:
+                await response.aread()
+                return RequestResult(status=response.status_code, latency_s=time.perf_counter() - start)
+            result = RequestResult(status=200)
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                event = json.loads(line)
+                kind = event.get("event")
+                if kind == "token" and result.ttft_s is None:
+                    result.ttft_s = time.perf_counter() - start
+                elif kind == "end":
+                    result.timings = event.get("timings") or {}
+                elif kind == "error":
+                    result.error = f"{event.get('type')}: {event.get('error')}"
+            result.latency_s = time.perf_counter() - start
+            return result
+    except httpx.HTTPError as e:
+        return RequestResult(status=0, latency_s=time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+
+
+async def run_step(
+    client: httpx.AsyncClient,
+    queries: List[str],
+    concurrency: int,
+    duration_s: float,
+    unique: bool,
+    counter: "itertools.count[int]",
+) -> Dict[str, Any]:
+    results: List[RequestResult] = []
+    deadline = time.perf_counter() + duration_s
+
+    async def _client() -> None:
+        while time.perf_counter() < deadline:
+            n = next(counter)
+            query = queries[n % len(queries)]
+            if unique:
+                # Defeats the expansion/embedding/retrieval/answer caches
+                query = f"{query} (load test #{n})"
+            results.append(await send_query(client, query, f"lt-{concurrency}-{n}"))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_client() for _ in range(concurrency)))
+    elapsed_s = time.perf_counter() - start
+
+    ok = [r for r in results if r.ok]
+    stage_names = sorted({name for r in ok for name in r.timings})
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed_s, 2),
+        "requests": len(results),
+        "ok": len(ok),
+        "rejected": sum(1 for r in results if r.status in (429, 503)),
+        "errors": sum(1 for r in results if not r.ok and r.status not in (429, 503)),
+        "rps": round(len(ok) / elapsed_s, 2) if elapsed_s else 0.0,
+        "ttft_ms": percentiles([r.ttft_s * 1000 for r in ok if r.ttft_s is not None]),
+        "latency_ms": percentiles([r.latency_s * 1000 for r in ok]),
+        "stages_ms": {
+            name: percentiles([r.timings[name] for r in ok if name in r.timings]) for name in stage_names
+        },
+        "sample_errors": sorted({r.error or f"HTTP {r.status}" for r in results if not r.ok})[:5],
+    }
+
+
+def print_step(step: Dict[str, Any]) -> None:
+    ttft, latency = step["ttft_ms"], step["latency_ms"]
+    print(
+        f"c={step['concurrency']:<4} rps {step['rps']:7.2f}  ok {step['ok']:5d}  rejected {step['rejected']:4d}  "
+        f"errors {step['errors']:4d}  ttft p50/p95/p99 {ttft['p50']:7.1f}/{ttft['p95']:7.1f}/{ttft['p99']:7.1f} ms  "
+        f"total p50/p95/p99 {latency['p50']:7.1f}/{latency['p95']:7.1f}/{latency['p99']:7.1f} ms"
+    )
+    for name, stats in step["stages_ms"].items():
+        print(f"    {name:<16} p50 {stats['p50']:8.1f}  p95 {stats['p95']:8.1f}  p99 {stats['p99']:8.1f} ms")
+    for error in step["sample_errors"]:
+        print(f"    error: {error}")
+
+
+def _metric(step: Dict[str, Any], path: str) -> float:
+    value: Any = step
+    for key in path.split("."):
+        value = value[key]
+    return float(value)
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regressions of `results` against `baseline`, per concurrency level present in both."""
+    baseline_steps = {step["concurrency"]: step for step in baseline["steps"]}
+    regressions: List[str] = []
+    print(f"\nComparison with baseline '{baseline['name']}' (tolerance {tolerance:.0%})")
+    for step in results["steps"]:
+        base = baseline_steps.get(step["concurrency"])
+        if base is None:
+            continue
+        for path, higher_is_better in COMPARED_METRICS:
+            current, previous = _metric(step, path), _metric(base, path)
+            if previous == 0:
+                continue
+            change = (current - previous) / previous
+            regressed = change < -tolerance if higher_is_better else change > tolerance
+            marker = "REGRESSION" if regressed else ""
+            print(f"c={step['concurrency']:<4} {path:<16} {previous:9.1f} -> {current:9.1f} ({change:+.1%}) {marker}")
+            if regressed:
+                regressions.append(f"c={step['concurrency']} {path}: {previous:.1f} -> {current:.1f} ({change:+.1%})")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    queries = [line.strip() for line in args.queries.read_text(encoding="utf-8").splitlines() if line.strip()]
+    levels = [int(level) for level in args.concurrency.split(",")]
+    counter = itertools.count()
+    limits = httpx.Limits(max_connections=max(levels) + 4, max_keepalive_connections=max(levels) + 4)
+    async with httpx.AsyncClient(
+        base_url=args.url,
+        headers={"X-API-KEY": args.api_key},
+        timeout=httpx.Timeout(args.request_timeout_s),
+        limits=limits,
+    ) as client:
+        if args.warmup:
+            print(f"Warmup: {args.warmup} requests")
+            for _ in range(args.warmup):
+                await send_query(client, queries[next(counter) % len(queries)], "lt-warmup")
+
+        steps = []
+        for level in levels:
+            step = await run_step(client, queries, level, args.step_duration, args.unique, counter)
+            print_step(step)
+            steps.append(step)
+
+        try:
+            server_metrics = (await client.get("/rag/metrics")).json()
+        except (httpx.HTTPError, ValueError):
+            server_metrics = None
+
+    return {
+        "name": args.save_baseline,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {
+            "url": args.url,
+            "concurrency": levels,
+            "step_duration_s": args.step_duration,
+            "unique": args.unique,
+            "queries": len(queries),
+        },
+        "steps": steps,
+        "server_metrics": server_metrics,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--api-key", required=True, help="the API's CSHA_BACKEND_API_KEY")
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="comma-separated ramp of concurrent clients")
+    parser.add_argument("--step-duration", type=float, default=30.0, help="seconds per concurrency level")
+    parser.add_argument("--queries", type=Path, default=HERE / "queries.txt")
+    parser.add_argument("--unique", action="store_true", help="make every query unique so no cache answers it")
+    parser.add_argument("--warmup", type=int, default=5, help="sequential requests before the ramp")
+    parser.add_argument("--request-timeout-s", type=float, default=120.0)
+    parser.add_argument("--output", type=Path, help="also write the results JSON here")
+    parser.add_argument("--save-baseline", metavar="NAME", help="save the results as baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="compare against baselines/NAME.json")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        baseline_path = BASELINE_DIR / f"{args.save_baseline}.json"
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f"\nSaved baseline {baseline_path}")
+    if args.compare:
+        baseline = json.loads((BASELINE_DIR / f"{args.compare}.json").read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s):")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
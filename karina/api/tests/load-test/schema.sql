@@ -0,0 +1,94 @@
+-- Load-test fixture schema — the tables and indexes the two-stage retriever reads (prod.*)
+-- Requires ParadeDB (pg_search: bm25 indexes, ||| and paradedb.score) and pgvector.
+-- vector(3072) columns have no HNSW index (pgvector indexes at most 2000 dimensions);
+-- the fixture corpus is small enough for exact scans.
+
+CREATE EXTENSION IF NOT EXISTS vector;
+CREATE EXTENSION IF NOT EXISTS pg_search;
+CREATE EXTENSION IF NOT EXISTS pg_prewarm;
+
+CREATE SCHEMA IF NOT EXISTS prod;
+
+-- ---------------------------
+-- Documents (web pages)
+-- ---------------------------
+CREATE TABLE IF NOT EXISTS prod.documents (
+  document_uuid        uuid PRIMARY KEY,
+  document_parent_uuid uuid,
+  page_id              integer,
+  title                text,
+  link                 text,
+  content              text,
+  excerpt              text,
+  slug                 text,
+  status               text,
+  modified             timestamp
+);
+
+CREATE TABLE IF NOT EXISTS prod.document_chunks (
+  chunk_uuid    uuid PRIMARY KEY,
+  document_uuid uuid NOT NULL REFERENCES prod.documents (document_uuid) ON DELETE CASCADE,
+  chunk_index   integer NOT NULL,
+  content_chunk text NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS prod.document_excerpt_embeddings_3072 (
+  document_uuid uuid NOT NULL REFERENCES prod.documents (document_uuid) ON DELETE CASCADE,
+  model_name    text NOT NULL,
+  embedding     vector(3072) NOT NULL,
+  PRIMARY KEY (document_uuid, model_name)
+);
+
+CREATE TABLE IF NOT EXISTS prod.document_chunks_embedding_3072 (
+  chunk_uuid uuid NOT NULL REFERENCES prod.document_chunks (chunk_uuid) ON DELETE CASCADE,
+  model_name text NOT NULL,
+  embedding  vector(3072) NOT NULL,
+  PRIMARY KEY (chunk_uuid, model_name)
+);
+
+-- ---------------------------
+-- Sections (PDF headings); the staged website data has none, so these stay empty
+-- ---------------------------
+CREATE TABLE IF NOT EXISTS prod.sections (
+  section_uuid uuid PRIMARY KEY,
+  title        text,
+  link         text,
+  content      text,
+  excerpt      text
+);
+
+CREATE TABLE IF NOT EXISTS prod.section_chunks (
+  chunk_uuid    uuid PRIMARY KEY,
+  section_uuid  uuid NOT NULL REFERENCES prod.sections (section_uuid) ON DELETE CASCADE,
+  chunk_index   integer NOT NULL,
+  content_chunk text NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS prod.section_excerpt_embedding_3072 (
+  section_uuid uuid NOT NULL REFERENCES prod.sections (section_uuid) ON DELETE CASCADE,
+  model_name   text NOT NULL,
+  embedding    vector(3072) NOT NULL,
+  PRIMARY KEY (section_uuid, model_name)
+);
+
+CREATE TABLE IF NOT EXISTS prod.section_chunks_embedding_3072 (
+  chunk_uuid uuid NOT NULL REFERENCES prod.section_chunks (chunk_uuid) ON DELETE CASCADE,
+  model_name text NOT NULL,
+  embedding  vector(3072) NOT NULL,
+  PRIMARY KEY (chunk_uuid, model_name)
+);
+
+-- ---------------------------
+-- BM25 (ParadeDB) indexes for the keyword arms
+-- ---------------------------
+CREATE INDEX IF NOT EXISTS documents_bm25 ON prod.documents
+  USING bm25 (document_uuid, title, excerpt, content) WITH (key_field = 'document_uuid');
+CREATE INDEX IF NOT EXISTS document_chunks_bm25 ON prod.document_chunks
+  USING bm25 (chunk_uuid, content_chunk, document_uuid) WITH (key_field = 'chunk_uuid');
+CREATE INDEX IF NOT EXISTS sections_bm25 ON prod.sections
+  USING bm25 (section_uuid, title, excerpt, content) WITH (key_field = 'section_uuid');
+CREATE INDEX IF NOT EXISTS section_chunks_bm25 ON prod.section_chunks
+  USING bm25 (chunk_uuid, content_chunk, section_uuid) WITH (key_field = 'chunk_uuid');
+
+CREATE INDEX IF NOT EXISTS document_chunks_document_uuid ON prod.document_chunks (document_uuid, chunk_index);
+CREATE INDEX IF NOT EXISTS section_chunks_section_uuid ON prod.section_chunks (section_uuid, chunk_index);
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Checks of the rule-based LocalQueryExpander (no model calls, no database).
+
+Runs standalone or under pytest:
+    python tests/query-expander-test/test_local_query_expander.py
+"""
+import sys
+from pathlib import Path
+
+# Add parent directories to path to import rag_agent
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from rag_agent.services.local_query_expander import LocalQueryExpander
+
+SBHC_EXPANSION = "school-based OR health OR center OR SBHC"
+
+
+def test_uppercase_acronym():
+    assert LocalQueryExpander().expand("What is an SBHC?").expanded_query == SBHC_EXPANSION
+
+
+def test_lowercase_acronym():
+    expander = LocalQueryExpander()
+    assert expander.expand("what is an sbhc").expanded_query == SBHC_EXPANSION
+    assert expander.expand("lcff funding").expanded_query == "local OR control OR funding OR formula OR LCFF"
+
+
+def test_plural_acronym():
+    expander = LocalQueryExpander()
+    assert expander.expand("how many sbhcs are there").expanded_query == SBHC_EXPANSION
+    assert expander.expand("Where are the SBHCs?").expanded_query == SBHC_EXPANSION
+
+
+def test_unknown_acronym_falls_back():
+    expansion = LocalQueryExpander().expand("Who is the ED of CSHA?")
+    assert expansion.expanded_query is None
+    assert expansion.unknown_terms == ["ED"]
+
+
+def test_stopwords_only_returns_raw_query():
+    assert LocalQueryExpander().expand("what is it").expanded_query == "what is it"
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith("test_")]
+    for name, fn in tests:
+        fn()
+        print(f"✓ {name}")
+    print(f"\n{len(tests)} checks passed")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Resilience benchmark for upstream model calls, against the local fake provider.
+
+Starts fake_provider.py, points the agent at it and runs three scenarios:
+  tail       embedding latency percentiles with a slow tail, hedging off vs on
+  outage     every call fails: the circuit opens, calls short-circuit, a probe closes it again
+  expansion  query expansion under an outage degrades to the raw query within its deadline
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+HERE = Path(__file__).parent
+SRC_DIR = HERE.parent.parent / "src"
+
+
+def _configure_fake(base_url: str, **config) -> None:
+    request = urllib.request.Request(
+        f"{base_url}/_fake/config", data=json.dumps(config).encode(), method="POST",
+        headers={"Content-Type": "application/json"},
+    )
+    urllib.request.urlopen(request).read()
+
+
+def _wait_until_up(base_url: str, timeout_s: float = 15.0) -> None:
+    deadline = time.time() + timeout_s
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"{base_url}/_fake/config").read()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("fake provider did not start")
+
+
+def _percentiles(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * (len(ordered) - 1)))]
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": ordered[-1]}
+
+
+def _embedding_client():
+    from rag_agent.core.config import settings
+    from rag_agent.core.model_client import get_model_client, ModelConfig, ModelType
+
+    client = get_model_client(ModelConfig(model_type=ModelType.EMBEDDING, model_name=settings.EMBEDDING_MODEL))
+    # Inputs here are short; skip the SDK's client-side tiktoken pass so timings are transport only
+    client.client.check_embedding_ctx_length = False
+    return client
+
+
+async def _embed_many(client, texts: List[str], concurrency: int) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def _one(text: str) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await client.aembed_query(text)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(_one(text) for text in texts))
+    return latencies
+
+
+async def scenario_tail(base_url: str, calls: int, concurrency: int) -> None:
+    from rag_agent.core import metrics
+    from rag_agent.core.resilience import get_resilience_policy
+
+    client = _embedding_client()
+    policy = get_resilience_policy("embedding")
+    _configure_fake(base_url, error_rate=0.0, tail_rate=0.05, tail_ms=1500.0)
+
+    # Warm the latency window so the hedge delay (p95 of recent attempts) is known
+    await _embed_many(client, [f"warmup {i}" for i in range(100)], concurrency)
+
+    print(f"\n== tail: {calls} embedding calls, 5% of them +1500 ms ==")
+    for hedge in (False, True):
+        policy.hedge = hedge
+        hedges_before = policy.hedges.value
+        latencies = await _embed_many(client, [f"tail {hedge} {i}" for i in range(calls)], concurrency)
+        stats = _percentiles(latencies)
+        print(
+            f"hedging {'on ' if hedge else 'off'}: "
+            + "  ".join(f"{name} {value * 1000:7.1f} ms" for name, value in stats.items())
+            + f"  hedges {policy.hedges.value - hedges_before}"
+        )
+    print(f"hedge delay now {policy.hedge_delay() * 1000:.1f} ms; hedge wins {policy.hedge_wins.value}")
+    print(json.dumps({k: v for k, v in metrics.snapshot()["counters"].items() if k.startswith("resilience.embedding")}, indent=2))
+
+
+async def scenario_outage(base_url: str) -> None:
+    from rag_agent.core.resilience import UpstreamUnavailable, get_resilience_policy
+
+    client = _embedding_client()
+    policy = get_resilience_policy("embedding")
+    _configure_fake(base_url, error_rate=1.0, tail_rate=0.0)
+
+    print(f"\n== outage: every call fails (breaker threshold {policy.breaker.failure_threshold}) ==")
+    for i in range(policy.breaker.failure_threshold + 3):
+        start = time.perf_counter()
+        try:
+            await client.aembed_query(f"outage {i}")
+            outcome = "ok"
+        except UpstreamUnavailable as e:
+            outcome = f"degraded ({e})"
+        except Exception as e:
+            outcome = f"failed ({type(e).__name__})"
+        print(f"call {i}: {outcome:<55} {(time.perf_counter() - start) * 1000:7.1f} ms  circuit {policy.breaker.state}")
+
+    _configure_fake(base_url, error_rate=0.0)
+    print(f"provider recovered; waiting {policy.breaker.reset_timeout_s}s for the probe")
+    await asyncio.sleep(policy.breaker.reset_timeout_s)
+    await client.aembed_query("probe")
+    print(f"probe succeeded; circuit {policy.breaker.state}")
+
+
+async def scenario_expansion(base_url: str) -> None:
+    from rag_agent.services.query_expander import QueryExpander
+
+    expander = QueryExpander(use_local=False)
+    expander.cache = None
+    _configure_fake(base_url, error_rate=0.0, tail_rate=1.0, tail_ms=30_000.0)
+
+    print("\n== expansion: provider hangs for 30 s ==")
+    start = time.perf_counter()
+    expanded = await expander.aexpand_query("What does CSHA do for SBHC funding?")
+    print(f"expanded to {expanded!r} in {(time.perf_counter() - start) * 1000:.1f} ms")
+    _configure_fake(base_url, tail_rate=0.0)
+
+
+async def run(base_url: str, scenarios: List[str], calls: int, concurrency: int) -> None:
+    if "tail" in scenarios:
+        await scenario_tail(base_url, calls, concurrency)
+    if "outage" in scenarios:
+        await scenario_outage(base_url)
+    if "expansion" in scenarios:
+        await scenario_expansion(base_url)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenarios", nargs="*", default=["tail", "outage", "expansion"])
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    # Must be set before rag_agent reads its settings
+    os.environ.update({
+        "CSHA_OPENAI_BASE_URL": f"{base_url}/v1",
+        "CSHA_EMBEDDING_CACHE_ENABLED": "false",
+        "CSHA_EXPANSION_CACHE_ENABLED": "false",
+        "CSHA_RESILIENCE_BREAKER_RESET_S": os.environ.get("CSHA_RESILIENCE_BREAKER_RESET_S", "2"),
+    })
+    sys.path.insert(0, str(SRC_DIR))
+
+    provider = subprocess.Popen([sys.executable, str(HERE / "fake_provider.py"), "--port", str(args.port)])
+    try:
+        _wait_until_up(base_url)
+        asyncio.run(run(base_url, args.scenarios, args.calls, args.concurrency))
+    finally:
+        provider.terminate()
+        provider.wait()
+
+
+if __name__ == "__main__":
+    main()
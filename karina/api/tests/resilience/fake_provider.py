@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI-compatible fake provider with injectable latency and errors.
+
+Serves the endpoints the agent calls (embeddings, chat completions with and without
+streaming, model lookup for keep-warm pings). Embeddings and non-streaming completions
+(short, query-expansion sized answers) take `latency_ms`; streaming completions send their
+first token after `ttft_ms`, then `completion_tokens` tokens at `tokens_per_s`. On top of
+that, a `tail_rate` share of requests is delayed by `tail_ms` and an `error_rate` share
+fails with `error_status`. Point the agent at it with CSHA_OPENAI_BASE_URL.
+
+The fault settings can be changed while it runs:
+    curl -X POST localhost:8900/_fake/config -d '{"error_rate": 1.0}'
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+DEFAULT_DIMENSIONS = 3072
+
+fault_config: Dict[str, Any] = {
+    "latency_ms": 40.0,
+    "ttft_ms": 300.0,
+    "tokens_per_s": 80.0,
+    "completion_tokens": 120,
+    "jitter_ms": 10.0,
+    "tail_rate": 0.0,
+    "tail_ms": 2000.0,
+    "error_rate": 0.0,
+    "error_status": 503,
+}
+counts: Dict[str, int] = {"requests": 0, "errors": 0, "tails": 0}
+
+app = FastAPI(title="fake-openai")
+
+
+async def _inject_faults(base_ms: float) -> JSONResponse | None:
+    counts["requests"] += 1
+    delay_ms = base_ms + random.uniform(0, fault_config["jitter_ms"])
+    if random.random() < fault_config["tail_rate"]:
+        counts["tails"] += 1
+        delay_ms += fault_config["tail_ms"]
+    await asyncio.sleep(delay_ms / 1000)
+    if random.random() < fault_config["error_rate"]:
+        counts["errors"] += 1
+        return JSONResponse(
+            {"error": {"message": "injected failure", "type": "server_error"}},
+            status_code=fault_config["error_status"],
+        )
+    return None
+
+
+def fake_embedding(text: str, dimensions: int) -> np.ndarray:
+    """Deterministic unit vector per text (identical texts get identical vectors)."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dimensions).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    body = await request.json()
+    failure = await _inject_faults(fault_config["latency_ms"])
+    if failure is not None:
+        return failure
+    inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+    dimensions = body.get("dimensions") or DEFAULT_DIMENSIONS
+    data = []
+    for index, text in enumerate(inputs):
+        # The SDK sends token ids when it splits long inputs; any stable string works here
+        vector = fake_embedding(text if isinstance(text, str) else json.dumps(text), dimensions)
+        if body.get("encoding_format") == "base64":
+            embedding: Any = base64.b64encode(vector.tobytes()).decode("ascii")
+        else:
+            embedding = vector.tolist()
+        data.append({"object": "embedding", "index": index, "embedding": embedding})
+    return {
+        "object": "list",
+        "data": data,
+        "model": body.get("model"),
+        "usage": {"prompt_tokens": len(inputs), "total_tokens": len(inputs)},
+    }
+
+
+_ANSWER_WORDS = (
+    "School-based health centers provide primary care, mental health, dental and vision services "
+    "to students on campus, often in partnership with community clinics and school districts."
+).split()
+
+
+def _answer_tokens(messages: Any, count: int) -> List[str]:
+    """`count` tokens (words with their trailing space) of a deterministic answer per prompt."""
+    prompt = messages if isinstance(messages, str) else json.dumps(messages)
+    offset = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8], 16)
+    return [_ANSWER_WORDS[(offset + i) % len(_ANSWER_WORDS)] + " " for i in range(count)]
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stream = bool(body.get("stream"))
+    failure = await _inject_faults(fault_config["ttft_ms"] if stream else fault_config["latency_ms"])
+    if failure is not None:
+        return failure
+    # Non-streaming calls are query expansions; keep those short like the real ones
+    tokens = _answer_tokens(body.get("messages"), int(fault_config["completion_tokens"]) if stream else 8)
+    created = int(time.time())
+    model = body.get("model")
+
+    if not stream:
+        answer = "".join(tokens).strip()
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": answer}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 100, "completion_tokens": len(tokens), "total_tokens": 100 + len(tokens)},
+        }
+
+    async def _stream():
+        interval_s = 1 / fault_config["tokens_per_s"] if fault_config["tokens_per_s"] > 0 else 0.0
+        for index, token in enumerate(tokens):
+            if index:
+                await asyncio.sleep(interval_s)
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        done = {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        }
+        yield f"data: {json.dumps(done)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(_stream(), media_type="text/event-stream")
+
+
+@app.get("/v1/models/{model}")
+async def get_model(model: str):
+    return {"id": model, "object": "model", "created": 0, "owned_by": "fake"}
+
+
+@app.get("/_fake/config")
+async def get_config():
+    return {"config": fault_config, "counts": counts}
+
+
+@app.post("/_fake/config")
+async def set_config(request: Request):
+    update = await request.json()
+    unknown = set(update) - set(fault_config)
+    if unknown:
+        return JSONResponse({"error": f"unknown settings {sorted(unknown)}"}, status_code=400)
+    fault_config.update(update)
+    return {"config": fault_config, "counts": counts}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    for name, value in fault_config.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+    args = parser.parse_args()
+    for name in fault_config:
+        fault_config[name] = getattr(args, name)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -38,6 +38,16 @@ class Settings(BaseSettings):
     
     DUMP_PATH: Path = Path("/tmp/csha_prod_pg16.dump")
 
+    # --- HTTP CLIENT ---
+    # One shared keep-alive httpx client for every OpenAI call of a run
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY_S: float = 60.0
+    # Needs the h2 package (httpx[http2]); falls back to HTTP/1.1 without it
+    HTTP2_ENABLED: bool = True
+    HTTP_CONNECT_TIMEOUT_S: float = 5.0
+    HTTP_TIMEOUT_S: float = 120.0
+
     # --- AWS ---
     AWS_SSH_KEY: Path = Path("~/.ssh/LightsailDefaultKey-us-west-2-csha.pem").expanduser()
     AWS_SSH_HOST: str = "ubuntu@52.27.127.130"
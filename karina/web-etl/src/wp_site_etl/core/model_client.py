@@ -1,8 +1,11 @@
 from dataclasses import dataclass
 from functools import lru_cache
+from importlib.util import find_spec
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from typing import Union
 
+import httpx
+
 from wp_site_etl.core.config import settings
 from wp_site_etl.core.enums import ModelType
 
@@ -14,6 +17,19 @@ class ModelConfig:
     temperature: float = 0.0
     streaming: bool = False
 
+@lru_cache(maxsize=None)
+def get_http_client() -> httpx.Client:
+    """Keep-alive client shared by every model client, so chat and embedding calls reuse connections."""
+    return httpx.Client(
+        http2=settings.HTTP2_ENABLED and find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_S,
+        ),
+        timeout=httpx.Timeout(settings.HTTP_TIMEOUT_S, connect=settings.HTTP_CONNECT_TIMEOUT_S),
+    )
+
 @lru_cache(maxsize=None)
 def get_model_client(config: ModelConfig) -> Union[ChatOpenAI, OpenAIEmbeddings]:
     if config.model_type == ModelType.QUERY:
@@ -25,7 +41,8 @@ def get_model_client(config: ModelConfig) -> Union[ChatOpenAI, OpenAIEmbeddings]
         openai_api_key=api_key,
         model_name=config.model_name,
         temperature=config.temperature,
-        streaming=config.streaming
+        streaming=config.streaming,
+        http_client=get_http_client(),
     )
     elif config.model_type == ModelType.EMBEDDING:
         api_key = settings.OPENAI_API_EMBEDDINGS_KEY.get_secret_value()
@@ -34,7 +51,8 @@ def get_model_client(config: ModelConfig) -> Union[ChatOpenAI, OpenAIEmbeddings]
 
         return OpenAIEmbeddings(
             openai_api_key=api_key,
-            model=config.model_name
+            model=config.model_name,
+            http_client=get_http_client(),
         )
     else:
         raise ValueError(f"Invalid model type: {config.model_type}")